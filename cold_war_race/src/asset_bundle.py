@@ -0,0 +1,181 @@
+import os, sys, json, mmap, struct, hashlib
+import pygame
+from assets import ASSETS_DIR, AssetManager
+
+# Pacote de assets já escalados (pixels crus no formato do display + índice JSON).
+# Gerado por `python asset_bundle.py`; o jogo abre via mmap e cria as superfícies
+# com pygame.image.frombuffer, sem decodificar PNG nem reescalar.
+BUNDLE_PATH = os.path.join(ASSETS_DIR, "cache", "assets.bundle")
+MAGIC = b"CWRBNDL1"
+ALIGN = 64
+_HEADER = struct.Struct("<8sI")  # magic, tamanho do índice
+
+
+def display_masks():
+    """Masks (R, G, B, A) de convert_alpha() no display atual (sem display, os do SRCALPHA padrão)."""
+    surf = pygame.Surface((1, 1), pygame.SRCALPHA, 32)
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    return tuple(surf.get_masks())
+
+
+def display_pixel_format(masks=None):
+    """Formato de bytes do frombuffer que bate com esses masks, ou None se não houver um."""
+    masks = tuple(masks or display_masks())
+    if sys.byteorder == "little":
+        known = {
+            (0xff0000, 0xff00, 0xff, 0xff000000): "BGRA",
+            (0xff, 0xff00, 0xff0000, 0xff000000): "RGBA",
+            (0xff00, 0xff0000, 0xff000000, 0xff): "ARGB",
+        }
+    else:
+        known = {
+            (0xff00, 0xff0000, 0xff000000, 0xff): "BGRA",
+            (0xff000000, 0xff0000, 0xff00, 0xff): "RGBA",
+            (0xff0000, 0xff00, 0xff, 0xff000000): "ARGB",
+        }
+    return known.get(masks)
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def build_bundle(specs, path=BUNDLE_PATH, pixel_format=None):
+    """
+    Decodifica e escala cada spec (path, size, scale, alpha) e grava tudo num único
+    arquivo. Specs sem arquivo de origem são ignoradas. Retorna o número de entradas.
+    """
+    masks = display_masks()
+    pixel_format = pixel_format or display_pixel_format(masks)
+    if pixel_format is None:
+        raise ValueError(f"masks do display sem formato de frombuffer equivalente: {masks}")
+    entries = []
+    blobs = []
+    sources = {}
+    for spec in specs:
+        src, size, scale, alpha = AssetManager.make_key(*spec)
+        if not os.path.exists(src):
+            continue
+        img = AssetManager._decode_raw(src, scale, size)
+        rel = os.path.relpath(src, ASSETS_DIR).replace(os.sep, "/")
+        sources[rel] = file_hash(src)
+        w, h = img.get_size()
+        blobs.append(pygame.image.tobytes(img, pixel_format))
+        entries.append({"path": rel, "size": [w, h], "scale": scale, "alpha": alpha})
+
+    # offsets calculados sabendo o tamanho do índice (índice grava os próprios offsets)
+    def layout(index_len):
+        off = _align(_HEADER.size + index_len)
+        for e, blob in zip(entries, blobs):
+            e["offset"] = off
+            e["length"] = len(blob)
+            off = _align(off + len(blob))
+
+    index = {"format": pixel_format, "masks": list(masks), "sources": sources, "entries": entries}
+    layout(0)
+    raw_index = json.dumps(index).encode("utf-8")
+    while True:
+        layout(len(raw_index))
+        new_index = json.dumps(index).encode("utf-8")
+        if len(new_index) == len(raw_index):
+            raw_index = new_index
+            break
+        raw_index = new_index
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(raw_index)))
+        f.write(raw_index)
+        for e, blob in zip(entries, blobs):
+            f.write(b"\0" * (e["offset"] - f.tell()))
+            f.write(blob)
+    os.replace(tmp, path)
+    return len(entries)
+
+
+class AssetBundle:
+    """Bundle aberto via mmap; as superfícies apontam direto para a memória mapeada."""
+
+    def __init__(self, path, mm, index):
+        self.path = path
+        self._mm = mm  # precisa viver enquanto as superfícies existirem
+        self.index = index
+
+    def items(self):
+        """Gera (chave de cache, superfície) para cada entrada."""
+        view = memoryview(self._mm)
+        fmt = self.index["format"]
+        for e in self.index["entries"]:
+            src = os.path.join(ASSETS_DIR, *e["path"].split("/"))
+            size = tuple(e["size"])
+            key = AssetManager.make_key(src, size, e["scale"], e["alpha"])
+            surf = pygame.image.frombuffer(view[e["offset"]:e["offset"] + e["length"]], size, fmt)
+            if not e["alpha"]:
+                # superfícies opacas viram o formato do display (cópia simples, sem decode)
+                surf = surf.convert()
+            yield key, surf
+
+
+def open_bundle(path=BUNDLE_PATH):
+    """
+    Abre o bundle se ele existir, tiver os masks do display atual e todos os
+    arquivos de origem ainda tiverem o mesmo hash. Caso contrário retorna None.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            # ACCESS_COPY: ler continua sem cópia, mas quem escrever numa superfície do
+            # bundle (fill, blit nela) ganha páginas privadas em vez de derrubar o processo
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError) as e:
+        print("Bundle de assets inválido:", path, e)
+        return None
+    index = _usable_index(mm, path)
+    if index is None:
+        mm.close()
+        return None
+    return AssetBundle(path, mm, index)
+
+
+def _usable_index(mm, path):
+    """Índice do bundle mapeado, ou None se ele não servir para este display e estes arquivos."""
+    try:
+        magic, index_len = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            return None
+        index = json.loads(mm[_HEADER.size:_HEADER.size + index_len].decode("utf-8"))
+    except (ValueError, struct.error) as e:
+        print("Bundle de assets inválido:", path, e)
+        return None
+
+    # bytes gravados para outro layout de pixel trocariam os canais no frombuffer
+    masks = display_masks()
+    if index.get("masks") != list(masks) or index.get("format") != display_pixel_format(masks):
+        return None
+    for rel, digest in index["sources"].items():
+        src = os.path.join(ASSETS_DIR, *rel.split("/"))
+        if not os.path.exists(src) or file_hash(src) != digest:
+            print("Bundle de assets desatualizado:", rel)
+            return None
+    return index
+
+
+# Gera o bundle: python asset_bundle.py
+if __name__ == "__main__":
+    from main import bundle_asset_specs
+    pygame.init()
+    # display escondido: o bundle é gravado no layout de pixel de convert_alpha() do display
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    n = build_bundle(bundle_asset_specs())
+    print(f"{n} assets gravados em {BUNDLE_PATH} ({os.path.getsize(BUNDLE_PATH) / (1024 * 1024):.1f} MiB)")
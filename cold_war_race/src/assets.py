@@ -0,0 +1,249 @@
+import os
+import queue
+import threading
+import pygame
+
+# caminhos de assets (assets está uma pasta acima de src)
+ASSETS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'assets'))
+BACKGROUNDS_DIR = os.path.join(ASSETS_DIR, "backgrounds")
+SPRITES_DIR = os.path.join(ASSETS_DIR, "sprites")
+# superfícies do pré-carregamento convertidas a cada load(): poucas, para um load no meio
+# de um frame não converter a fila inteira de uma vez
+PUMP_PER_LOAD = 1
+
+
+def sprite_path(name):
+    return os.path.join(SPRITES_DIR, name)
+
+
+def background_path(name):
+    return os.path.join(BACKGROUNDS_DIR, name)
+
+
+class AssetManager:
+    """
+    Cache compartilhado de superfícies: cada imagem é decodificada e escalada
+    uma única vez por (caminho, tamanho, modo de escala, alpha).
+    Todas as fases (menu, cutscenes, tetris, corrida) carregam por aqui.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._masks = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_held = 0
+        self.preloader = None
+
+    @staticmethod
+    def make_key(path, size=None, scale="smooth", alpha=True):
+        size = (int(size[0]), int(size[1])) if size else None
+        return (os.path.normpath(path), size, scale, bool(alpha))
+
+    def load(self, path, size=None, scale="smooth", alpha=True, fallback_color=None):
+        """
+        Retorna a superfície pronta (convertida e escalada).
+        scale: "smooth" (smoothscale) ou "fast" (scale).
+        Se o arquivo não existir ou falhar, retorna uma superfície sólida com
+        fallback_color (quando informado e houver size) ou None.
+        """
+        key = self.make_key(path, size, scale, alpha)
+        self.pump(PUMP_PER_LOAD)
+        surf = self._cache.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+        self.misses += 1
+
+        surf = None
+        if os.path.exists(key[0]):
+            try:
+                surf = self._decode(key[0], key[2], key[3], key[1])
+            except Exception as e:
+                print("Falha ao carregar", key[0], e)
+        if surf is None:
+            if fallback_color is None or key[1] is None:
+                return None
+            surf = pygame.Surface(key[1], pygame.SRCALPHA)
+            surf.fill(fallback_color)
+
+        self.store(key, surf)
+        return surf
+
+    def load_first(self, candidates, size=None, scale="smooth", alpha=True):
+        """Tenta cada caminho em ordem; retorna (superfície, caminho) ou (None, None)."""
+        for p in candidates:
+            surf = self.load(p, size, scale, alpha)
+            if surf is not None:
+                return surf, p
+        return None, None
+
+    def mask(self, path, size=None, scale="smooth", alpha=True, threshold=127):
+        """
+        Máscara de colisão (pygame.mask) do sprite, criada uma única vez por chave.
+        Não precisa de display: usa a superfície do cache ou decodifica direto.
+        Retorna None se o arquivo não existir.
+        """
+        key = self.make_key(path, size, scale, alpha) + (threshold,)
+        if key in self._masks:
+            return self._masks[key]
+        surf = self._cache.get(key[:4])
+        if surf is None and os.path.exists(key[0]):
+            try:
+                surf = self._decode_raw(key[0], key[2], key[1])
+            except Exception as e:
+                print("Falha ao carregar", key[0], e)
+        mask = pygame.mask.from_surface(surf, threshold) if surf is not None else None
+        self._masks[key] = mask
+        return mask
+
+    def store(self, key, surf):
+        old = self._cache.get(key)
+        if old is not None:
+            self.bytes_held -= self._surface_bytes(old)
+        self._cache[key] = surf
+        self.bytes_held += self._surface_bytes(surf)
+
+    def contains(self, key):
+        return key in self._cache
+
+    def attach_bundle(self, bundle):
+        """Registra todas as superfícies de um AssetBundle (zero-copy) no cache."""
+        count = 0
+        for key, surf in bundle.items():
+            if key not in self._cache:
+                self.store(key, surf)
+                count += 1
+        return count
+
+    # --- pré-carregamento em segundo plano ---
+    def start_preload(self, specs):
+        """
+        Inicia uma thread que decodifica e escala todas as specs
+        (path, size, scale, alpha) enquanto o menu está parado.
+        As superfícies só são convertidas/guardadas na thread principal via pump().
+        """
+        if self.preloader is not None and self.preloader.is_alive():
+            return self.preloader
+        keys = [self.make_key(*spec) for spec in specs]
+        keys = [k for k in dict.fromkeys(keys) if k not in self._cache]
+        if self.preloader is None:
+            # a thread não pode seguir decodificando depois do pygame.quit()
+            pygame.register_quit(self.stop_preload)
+        self.preloader = AssetPreloader(self, keys)
+        self.preloader.start()
+        return self.preloader
+
+    def pump(self, max_items=None):
+        """Recebe as superfícies prontas do preloader (chamar na thread principal)."""
+        if self.preloader is None:
+            return 0
+        received = 0
+        while max_items is None or received < max_items:
+            try:
+                key, raw = self.preloader.results.get_nowait()
+            except queue.Empty:
+                break
+            received += 1
+            self.preloader.delivered += 1
+            if raw is None or key in self._cache:
+                continue
+            try:
+                self.store(key, self._finish(raw, key[3]))
+            except Exception as e:
+                print("Falha ao converter", key[0], e)
+        return received
+
+    def preload_progress(self):
+        """Fração (0..1) do pré-carregamento já entregue, ou None se não houver preload ativo."""
+        p = self.preloader
+        if p is None or p.total == 0 or p.delivered >= p.total or (not p.is_alive() and p.results.empty()):
+            return None
+        return p.delivered / p.total
+
+    def stop_preload(self):
+        """Interrompe o pré-carregamento e espera a thread sair (registrado no pygame.quit)."""
+        p = self.preloader
+        if p is not None and p.is_alive():
+            p.stop()
+            p.join()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._cache),
+            "masks": len(self._masks),
+            "bytes_held": self.bytes_held,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"assets: {s['entries']} superfícies, {s['bytes_held'] / (1024 * 1024):.1f} MiB, "
+                f"hits={s['hits']} misses={s['misses']}")
+
+    def clear(self):
+        self._cache.clear()
+        self._masks.clear()
+        self.bytes_held = 0
+
+    @classmethod
+    def _decode(cls, path, scale, alpha, size):
+        return cls._finish(cls._decode_raw(path, scale, size), alpha)
+
+    @staticmethod
+    def _decode_raw(path, scale, size):
+        """Decodifica e escala sem tocar no display (seguro fora da thread principal)."""
+        img = pygame.image.load(path)
+        if size and img.get_size() != size:
+            if scale == "smooth" and img.get_bitsize() in (24, 32):
+                img = pygame.transform.smoothscale(img, size)
+            else:
+                img = pygame.transform.scale(img, size)
+        return img
+
+    @staticmethod
+    def _finish(img, alpha):
+        return img.convert_alpha() if alpha else img.convert()
+
+    @staticmethod
+    def _surface_bytes(surf):
+        return surf.get_pitch() * surf.get_height()
+
+
+class AssetPreloader(threading.Thread):
+    """
+    Thread de trabalho: decodifica PNGs e escala, entregando o resultado numa fila.
+    Toda chave entra na fila (None quando não há o que entregar), então `delivered`,
+    contado pelo pump(), chega a `total` quando tudo já está no cache.
+    """
+
+    def __init__(self, manager, keys):
+        super().__init__(name="asset-preloader", daemon=True)
+        self.manager = manager
+        self.keys = keys
+        self.total = len(keys)
+        self.delivered = 0   # itens já recebidos pela thread principal (pump)
+        self.results = queue.Queue()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        for key in self.keys:
+            if self._stop_event.is_set():
+                break
+            path, size, scale, _alpha = key
+            raw = None
+            # a thread principal pode ter carregado sozinha nesse meio tempo
+            if not self.manager.contains(key) and os.path.exists(path):
+                try:
+                    raw = AssetManager._decode_raw(path, scale, size)
+                except Exception as e:
+                    print("Falha ao pré-carregar", path, e)
+            self.results.put((key, raw))
+
+    def stop(self):
+        self._stop_event.set()
+
+
+# instância única usada por todo o jogo
+asset_manager = AssetManager()
@@ -0,0 +1,35 @@
+import pygame
+
+
+class TextureAtlas:
+    """
+    Empacota várias superfícies pequenas numa única superfície (prateleiras por altura)
+    e expõe sub-retângulos nomeados. Pensado para desenhar tudo com screen.blits().
+    """
+
+    def __init__(self, surfaces, max_width=1024, padding=1):
+        # maiores primeiro: prateleiras ficam mais cheias
+        order = sorted(surfaces.items(), key=lambda kv: (-kv[1].get_height(), -kv[1].get_width()))
+        self.rects = {}
+        x = y = shelf_h = 0
+        width = 0
+        for name, surf in order:
+            w, h = surf.get_size()
+            if x > 0 and x + w > max_width:
+                y += shelf_h + padding
+                x = shelf_h = 0
+            self.rects[name] = pygame.Rect(x, y, w, h)
+            x += w + padding
+            shelf_h = max(shelf_h, h)
+            width = max(width, x)
+        height = y + shelf_h
+
+        self.surface = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA, 32)
+        self.surface.fill((0, 0, 0, 0))
+        for name, surf in surfaces.items():
+            # MAX sobre fundo zerado copia os pixels (inclusive alpha) sem misturar
+            self.surface.blit(surf, self.rects[name], special_flags=pygame.BLEND_RGBA_MAX)
+
+    def item(self, name, dest):
+        """Tupla (fonte, destino, área) pronta para Surface.blits()."""
+        return (self.surface, dest, self.rects[name])
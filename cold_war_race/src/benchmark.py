@@ -0,0 +1,307 @@
+import time
+T0 = time.perf_counter()  # antes de qualquer import pesado: base do tempo de inicialização
+import os, sys, json, random, subprocess
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+try:
+    import resource
+except ImportError:  # Windows: sem pico de RSS
+    resource = None
+
+# Benchmark headless de cada cena (menu, história, tetris, corrida, tela final) com o
+# driver dummy do SDL, entradas roteirizadas e seeds fixas. Cada cena roda num processo
+# próprio (pico de RSS e inicialização isolados) com um relógio de passo fixo: tick()
+# devolve 1000/FPS ms sem dormir, então o conteúdo de cada frame é o mesmo de uma partida
+# a 60 FPS e o tempo medido é só trabalho. Tempos por frame vêm do profiler das cenas.
+#
+#   python benchmark.py [cenas...] [--frames N] [--save-baseline] [--baseline ARQ] [--tolerance 0.1]
+#
+# Com --baseline, sai com código 1 se alguma métrica piorar mais que a tolerância.
+# race_dirty é a corrida no modo dirty rects (nível de qualidade 0): sai com código 1 se
+# a soma dos rects de algum display.update() passar de DIRTY_AREA_LIMIT da tela, caso em
+# que o modo manda mais pixels que o flip() que ele substitui.
+SCENES = ("menu", "story", "tetris", "race", "race_dirty", "end")
+PROFILE_SCENE = {"menu": "menu", "story": "dialogue", "tetris": "tetris", "race": "race",
+                 "race_dirty": "race", "end": "end"}
+DIRTY_AREA_LIMIT = 1.0
+FRAMES = 900           # frames por cena (15 s de jogo a 60 FPS)
+SEED = 1957
+STORY_ADVANCE_EVERY = 20  # frames entre cada Espaço na história (completa o texto e avança)
+TOLERANCE = 0.10
+# métrica -> True se maior é melhor
+METRICS = {"fps": True, "frame_p50_ms": False, "frame_p99_ms": False,
+           "peak_rss_mb": False, "startup_ms": False}
+
+
+class SceneDone(Exception):
+    """Levantada pelo roteiro de entradas quando a cena esgota seus frames."""
+
+
+class FixedClock:
+    """Substitui pygame.time.Clock: não limita o FPS e cada tick() vale um frame a `framerate`."""
+
+    def __init__(self):
+        self.fps = 0
+
+    def tick(self, framerate=0):
+        from settings import FPS
+        return 1000.0 / (framerate or FPS)
+
+    tick_busy_loop = tick
+
+    def get_fps(self):
+        return self.fps
+
+
+class InputScript:
+    """pygame.event.get() roteirizado: entradas por frame e SceneDone após `frames` frames."""
+
+    def __init__(self, frames, script=None):
+        self.frames = frames
+        self.script = script or (lambda frame: [])
+        self.frame = 0
+        self._get = None
+
+    def __call__(self, *args, **kwargs):
+        self._get(*args, **kwargs)  # esvazia a fila real do SDL
+        if self.frame >= self.frames:
+            raise SceneDone()
+        events = self.script(self.frame)
+        self.frame += 1
+        return events
+
+    def install(self):
+        import pygame
+        self._get = pygame.event.get
+        pygame.event.get = self
+
+
+def _key(key):
+    import pygame
+    return pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0)
+
+
+def scripted_race_log(frames, seed=SEED):
+    """Replay roteirizado da corrida: política aleatória com seed, sem o tick da vitória."""
+    from race_sim import RaceSimulation, random_policy
+    from rocket_race import race_collision_masks
+    from replay import ReplayLog, pack_inputs
+    from settings import SIM_TICK_RATE
+    meta = {"seed": seed, "advantage1": 200, "advantage2": 0, "tick_rate": SIM_TICK_RATE}
+    sim = RaceSimulation(200, 0, seed=seed, masks=race_collision_masks())
+    log = ReplayLog("race", meta)
+    policy = random_policy(seed)
+    for _ in range(frames):
+        inputs = policy(sim)
+        log.record(sim, pack_inputs(*inputs))
+        if sim.step(inputs).winner:
+            log.inputs.pop()  # a vitória abriria a tela de vitória (espera tecla)
+            break
+    return log
+
+
+def scripted_tetris_log(frames, seed=SEED):
+    """Replay roteirizado do tetris: cada jogador aperta uma tecla aleatória a cada ~8 frames."""
+    from tetris_engine import TetrisGame
+    from replay import ReplayLog, pack_inputs
+    from input_bits import INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT
+    from settings import FPS
+    rng = random.Random(seed)
+    keys = (INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT)
+    game = TetrisGame(seed)
+    log = ReplayLog("tetris", {"seed": seed})
+    dt = round(1000 / FPS)
+    for _ in range(frames):
+        masks = [rng.choice(keys) if rng.random() < 0.12 else 0 for _ in range(2)]
+        log.record(game, pack_inputs(*masks), dt)
+        game.step(dt, masks)
+    return log
+
+
+def run_scene(scene, frames):
+    """Roda uma cena neste processo e retorna o dict de resultados."""
+    import pygame
+    pygame.time.Clock = FixedClock
+    pygame.init()
+    from settings import WIDTH, HEIGHT
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    import main, profiler
+    from assets import asset_manager
+    from asset_bundle import open_bundle
+    bundle = open_bundle()
+    if bundle:
+        asset_manager.attach_bundle(bundle)
+    screen = profiler.install(screen)
+
+    script = None
+    harness_s = 0.0  # montar os replays roteirizados é trabalho do benchmark, não do jogo
+    if scene == "menu":
+        cover, _ = asset_manager.load_first(main.COVER_CANDIDATES, (WIDTH, HEIGHT))
+        asset_manager.start_preload(main.game_asset_specs())
+        run = lambda: main.show_menu(screen, cover)
+    elif scene == "story":
+        script = lambda f: [_key(pygame.K_SPACE)] if f % STORY_ADVANCE_EVERY == STORY_ADVANCE_EVERY - 1 else []
+        run = lambda: main.show_story_cutscene(screen)
+    elif scene == "tetris":
+        from tetris_phase import tetris_phase
+        t = time.perf_counter()
+        log = scripted_tetris_log(frames)
+        harness_s += time.perf_counter() - t
+        run = lambda: tetris_phase(screen, replay=log)
+    elif scene in ("race", "race_dirty"):
+        from rocket_race import RocketRace
+        t = time.perf_counter()
+        log = scripted_race_log(frames)
+        harness_s += time.perf_counter() - t
+        dirty = scene == "race_dirty"
+        race = RocketRace(screen, log.meta["advantage1"], log.meta["advantage2"], replay=log,
+                          dirty_rects=dirty, governor=not dirty)
+        run = race.run
+    elif scene == "end":
+        from end_screen import end_screen
+        run = lambda: end_screen(screen, "URSS")
+    else:
+        raise ValueError("cena desconhecida: " + scene)
+
+    # área enviada por display.update(rects), em frações da tela (flip() não entra)
+    update_areas = []
+    real_update = pygame.display.update
+
+    def counting_update(rects=None):
+        if rects is not None:
+            rects = [r for r in rects if r]
+            update_areas.append(sum(r.w * r.h for r in map(pygame.Rect, rects)) / (WIDTH * HEIGHT))
+        return real_update(rects) if rects is not None else real_update()
+    pygame.display.update = counting_update
+
+    InputScript(frames, script).install()
+    startup_ms = (time.perf_counter() - T0 - harness_s) * 1000
+    t = time.perf_counter()
+    try:
+        run()
+    except SceneDone:
+        pass
+    wall = time.perf_counter() - t
+
+    prof = profiler.profilers.get(PROFILE_SCENE[scene])
+    frames_ns = sorted(f[profiler.COLUMNS.index("frame_ns")] for f in prof.frames) if prof else []
+    summary = prof.summary() if prof else {}
+    n = len(frames_ns)
+    total_s = sum(frames_ns) / 1e9
+    result = {
+        "scene": scene,
+        "frames": n,
+        "wall_s": wall,
+        "fps": n / total_s if total_s else 0.0,
+        "frame_p50_ms": profiler.percentile(frames_ns, 0.50) / 1e6,
+        "frame_p90_ms": profiler.percentile(frames_ns, 0.90) / 1e6,
+        "frame_p99_ms": profiler.percentile(frames_ns, 0.99) / 1e6,
+        "frame_max_ms": frames_ns[-1] / 1e6 if n else 0.0,
+        "startup_ms": startup_ms,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None,
+    }
+    for c in profiler.COUNTERS:
+        result[c + "_per_frame"] = summary.get(c, {}).get("mean", 0.0)
+    if update_areas:
+        result["update_area_mean"] = sum(update_areas) / len(update_areas)
+        result["update_area_max"] = max(update_areas)
+    return result
+
+
+def run_isolated(scene, frames):
+    """Roda a cena num processo novo (RSS e inicialização limpos)."""
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", scene, "--frames", str(frames)]
+    out = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    for line in reversed(out.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"cena {scene} falhou:\n{out.stderr[-2000:]}")
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Linhas de comparação com o baseline e se houve regressão além da tolerância."""
+    lines, regressed = [], False
+    for r in results:
+        base = baseline.get(r["scene"])
+        if not base:
+            lines.append(f"{r['scene']:7s} sem baseline")
+            continue
+        for metric, higher_better in METRICS.items():
+            new, old = r.get(metric), base.get(metric)
+            if not new or not old:
+                continue
+            change = (new - old) / old
+            worse = -change if higher_better else change
+            flag = ""
+            if worse > tolerance:
+                flag, regressed = "  <-- REGRESSÃO", True
+            elif worse < -tolerance:
+                flag = "  (melhor)"
+            lines.append(f"{r['scene']:7s} {metric:13s} {old:10.2f} -> {new:10.2f} ({change:+.1%}){flag}")
+    return lines, regressed
+
+
+def format_result(r):
+    rss = f"{r['peak_rss_mb']:.0f} MiB" if r["peak_rss_mb"] else "?"
+    return (f"{r['scene']:7s} {r['frames']:5d} frames {r['fps']:8.1f} FPS  "
+            f"p50 {r['frame_p50_ms']:.2f}  p90 {r['frame_p90_ms']:.2f}  p99 {r['frame_p99_ms']:.2f}  "
+            f"max {r['frame_max_ms']:.2f} ms  início {r['startup_ms']:.0f} ms  RSS {rss}  "
+            f"blits/frame {r['blits_per_frame']:.0f}  desenhos {r['draws_per_frame']:.0f}  "
+            f"superfícies {r['surfaces_per_frame']:.1f}" +
+            (f"  update {r['update_area_mean']:.2f}/{r['update_area_max']:.2f} da tela (média/máx)"
+             if "update_area_max" in r else ""))
+
+
+def default_baseline_path():
+    from assets import ASSETS_DIR
+    return os.path.join(ASSETS_DIR, "cache", "benchmark_baseline.json")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(name, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1] if i + 1 < len(args) and not args[i + 1].startswith("--") else None
+            del args[i:i + (2 if value is not None else 1)]
+            return value if value is not None else True
+        return default
+
+    frames = int(option("--frames", FRAMES))
+    child = option("--child")
+    if child:
+        print(json.dumps(run_scene(child, frames)))
+        sys.exit(0)
+
+    save = option("--save-baseline")
+    baseline_path = option("--baseline")
+    tolerance = float(option("--tolerance", TOLERANCE))
+    scenes = [a for a in args if a in SCENES] or list(SCENES)
+
+    results = []
+    for scene in scenes:
+        r = run_isolated(scene, frames)
+        results.append(r)
+        print(format_result(r))
+
+    regressed = False
+    for r in results:
+        if r.get("update_area_max", 0.0) > DIRTY_AREA_LIMIT:
+            print(f"{r['scene']}: display.update enviou {r['update_area_max']:.2f}x a tela num frame"
+                  f" (limite {DIRTY_AREA_LIMIT:.2f})  <-- DIRTY RECTS PIOR QUE FLIP")
+            regressed = True
+    if baseline_path:
+        path = default_baseline_path() if baseline_path is True else baseline_path
+        with open(path) as f:
+            lines, worse = compare(results, json.load(f), tolerance)
+        regressed = regressed or worse
+        print(f"\nComparação com {path} (tolerância {tolerance:.0%}):")
+        print("\n".join(lines))
+    if save:
+        path = default_baseline_path() if save is True else save
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({r["scene"]: r for r in results}, f, indent=2)
+        print("Baseline salvo em", path)
+    sys.exit(1 if regressed else 0)
@@ -0,0 +1,95 @@
+import heapq
+from snapshots import SnapshotError, expect, expect_list, expect_range
+
+# Efeitos temporários (power-ups) dirigidos por dados. Cada definição é um dict:
+#   duration_ms  quanto dura
+#   stat, value  atributo afetado e fator multiplicativo (ex.: "progress", 2.0)
+#   stacking     "refresh" (reinicia a duração), "extend" (soma a duração) ou
+#                "stack" (reinicia e acumula, value ** stacks, até max_stacks)
+# A expiração fica num min-heap por tick: update() só toca nos efeitos que venceram.
+
+
+class EffectEngine:
+    def __init__(self, definitions, tick_ms):
+        self.definitions = definitions
+        self.tick_ms = tick_ms
+        self.active = {}  # (alvo, nome) -> [tick de expiração, stacks]
+        self._heap = []   # (tick de expiração, alvo, nome); entradas vencidas por renovação são ignoradas
+
+    def add(self, target, name, tick):
+        """Aplica o efeito `name` em `target` no tick atual; retorna o tick de expiração."""
+        d = self.definitions[name]
+        duration = max(1, round(d["duration_ms"] / self.tick_ms))
+        key = (target, name)
+        cur = self.active.get(key)
+        rule = d.get("stacking", "refresh")
+        if cur is None:
+            cur = self.active[key] = [tick + duration, 1]
+        elif rule == "extend":
+            cur[0] += duration
+        else:
+            cur[0] = tick + duration
+            if rule == "stack":
+                cur[1] = min(cur[1] + 1, d.get("max_stacks", cur[1] + 1))
+        heapq.heappush(self._heap, (cur[0], target, name))
+        return cur[0]
+
+    def update(self, tick):
+        """Remove os efeitos com expiração <= tick; retorna [(alvo, nome)] que acabaram."""
+        heap, active = self._heap, self.active
+        expired = []
+        while heap and heap[0][0] <= tick:
+            expires, target, name = heapq.heappop(heap)
+            cur = active.get((target, name))
+            if cur is not None and cur[0] == expires:
+                del active[(target, name)]
+                expired.append((target, name))
+        return expired
+
+    def factor(self, target, stat):
+        """Produto dos fatores dos efeitos ativos de `target` sobre `stat` (1.0 se nenhum)."""
+        f = 1.0
+        for (t, name), (_, stacks) in self.active.items():
+            if t == target:
+                d = self.definitions[name]
+                if d.get("stat") == stat:
+                    f *= d["value"] ** stacks
+        return f
+
+    def remaining_ms(self, target, name, tick):
+        cur = self.active.get((target, name))
+        return (cur[0] - tick) * self.tick_ms if cur else 0
+
+    def state(self):
+        """Efeitos ativos e heap como listas (na ordem atual: o produto de factor() depende dela)."""
+        return {"active": [[t, name, exp, stacks] for (t, name), (exp, stacks) in self.active.items()],
+                "heap": [list(entry) for entry in self._heap]}
+
+    def load_state(self, d, name="effects"):
+        """Inverso de state(), conferindo alvos, nomes e ticks."""
+        expect(d, (dict,), name)
+        if set(d) != {"active", "heap"}:
+            raise SnapshotError(f"{name}: campos não batem: {sorted(d)}")
+        active = {}
+        for entry in expect(d["active"], (list,), name + ".active"):
+            t, effect, exp, stacks = expect_list(entry, (int, str), name + ".active", 4)
+            self._check_entry(t, effect, name)
+            expect(exp, (int,), name + ".active")
+            expect_range(stacks, 1, 1 << 16, name + ".active")
+            active[(t, effect)] = [exp, stacks]
+        heap = []
+        for entry in expect(d["heap"], (list,), name + ".heap"):
+            exp, t, effect = expect_list(entry, (int, str), name + ".heap", 3)
+            self._check_entry(t, effect, name)
+            expect(exp, (int,), name + ".heap")
+            heap.append((exp, t, effect))
+        if any(heap[(i - 1) // 2] > heap[i] for i in range(1, len(heap))):
+            raise SnapshotError(f"{name}: heap fora de ordem")
+        self.active = active
+        self._heap = heap
+
+    def _check_entry(self, target, effect, name):
+        expect(target, (int,), name)
+        expect(effect, (str,), name)
+        if effect not in self.definitions:
+            raise SnapshotError(f"{name}: efeito desconhecido {effect!r}")
@@ -1,10 +1,12 @@
 import pygame, sys
 from settings import WIDTH, HEIGHT, WHITE, RED, BLUE, DARK
+from text_cache import get_font, render_text
+from profiler import frame_profiler
 
 def end_screen(screen, winner):
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont("Arial", 46, True)
-    small = pygame.font.SysFont("Arial", 26)
+    font = get_font("Arial", 46, True)
+    small = get_font("Arial", 26)
 
     if winner == "URSS":
         title = "URSS venceu a Corrida Espacial!"
@@ -23,24 +25,32 @@ def end_screen(screen, winner):
         ]
         color = BLUE
 
+    prof = frame_profiler("end")
     while True:
-        for e in pygame.event.get():
+        prof.begin()
+        for e in prof.events():
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit()
+        prof.mark("events")
         screen.fill(DARK)
-        t = font.render(title, True, color)
+        t = render_text(font, title, color)
         screen.blit(t, (WIDTH//2 - t.get_width()//2, 180))
 
         for i, line in enumerate(lines):
-            s = small.render(line, True, WHITE)
+            s = render_text(small, line, WHITE)
             screen.blit(s, (WIDTH//2 - s.get_width()//2, 270 + i*40))
 
-        press = small.render("Pressione ESC para sair", True, WHITE)
+        press = render_text(small, "Pressione ESC para sair", WHITE)
         screen.blit(press, (WIDTH//2 - press.get_width()//2, HEIGHT - 100))
 
+        prof.draw_overlay(screen)
+        prof.mark("draw")
+
         keys = pygame.key.get_pressed()
         if keys[pygame.K_ESCAPE]:
             pygame.quit(); sys.exit()
 
         pygame.display.flip()
+        prof.mark("flip")
         clock.tick(30)
+        prof.mark("wait")
@@ -0,0 +1,171 @@
+import pygame
+from snapshots import NUMBER, SnapshotError, expect, expect_list, expect_range
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy: mesmas colunas em listas Python (ok para poucas dezenas)
+    np = None
+
+# Entidades da corrida (asteroides, power-ups) em colunas (struct-of-arrays):
+# x, y, prev_y, vy, w, h, kind, alive. Os slots ficam num pool: mortos voltam para uma
+# pilha livre e as colunas só crescem (dobrando) quando enchem, sem alocar por tick.
+# Com numpy, mover, descartar e testar hitbox são operações vetorizadas.
+FLOAT_FIELDS = ("x", "y", "prev_y", "vy")
+INT_FIELDS = ("w", "h", "kind")
+
+
+class EntityPool:
+    def __init__(self, names, capacity=64):
+        self.names = names      # kind (int) -> nome do sprite/tipo
+        self.capacity = 0
+        self.count = 0          # entidades vivas
+        self.free = []          # pilha de slots livres (pop() devolve o menor índice)
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        old = self.capacity
+        if np is not None:
+            for name, dtype in [(f, np.float64) for f in FLOAT_FIELDS] + \
+                               [(f, np.int32) for f in INT_FIELDS] + [("alive", np.bool_)]:
+                col = np.zeros(capacity, dtype=dtype)
+                if old:
+                    col[:old] = getattr(self, name)
+                setattr(self, name, col)
+            self._tmp = np.zeros(capacity, dtype=np.float64)
+        else:
+            for name in FLOAT_FIELDS + INT_FIELDS:
+                col = getattr(self, name, [])
+                col.extend([0] * (capacity - old))
+                setattr(self, name, col)
+            self.alive = getattr(self, "alive", [])
+            self.alive.extend([False] * (capacity - old))
+        self.free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    def state(self):
+        """Colunas, contagem e pilha livre como listas simples (para snapshots de replay)."""
+        tolist = (lambda col: col.tolist()) if np is not None else list
+        d = {name: tolist(getattr(self, name)) for name in FLOAT_FIELDS + INT_FIELDS + ("alive",)}
+        d["count"] = self.count
+        d["free"] = list(self.free)
+        return d
+
+    def load_state(self, d, name="pool"):
+        """Inverso de state(), conferindo tamanhos e tipos."""
+        expect(d, (dict,), name)
+        if set(d) != set(FLOAT_FIELDS + INT_FIELDS + ("alive", "count", "free")):
+            raise SnapshotError(f"{name}: campos não batem: {sorted(d)}")
+        capacity = len(expect(d["alive"], (list,), name + ".alive"))
+        if capacity == 0:
+            raise SnapshotError(f"{name}: pool sem slots")
+        cols = {f: expect_list(d[f], NUMBER, f"{name}.{f}", capacity) for f in FLOAT_FIELDS}
+        cols.update({f: expect_list(d[f], (int,), f"{name}.{f}", capacity) for f in INT_FIELDS})
+        cols["alive"] = expect_list(d["alive"], (bool,), name + ".alive", capacity)
+        for k in cols["kind"]:
+            expect_range(k, 0, len(self.names), name + ".kind")
+        free = [expect_range(i, 0, capacity, name + ".free") for i in expect(d["free"], (list,), name + ".free")]
+        count = expect_range(d["count"], 0, capacity + 1, name + ".count")
+        if count != sum(cols["alive"]) or sorted(free) != [i for i, a in enumerate(cols["alive"]) if not a]:
+            raise SnapshotError(f"{name}: count/free não batem com alive")
+        if np is not None:
+            for f in FLOAT_FIELDS:
+                setattr(self, f, np.array(cols[f], dtype=np.float64))
+            for f in INT_FIELDS:
+                setattr(self, f, np.array(cols[f], dtype=np.int32))
+            self.alive = np.array(cols["alive"], dtype=np.bool_)
+            self._tmp = np.zeros(capacity, dtype=np.float64)
+        else:
+            for f in FLOAT_FIELDS + INT_FIELDS + ("alive",):
+                setattr(self, f, list(cols[f]))
+        self.capacity = capacity
+        self.count = count
+        self.free = list(free)
+
+    def spawn(self, x, y, w, h, vy, kind):
+        if not self.free:
+            self._grow(self.capacity * 2)
+        i = self.free.pop()
+        self.x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vy[i] = vy
+        self.w[i] = w
+        self.h[i] = h
+        self.kind[i] = kind
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.free.append(i)
+            self.count -= 1
+
+    def clear(self):
+        for i in self.indices():
+            self.kill(i)
+
+    def indices(self):
+        """Slots vivos em ordem crescente."""
+        if np is not None:
+            return self.alive.nonzero()[0].tolist()
+        return [i for i, a in enumerate(self.alive) if a]
+
+    def move(self, dt):
+        """Guarda y em prev_y (para interpolar o desenho) e avança y += vy * dt."""
+        if np is not None:
+            self.prev_y[:] = self.y
+            np.multiply(self.vy, dt, out=self._tmp)
+            self.y += self._tmp
+        else:
+            y, vy = self.y, self.vy
+            self.prev_y[:] = y
+            for i in self.indices():
+                y[i] += vy[i] * dt
+
+    def cull(self, bottom):
+        """Mata quem tem y >= bottom (saiu por baixo da tela)."""
+        if np is not None:
+            gone = (self.alive & (self.y >= bottom)).nonzero()[0]
+            if len(gone):
+                self.alive[gone] = False
+                self.free.extend(gone.tolist())
+                self.count -= len(gone)
+        else:
+            for i in self.indices():
+                if self.y[i] >= bottom:
+                    self.kill(i)
+
+    def hitbox(self, i, shrink=1.0):
+        """Rect da entidade i reduzido a `shrink` do tamanho, centrado (y truncado como no Rect)."""
+        w, h = int(self.w[i]), int(self.h[i])
+        nw, nh = int(w * shrink), int(h * shrink)
+        return pygame.Rect(int(self.x[i]) + (w - nw) // 2, int(self.y[i]) + (h - nh) // 2, nw, nh)
+
+    def hitboxes(self, shrink=1.0):
+        """Hitboxes de todos os slots de uma vez: (válida, left, top, right, bottom)."""
+        nw = (self.w * shrink).astype(np.int32)
+        nh = (self.h * shrink).astype(np.int32)
+        left = self.x.astype(np.int32) + (self.w - nw) // 2
+        top = self.y.astype(np.int32) + (self.h - nh) // 2
+        valid = self.alive & (nw > 0) & (nh > 0)
+        return valid, left, top, left + nw, top + nh
+
+    def center(self, i):
+        return (int(self.x[i]) + int(self.w[i]) // 2, int(self.y[i]) + int(self.h[i]) // 2)
+
+    def draw_items(self, alpha):
+        """[(nome, (x, y))] das entidades vivas, com y interpolado entre prev_y e y."""
+        names = self.names
+        if np is not None:
+            idx = self.alive.nonzero()[0]
+            prev = self.prev_y[idx]
+            ys = (prev + (self.y[idx] - prev) * alpha).astype(np.int32).tolist()
+            xs = self.x[idx].astype(np.int32).tolist()
+            kinds = self.kind[idx].tolist()
+            return [(names[k], (x, y)) for k, x, y in zip(kinds, xs, ys)]
+        return [(names[self.kind[i]], (int(self.x[i]), int(self.prev_y[i] + (self.y[i] - self.prev_y[i]) * alpha)))
+                for i in self.indices()]
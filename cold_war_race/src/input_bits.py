@@ -0,0 +1,4 @@
+# Entradas por jogador como bitmask (jogador 0 = WASD, jogador 1 = setas), usadas pela
+# corrida, pelo tetris, pelos replays e pelo bot. Sem dependências, para que o motor do
+# tetris e a simulação em lote rodem sem pygame.
+INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT = 1, 2, 4, 8
@@ -1,24 +1,62 @@
 import pygame, time, sys, os
 import math
-from settings import WIDTH, HEIGHT, FPS, FINISH_LINE, MS_TO_PROGRESS, MAX_TETRIS_ADV_PCT
-from tetris_phase import tetris_phase
-from rocket_race import RocketRace
+from settings import WIDTH, HEIGHT, FPS, PROFILE
+from settings import TETRIS_CPU, TETRIS_CPU_LEVEL
+from tetris_phase import tetris_phase, tetris_asset_specs
+from tetris_bot import TetrisBot
+from rocket_race import RocketRace, race_asset_specs
 from end_screen import end_screen
-
-def compute_advantage(times):
-    urss = times["URSS_ms"]
-    eua  = times["EUA_ms"]
-    # limita a vantagem a no máximo 25% da pista para dar chance ao adversário
-    capped_pct = min(MAX_TETRIS_ADV_PCT, 0.15)
-    adv_cap = int(capped_pct * FINISH_LINE)
-    diff = abs(urss - eua)
-    diff_progress = min(adv_cap, int(diff * MS_TO_PROGRESS))
-    if urss < eua:
-        return diff_progress, 0  # URSS vantagem
-    elif eua < urss:
-        return 0, diff_progress  # EUA vantagem
-    else:
-        return 0, 0
+from assets import asset_manager, ASSETS_DIR, BACKGROUNDS_DIR, SPRITES_DIR
+from asset_bundle import open_bundle
+from text_cache import get_font, render_text, text_cache
+from replay import replay_path
+from profiler import frame_profiler, export_all, install as install_profiler
+from scoring import compute_advantage
+
+# CAPA: procura primeiro em assets/backgrounds, depois em assets raiz
+COVER_CANDIDATES = [
+    os.path.join(BACKGROUNDS_DIR, "capa.png"),
+    os.path.join(BACKGROUNDS_DIR, "cover.png"),
+    os.path.join(ASSETS_DIR, "capa.png"),
+    os.path.join(ASSETS_DIR, "cover.png"),
+]
+# FUNDO DO TETRIS: tenta tetris_bg.png, senão usa lab_urss / lab_usa como fallback
+TETRIS_BG_CANDIDATES = [
+    os.path.join(BACKGROUNDS_DIR, "tetris_bg.png"),
+    os.path.join(BACKGROUNDS_DIR, "lab_urss.png"),
+    os.path.join(BACKGROUNDS_DIR, "lab_usa.png"),
+]
+
+def game_asset_specs():
+    """Todas as imagens do jogo depois do menu, na ordem em que são usadas."""
+    full = (WIDTH, HEIGHT)
+    specs = [(os.path.join(SPRITES_DIR, f"cutscene_{i}.png"), full, "smooth", True) for i in range(1, 7)]
+    for p in TETRIS_BG_CANDIDATES:
+        if os.path.exists(p):
+            specs.append((p, full, "smooth", True))
+            break
+    specs += tetris_asset_specs(WIDTH, HEIGHT)
+    specs.append((os.path.join(SPRITES_DIR, "cutscene_foguete.png"), full, "smooth", True))
+    specs += race_asset_specs()
+    return specs
+
+def bundle_asset_specs():
+    """Specs gravadas no bundle pré-escalado: capa + tudo que o pré-carregamento busca."""
+    specs = []
+    for p in COVER_CANDIDATES:
+        if os.path.exists(p):
+            specs.append((p, (WIDTH, HEIGHT), "smooth", True))
+            break
+    return specs + game_asset_specs()
+
+def draw_preload_progress(screen):
+    """Barra fina no rodapé enquanto o pré-carregamento de assets não termina."""
+    frac = asset_manager.preload_progress()
+    if frac is None:
+        return
+    bar = pygame.Rect(WIDTH//2 - 150, HEIGHT - 18, 300, 6)
+    pygame.draw.rect(screen, (40,40,50), bar, border_radius=3)
+    pygame.draw.rect(screen, (200,200,200), (bar.x, bar.y, int(bar.width * frac), bar.height), border_radius=3)
 
 # -------------------------
 # Texto utilitário (mantido)
@@ -46,9 +84,9 @@ def wrap_text(text, font, max_width):
 
 def show_text_screen(screen, title_text, body_text):
     clock = pygame.time.Clock()
-    title_font = pygame.font.SysFont("Arial", 36, bold=True)
-    body_font = pygame.font.SysFont("Arial", 20)
-    btn_font = pygame.font.SysFont("Arial", 20, bold=True)
+    title_font = get_font("Arial", 36, bold=True)
+    body_font = get_font("Arial", 20)
+    btn_font = get_font("Arial", 20, bold=True)
     # back button moved para o topo
     back_rect = pygame.Rect(20, 20, 120, 36)
 
@@ -96,7 +134,7 @@ def show_text_screen(screen, title_text, body_text):
         screen.fill((10, 14, 30))
         # título — cor branca se for História ou Sobre (mantém amarelo para demais)
         title_color = (255,255,255) if ("hist" in title_text.lower() or "sobre" in title_text.lower()) else (255, 215, 0)
-        title_s = title_font.render(title_text, True, title_color)
+        title_s = render_text(title_font, title_text, title_color)
         screen.blit(title_s, (WIDTH//2 - title_s.get_width()//2, 64))
 
         # body (aplica scroll)
@@ -105,7 +143,7 @@ def show_text_screen(screen, title_text, body_text):
         for line in lines:
             line_y = y
             if line_y + line_h >= text_top and line_y <= text_bottom:
-                line_s = body_font.render(line, True, (230,230,230))
+                line_s = render_text(body_font, line, (230,230,230))
                 screen.blit(line_s, (text_x, line_y))
             y += line_h
 
@@ -113,7 +151,7 @@ def show_text_screen(screen, title_text, body_text):
 
         # back button (no topo)
         pygame.draw.rect(screen, (60,60,70) if back_rect.collidepoint(mouse_pos) else (40,40,50), back_rect, border_radius=6)
-        back_s = btn_font.render("Voltar", True, (240,240,240))
+        back_s = render_text(btn_font, "Voltar", (240,240,240))
         screen.blit(back_s, (back_rect.x + (back_rect.width-back_s.get_width())//2, back_rect.y + (back_rect.height-back_s.get_height())//2))
 
         # barra de rolagem simples à direita da área de texto
@@ -143,9 +181,9 @@ def _show_dialogue_generic(screen, dialogues, bg_image=None, typing_speed_chars_
     Se o diálogo tem imagem (terceiro item), ela é usada; caso contrário, usa fundo escuro.
     """
     pygame.font.init()
-    name_font = pygame.font.SysFont("Arial", 22, bold=True)   # menor para caber dentro da caixa
-    text_font = pygame.font.SysFont("Arial", 22)
-    hint_font = pygame.font.SysFont("Arial", 16)
+    name_font = get_font("Arial", 22, bold=True)   # menor para caber dentro da caixa
+    text_font = get_font("Arial", 22)
+    hint_font = get_font("Arial", 16)
     clock = pygame.time.Clock()
 
     box_margin = 48
@@ -202,14 +240,16 @@ def _show_dialogue_generic(screen, dialogues, bg_image=None, typing_speed_chars_
         total_chars = sum(len(line) for line in wrapped_lines)
         finished = False
         last_tick = pygame.time.get_ticks()
+        prof = frame_profiler("dialogue")
 
         while True:
+            prof.begin()
             now = pygame.time.get_ticks()
             dt = now - last_tick
             last_tick = now
 
             advance = False
-            for ev in pygame.event.get():
+            for ev in prof.events():
                 if ev.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
@@ -230,6 +270,7 @@ def _show_dialogue_generic(screen, dialogues, bg_image=None, typing_speed_chars_
                     else:
                         advance = True
 
+            prof.mark("events")
             if advance:
                 break
 
@@ -238,6 +279,7 @@ def _show_dialogue_generic(screen, dialogues, bg_image=None, typing_speed_chars_
                 if typed_chars >= total_chars:
                     typed_chars = total_chars
                     finished = True
+            prof.mark("update")
 
             # fundo: imagem estática por diálogo (se houver) ou fundo escuro
             if dlg_bg:
@@ -257,7 +299,7 @@ def _show_dialogue_generic(screen, dialogues, bg_image=None, typing_speed_chars_
             pygame.draw.rect(screen, (30,30,30), box_rect, 2, border_radius=10)
 
             # nome do orador dentro da caixa
-            name_surf = name_font.render(speaker, True, (18,18,18))
+            name_surf = render_text(name_font, speaker, (18,18,18))
             name_pos = (box_rect.x + 12, box_rect.y + 8)
             screen.blit(name_surf, name_pos)
 
@@ -269,21 +311,30 @@ def _show_dialogue_generic(screen, dialogues, bg_image=None, typing_speed_chars_
                 if remaining <= 0:
                     break
                 if remaining >= len(line):
-                    to_draw = line
+                    txt_s = render_text(text_font, line, (20,20,20))
                 else:
-                    to_draw = line[:remaining]
-                txt_s = text_font.render(to_draw, True, (20,20,20))
+                    # prefixo em digitação muda a cada frame: fora do cache (só linhas completas entram)
+                    txt_s = text_font.render(line[:remaining], True, (20,20,20))
                 screen.blit(txt_s, (box_rect.x + 12, y))
                 y += text_font.get_linesize()
                 remaining -= len(line)
 
             # hint abaixo da caixa
             hint = "Espaço/Enter ou clique para avançar"
-            hint_s = hint_font.render(hint, True, (200,200,200))
+            hint_s = render_text(hint_font, hint, (200,200,200))
             screen.blit(hint_s, (WIDTH//2 - hint_s.get_width()//2, box_rect.y + box_rect.height + 10))
+            prof.mark("draw")
+
+            asset_manager.pump(max_items=2)
+            prof.mark("update")
+            draw_preload_progress(screen)
+            prof.draw_overlay(screen)
+            prof.mark("draw")
 
             pygame.display.flip()
+            prof.mark("flip")
             clock.tick(FPS)
+            prof.mark("wait")
     # fim for dialogues
 
 
@@ -303,20 +354,11 @@ def show_story_cutscene(screen):
         ("Narrador", "Prepare-se: monte seu foguete com cuidado. Quando estiver pronto, a corrida começa.")
     ]
 
-    # caminho CORRIGIDO: assets está uma pasta acima de src
-    assets_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', 'assets'))
-    sprites_dir = os.path.join(assets_dir, "sprites")
     dlg_with_bg = []
     for idx, (s, t) in enumerate(dialogues, start=1):
-        img = None
-        # procura diretamente em assets/sprites por cutscene_#.png
-        p = os.path.join(sprites_dir, f"cutscene_{idx}.png")
-        if os.path.exists(p):
-            try:
-                img = pygame.image.load(p).convert_alpha()
-                img = pygame.transform.smoothscale(img, (WIDTH, HEIGHT))
-            except Exception:
-                img = None
+        # procura diretamente em assets/sprites por cutscene_#.png (cache compartilhado)
+        p = os.path.join(SPRITES_DIR, f"cutscene_{idx}.png")
+        img = asset_manager.load(p, (WIDTH, HEIGHT))
         dlg_with_bg.append((s, t, img))
 
     _show_dialogue_generic(screen, dlg_with_bg, bg_image=None, typing_speed_chars_per_sec=140)
@@ -324,16 +366,20 @@ def show_story_cutscene(screen):
 # -------------------------
 # Mantive a sua show_menu praticamente igual, só ajuste para chamar intro+história
 # -------------------------
-def show_menu(screen, cover_image=None):
+# botão de modo do menu: lado do Tetris jogado pelo computador (None = dois jogadores)
+CPU_CHOICES = (None, "EUA", "URSS")
+CPU_LABELS = {None: "2 jogadores", "EUA": "CPU: EUA", "URSS": "CPU: URSS"}
+
+def show_menu(screen, cover_image=None, cpu=TETRIS_CPU):
     """
-    Mostra a tela inicial com capa e 3 botões: Jogar, História, Sobre.
-    Retorna quando o jogador escolher Jogar.
+    Mostra a tela inicial com capa e 4 botões: Jogar, modo, História, Sobre.
+    Quando o jogador escolher Jogar, retorna o lado do Tetris do computador (ou None).
     """
     pygame.font.init()
     clock = pygame.time.Clock()
-    title_font = pygame.font.SysFont("Arial", 48, bold=True)
-    btn_font = pygame.font.SysFont("Arial", 26, bold=True)
-    small_font = pygame.font.SysFont("Arial", 18)
+    title_font = get_font("Arial", 48, bold=True)
+    btn_font = get_font("Arial", 26, bold=True)
+    small_font = get_font("Arial", 18)
 
     # usa a imagem passada ou nenhum fundo se None
     bg_image = cover_image
@@ -341,15 +387,18 @@ def show_menu(screen, cover_image=None):
     # botões centralizados
     btn_w, btn_h = 220, 60
     spacing = 20
-    total_h = btn_h*3 + spacing*2
+    total_h = btn_h*4 + spacing*3
     start_y = HEIGHT//2 - total_h//2 + 80
     play_rect = pygame.Rect(WIDTH//2 - btn_w//2, start_y, btn_w, btn_h)
-    history_rect = pygame.Rect(WIDTH//2 - btn_w//2, start_y + btn_h + spacing, btn_w, btn_h)
-    about_rect = pygame.Rect(WIDTH//2 - btn_w//2, start_y + 2*(btn_h + spacing), btn_w, btn_h)
+    mode_rect = pygame.Rect(WIDTH//2 - btn_w//2, start_y + btn_h + spacing, btn_w, btn_h)
+    history_rect = pygame.Rect(WIDTH//2 - btn_w//2, start_y + 2*(btn_h + spacing), btn_w, btn_h)
+    about_rect = pygame.Rect(WIDTH//2 - btn_w//2, start_y + 3*(btn_h + spacing), btn_w, btn_h)
 
+    prof = frame_profiler("menu")
     running = True
     while running:
-        for ev in pygame.event.get():
+        prof.begin()
+        for ev in prof.events():
             if ev.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -362,7 +411,9 @@ def show_menu(screen, cover_image=None):
                     # e então retorna para iniciar os minigames no main()
                    
                     show_story_cutscene(screen)
-                    return  # começa os minigames
+                    return cpu  # começa os minigames
+                if mode_rect.collidepoint(ev.pos):
+                    cpu = CPU_CHOICES[(CPU_CHOICES.index(cpu) + 1) % len(CPU_CHOICES)]
                 if history_rect.collidepoint(ev.pos):
                     show_text_screen(screen, "História", (
                         "A Corrida Espacial foi um dos capítulos mais marcantes da Guerra Fria, um período em que os Estados Unidos e a União Soviética "
@@ -396,6 +447,7 @@ def show_menu(screen, cover_image=None):
                         "Por: Pedro, Guilherme, Matheus, Lucas P., Emanuel P., Gabriel Y.,"
                     ))
 
+        prof.mark("events")
         mouse_pos = pygame.mouse.get_pos()
         # desenha fundo
         if bg_image:
@@ -407,23 +459,35 @@ def show_menu(screen, cover_image=None):
             screen.fill((6,12,40))
 
         # titulo e subtitulo
-        title_s = title_font.render("CORRIDA ESPACIAL", True, (255, 255, 255))
+        title_s = render_text(title_font, "CORRIDA ESPACIAL", (255, 255, 255))
         screen.blit(title_s, (WIDTH//2 - title_s.get_width()//2, 60))
-        hint_s = small_font.render("Use o mouse para escolher.", True, (200,200,200))
+        hint_s = render_text(small_font, "Use o mouse para escolher.", (200,200,200))
         screen.blit(hint_s, (WIDTH//2 - hint_s.get_width()//2, 120))
 
         # desenha botões
-        for rect, text in ((play_rect, "Jogar"), (history_rect, "História"), (about_rect, "Sobre")):
+        for rect, text in ((play_rect, "Jogar"), (mode_rect, CPU_LABELS[cpu]), (history_rect, "História"),
+                           (about_rect, "Sobre")):
             hovered = rect.collidepoint(mouse_pos)
             color = (160, 40, 40) if text == "Jogar" else (160,40,40)
             bg = tuple(min(255, c + (30 if hovered else 0)) for c in color)
             pygame.draw.rect(screen, bg, rect, border_radius=8)
             pygame.draw.rect(screen, (10,10,10), rect, 3, border_radius=8)
-            txt = btn_font.render(text, True, (255,255,255))
+            txt = render_text(btn_font, text, (255,255,255))
             screen.blit(txt, (rect.x + (rect.width - txt.get_width())//2, rect.y + (rect.height - txt.get_height())//2))
 
+        prof.mark("draw")
+
+        # recebe poucas imagens por frame do pré-carregamento para não travar o menu
+        asset_manager.pump(max_items=2)
+        prof.mark("update")
+        draw_preload_progress(screen)
+        prof.draw_overlay(screen)
+        prof.mark("draw")
+
         pygame.display.flip()
+        prof.mark("flip")
         clock.tick(60)
+        prof.mark("wait")
 
 # -------------------------
 # MAIN
@@ -432,54 +496,35 @@ def main():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Cold War Race - Montagem & Corrida")
+    if PROFILE:
+        screen = install_profiler(screen)  # conta blits/desenhos/superfícies por frame
 
-    # caminhos de assets (corrigido: assets está uma pasta acima de src)
-    assets_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'assets'))
-    backgrounds_dir = os.path.join(assets_dir, "backgrounds")
-    sprites_dir = os.path.join(assets_dir, "sprites")
-    print(f"Procurando assets em: {assets_dir}")
-
-    # CARREGA CAPA: procura primeiro em assets/backgrounds, depois em assets raiz
-    cover_image = None
-    cover_candidates = [
-        os.path.join(backgrounds_dir, "capa.png"),
-        os.path.join(backgrounds_dir, "cover.png"),
-        os.path.join(assets_dir, "capa.png"),
-        os.path.join(assets_dir, "cover.png"),
-    ]
-    for p in cover_candidates:
-        if os.path.exists(p):
-            try:
-                cover_image = pygame.image.load(p).convert_alpha()
-                cover_image = pygame.transform.smoothscale(cover_image, (WIDTH, HEIGHT))
-                print("Carregou capa de:", p)
-                break
-            except Exception as e:
-                print("Falha ao carregar capa", p, e)
-        else:
-            print("Não encontrado:", p)
-
-    # CARREGA FUNDO DO TETRIS: tenta tetris_bg.png, senão usa lab_urss / lab_usa como fallback
-    tetris_bg = None
-    tetris_candidates = [
-        os.path.join(backgrounds_dir, "tetris_bg.png"),
-        os.path.join(backgrounds_dir, "lab_urss.png"),
-        os.path.join(backgrounds_dir, "lab_usa.png"),
-    ]
-    for p2 in tetris_candidates:
-        if os.path.exists(p2):
-            try:
-                tetris_bg = pygame.image.load(p2).convert_alpha()
-                tetris_bg = pygame.transform.smoothscale(tetris_bg, (WIDTH, HEIGHT))
-                print("Carregou tetris bg de:", p2)
-                break
-            except Exception as e:
-                print("Falha ao carregar tetris bg", p2, e)
-        else:
-            print("Não encontrado:", p2)
+    print(f"Procurando assets em: {ASSETS_DIR}")
+
+    # bundle pré-escalado (gerado por asset_bundle.py): pula decode de PNG e resample
+    bundle = open_bundle()
+    if bundle:
+        print("Bundle de assets:", asset_manager.attach_bundle(bundle), "superfícies")
+
+    # CARREGA CAPA (única imagem necessária antes do menu)
+    cover_image, p = asset_manager.load_first(COVER_CANDIDATES, (WIDTH, HEIGHT))
+    if cover_image:
+        print("Carregou capa de:", p)
+    else:
+        print("Capa não encontrada em:", COVER_CANDIDATES)
+
+    # o resto do jogo é decodificado/escalado em segundo plano enquanto o menu está aberto
+    asset_manager.start_preload(game_asset_specs())
 
     # mostra menu inicial e só prossegue quando Jogar for escolhido
-    show_menu(screen, cover_image)
+    tetris_cpu = show_menu(screen, cover_image)
+
+    # CARREGA FUNDO DO TETRIS (normalmente já veio do pré-carregamento)
+    tetris_bg, p2 = asset_manager.load_first(TETRIS_BG_CANDIDATES, (WIDTH, HEIGHT))
+    if tetris_bg:
+        print("Carregou tetris bg de:", p2)
+    else:
+        print("Fundo do tetris não encontrado em:", TETRIS_BG_CANDIDATES)
 
     # === FASE 1: TETRIS (montagem do foguete) ===
     # desenha fundo do Tetris se existir
@@ -491,22 +536,17 @@ def main():
     # desloca o Tetris para a esquerda para liberar o centro para as manchetes
     x_offset = -150                   # ajuste esse valor conforme quiser (negativo = esquerda)
     headlines_y = HEIGHT // 2 - 20    # y para desenhar as manchetes no meio da tela
-    times = tetris_phase(screen, x_offset=x_offset, headlines_y=headlines_y)  # retorna ms de cada player
+    bot = TetrisBot(("URSS", "EUA").index(tetris_cpu), TETRIS_CPU_LEVEL) if tetris_cpu else None
+    times = tetris_phase(screen, x_offset=x_offset, headlines_y=headlines_y,
+                         record_path=replay_path("tetris"), bot=bot)  # retorna ms de cada player
 
     # calcula vantagem inicial em progresso para a corrida
     adv_urss, adv_eua = compute_advantage(times)
 
     # mostra cutscene informativa antes da corrida (usando imagem cutscene_foguete)
-    sprites_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'assets', 'sprites'))
-    foguete_img = None
-    foguete_path = os.path.join(sprites_dir, "cutscene_foguete.png")
-    if os.path.exists(foguete_path):
-        try:
-            foguete_img = pygame.image.load(foguete_path).convert_alpha()
-            foguete_img = pygame.transform.smoothscale(foguete_img, (WIDTH, HEIGHT))
-        except Exception as e:
-            print("Erro ao carregar cutscene_foguete:", e)
-    else:
+    foguete_path = os.path.join(SPRITES_DIR, "cutscene_foguete.png")
+    foguete_img = asset_manager.load(foguete_path, (WIDTH, HEIGHT))
+    if foguete_img is None:
         print("cutscene_foguete não encontrado em:", foguete_path)
 
     # prepara texto conforme vantagem
@@ -522,8 +562,12 @@ def main():
 
     # === FASE 2: CORRIDA ESPACIAL ===
     # RocketRace aceita advantage1 (URSS) e advantage2 (EUA)
-    race = RocketRace(screen, advantage1=adv_urss, advantage2=adv_eua)
+    race = RocketRace(screen, advantage1=adv_urss, advantage2=adv_eua, record_path=replay_path("race"))
     winner = race.run()
+    if PROFILE:
+        print(asset_manager.report())
+        print(text_cache.report())
+        print("Perfis de frame:", ", ".join(export_all()))
 
     # === TELA FINAL ===
     end_screen(screen, winner)
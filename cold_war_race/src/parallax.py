@@ -0,0 +1,105 @@
+import random
+import pygame
+
+# Fundo da corrida em camadas com parallax. Cada metade da tela (URSS à esquerda, EUA à
+# direita) rola para baixo conforme o progresso do seu lado, cada camada numa velocidade
+# (px por unidade de progresso). Todas as camadas são tiras pré-renderizadas que emendam
+# na vertical, desenhadas com no máximo dois blits (o pedaço de baixo da tira em cima e o
+# de cima embaixo). Camadas de estrelas usam colorkey com RLE, então o blit só percorre
+# os pixels das estrelas.
+#   base    o fundo procedural (nebulosas) espelhado na vertical para emendar
+#   stars   estrelas da tira; radius e bright definem o sprite
+LAYERS = [
+    {"speed": 0.1, "base": True},
+    {"speed": 0.5, "stars": 90, "radius": 1, "bright": 110},
+    {"speed": 1.0, "stars": 45, "radius": 1, "bright": 170},
+    {"speed": 2.0, "stars": 18, "radius": 2, "bright": 230},
+]
+KEY = (255, 0, 255)
+
+
+def _display_format(surface):
+    return surface.convert() if pygame.display.get_surface() is not None else surface
+
+
+def _mirror_strip(surface):
+    """surface + cópia espelhada embaixo: tira com o dobro da altura que emenda consigo mesma."""
+    w, h = surface.get_size()
+    strip = pygame.Surface((w, 2 * h))
+    strip.blit(surface, (0, 0))
+    strip.blit(pygame.transform.flip(surface, False, True), (0, h))
+    return _display_format(strip)
+
+
+def _star_strip(width, height, layer, rng):
+    """Tira transparente (colorkey) com as estrelas da camada; estrelas na borda repetem do outro lado."""
+    strip = _display_format(pygame.Surface((width, height)))
+    strip.fill(KEY)
+    r = layer["radius"]
+    b = layer["bright"]
+    for _ in range(layer["stars"]):
+        x = rng.randrange(width)
+        y = rng.randrange(height)
+        color = (b, b, min(255, b + rng.randrange(0, 40)))
+        for dy in (-height, 0, height):
+            if -r <= y + dy < height + r:
+                pygame.draw.circle(strip, color, (x, y + dy), r)
+    strip.set_colorkey(KEY, pygame.RLEACCEL)
+    return strip
+
+
+def wrap_items(strip, offset, rect):
+    """Itens de blits() que cobrem `rect` com `strip` deslocada `offset` px para baixo."""
+    height = strip.get_height()
+    start = (-offset) % height          # linha da tira que aparece no topo do rect
+    first = min(rect.height, height - start)
+    items = [(strip, rect.topleft, (0, start, rect.width, first))]
+    if first < rect.height:
+        items.append((strip, (rect.x, rect.y + first), (0, 0, rect.width, rect.height - first)))
+    return items
+
+
+class ParallaxBackground:
+    def __init__(self, base, width, height, seed=None, layers=LAYERS):
+        self.layers = layers
+        half = width // 2
+        self.regions = [pygame.Rect(0, 0, half, height), pygame.Rect(half, 0, width - half, height)]
+        rng = random.Random(seed)
+        # tiras por camada: a base tem uma por metade (recorte do fundo); estrelas servem às duas
+        self.strips = []
+        for layer in layers:
+            if layer.get("base"):
+                self.strips.append([_mirror_strip(base.subsurface(r)) for r in self.regions])
+            else:
+                strip = _star_strip(max(r.width for r in self.regions), height, layer, rng)
+                self.strips.append([strip] * len(self.regions))
+        self.offsets = [[0] * len(layers) for _ in self.regions]
+        self.visible = len(layers)   # camadas desenhadas (as primeiras, mais distantes)
+        self.moving = True           # False congela a rolagem (nada fica sujo)
+
+    def set_detail(self, star_layers):
+        """Quantas camadas de estrelas desenhar; 0 também congela a rolagem do fundo."""
+        stars = [i for i, layer in enumerate(self.layers) if not layer.get("base")]
+        hidden = stars[star_layers:]
+        self.visible = hidden[0] if hidden else len(self.layers)
+        self.moving = star_layers > 0
+
+    def scroll(self, progress):
+        """Atualiza os deslocamentos das camadas pelo progresso de cada lado."""
+        if not self.moving:
+            return
+        for offsets, p in zip(self.offsets, progress):
+            for k in range(self.visible):
+                offsets[k] = int(p * self.layers[k]["speed"])
+
+    def blit_items(self):
+        """Itens de blits() de todas as camadas visíveis, nas duas metades."""
+        items = []
+        for i, rect in enumerate(self.regions):
+            offsets = self.offsets[i]
+            for k in range(self.visible):
+                items.extend(wrap_items(self.strips[k][i], offsets[k], rect))
+        return items
+
+    def draw(self, surface):
+        surface.blits(self.blit_items(), doreturn=False)
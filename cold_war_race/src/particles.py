@@ -0,0 +1,150 @@
+import math, random
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy: listas Python (ok para algumas centenas de partículas)
+    np = None
+
+# Partículas das explosões da corrida: pool de capacidade fixa (anel; quando enche,
+# as mais antigas são reaproveitadas), integração e fade vetorizados e desenho com um
+# único blits() a partir de sprites pré-renderizados por (tamanho, faixa de vida).
+CAPACITY = 1024
+BURST = 24                     # partículas por explosão
+LIFE = (0.35, 0.8)             # segundos
+SPEED = (60, 260)              # px/s
+DRAG = 2.5                     # desaceleração (1/s)
+RADII = (2, 3, 5)
+FADE_STEPS = 8
+# cor no início da vida -> fim (amarelo, laranja, vermelho escuro)
+COLORS = [(255, 230, 120), (255, 140, 30), (255, 80, 0), (120, 30, 10)]
+
+
+def _lerp_color(t):
+    """Cor para t em [0, 1] (0 = recém-nascida, 1 = no fim)."""
+    t = t * (len(COLORS) - 1)
+    i = min(int(t), len(COLORS) - 2)
+    f = t - i
+    a, b = COLORS[i], COLORS[i + 1]
+    return tuple(int(a[k] + (b[k] - a[k]) * f) for k in range(3))
+
+
+def _particle_sprites():
+    """[tamanho][faixa de vida] -> sprite; faixa 0 = quase morta (mais escura e transparente)."""
+    table = []
+    for r in RADII:
+        size = 2 * r + 1
+        row = []
+        for step in range(FADE_STEPS):
+            frac = (step + 1) / FADE_STEPS        # vida restante
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            color = _lerp_color(1.0 - frac) + (int(255 * frac),)
+            pygame.draw.circle(surf, color, (r, r), r)
+            row.append(surf)
+        table.append(row)
+    return table
+
+
+class ParticleSystem:
+    def __init__(self, capacity=CAPACITY, seed=None):
+        self.capacity = capacity
+        self.burst_size = BURST
+        self.head = 0  # próximo slot do anel
+        self._sprites = _particle_sprites()
+        if np is not None:
+            self._rng = np.random.default_rng(seed)
+            self.x = np.zeros(capacity)
+            self.y = np.zeros(capacity)
+            self.vx = np.zeros(capacity)
+            self.vy = np.zeros(capacity)
+            self.life = np.zeros(capacity)       # segundos restantes (<= 0: morta)
+            self.max_life = np.ones(capacity)
+            self.size = np.zeros(capacity, dtype=np.int32)
+        else:
+            self._rng = random.Random(seed)
+            self.x = [0.0] * capacity
+            self.y = [0.0] * capacity
+            self.vx = [0.0] * capacity
+            self.vy = [0.0] * capacity
+            self.life = [0.0] * capacity
+            self.max_life = [1.0] * capacity
+            self.size = [0] * capacity
+
+    def burst(self, x, y, count=None):
+        """Explosão em (x, y): `count` partículas em direções aleatórias."""
+        n = min(self.burst_size if count is None else count, self.capacity)
+        if n <= 0:
+            return
+        rng = self._rng
+        if np is not None:
+            idx = (self.head + np.arange(n)) % self.capacity
+            angle = rng.uniform(0, 2 * math.pi, n)
+            speed = rng.uniform(*SPEED, n)
+            self.x[idx] = x
+            self.y[idx] = y
+            self.vx[idx] = np.cos(angle) * speed
+            self.vy[idx] = np.sin(angle) * speed
+            self.life[idx] = self.max_life[idx] = rng.uniform(*LIFE, n)
+            self.size[idx] = rng.integers(0, len(RADII), n)
+        else:
+            for k in range(n):
+                i = (self.head + k) % self.capacity
+                angle = rng.uniform(0, 2 * math.pi)
+                speed = rng.uniform(*SPEED)
+                self.x[i], self.y[i] = x, y
+                self.vx[i] = math.cos(angle) * speed
+                self.vy[i] = math.sin(angle) * speed
+                self.life[i] = self.max_life[i] = rng.uniform(*LIFE)
+                self.size[i] = rng.randrange(len(RADII))
+        self.head = (self.head + n) % self.capacity
+
+    def update(self, dt):
+        """Integra posição com arrasto e consome a vida de todas as partículas."""
+        if dt <= 0:
+            return
+        damp = max(0.0, 1.0 - DRAG * dt)
+        if np is not None:
+            self.x += self.vx * dt
+            self.y += self.vy * dt
+            self.vx *= damp
+            self.vy *= damp
+            self.life -= dt
+        else:
+            for i in range(self.capacity):
+                if self.life[i] > 0:
+                    self.x[i] += self.vx[i] * dt
+                    self.y[i] += self.vy[i] * dt
+                    self.vx[i] *= damp
+                    self.vy[i] *= damp
+                    self.life[i] -= dt
+
+    def blit_items(self):
+        """Lista (sprite, posição) das partículas vivas, pronta para Surface.blits()."""
+        table = self._sprites
+        if np is not None:
+            idx = (self.life > 0).nonzero()[0]
+            if not len(idx):
+                return []
+            step = (self.life[idx] / self.max_life[idx] * FADE_STEPS).astype(np.int32)
+            np.clip(step, 0, FADE_STEPS - 1, out=step)
+            size = self.size[idx]
+            radius = np.array(RADII)[size]
+            xs = (self.x[idx] - radius).astype(np.int32).tolist()
+            ys = (self.y[idx] - radius).astype(np.int32).tolist()
+            return [(table[s][f], (x, y)) for s, f, x, y in zip(size.tolist(), step.tolist(), xs, ys)]
+        items = []
+        for i in range(self.capacity):
+            if self.life[i] > 0:
+                f = min(FADE_STEPS - 1, int(self.life[i] / self.max_life[i] * FADE_STEPS))
+                r = RADII[self.size[i]]
+                items.append((table[self.size[i]][f], (int(self.x[i] - r), int(self.y[i] - r))))
+        return items
+
+    def draw(self, surface, doreturn=False):
+        return surface.blits(self.blit_items(), doreturn=doreturn)
+
+    def clear(self):
+        if np is not None:
+            self.life[:] = 0
+        else:
+            self.life = [0.0] * self.capacity
@@ -0,0 +1,227 @@
+import os, csv, json
+from collections import deque
+from time import perf_counter_ns
+import pygame
+from assets import ASSETS_DIR
+from text_cache import get_font, text_cache
+from scoring import percentile
+
+# Profiler de frames por cena (menu, diálogos, tetris, corrida). Cada loop chama
+# begin() no topo do frame e mark(fase) ao fim de cada trecho; o tempo desde a marca
+# anterior vai para a fase: events, update, draw, flip e wait (sono do clock.tick).
+# O tempo é sempre medido (custa ~10 perf_counter_ns por frame) e F3 liga o overlay
+# com p50/p99. Com PROFILE ligado, install() também conta blits e desenhos na tela
+# e superfícies criadas, e o main exporta CSV/JSON por cena em PROFILE_DIR.
+PHASES = ("events", "update", "draw", "flip", "wait")
+COUNTERS = ("blits", "draws", "surfaces")
+COLUMNS = tuple(f"{p}_ns" for p in PHASES) + ("frame_ns",) + COUNTERS
+PROFILE_DIR = os.path.join(ASSETS_DIR, "cache", "profiles")
+MAX_FRAMES = 36000     # ~10 min a 60 FPS por cena
+WINDOW = 300           # frames usados no p50/p99 do overlay
+OVERLAY_REFRESH = 15   # recalcula o texto do overlay a cada N frames
+TOGGLE_KEY = pygame.K_F3
+
+counters = dict.fromkeys(COUNTERS, 0)
+overlay_visible = False
+profilers = {}         # cena -> FrameProfiler
+_active = None         # profiler do loop que está rodando agora
+
+
+class FrameProfiler:
+    def __init__(self, scene, max_frames=MAX_FRAMES):
+        self.scene = scene
+        self.frames = deque(maxlen=max_frames)  # tuplas na ordem de COLUMNS
+        self._start = None                      # início do frame corrente (None = descartar)
+        self._t = 0
+        self._phase_ns = [0] * len(PHASES)
+        self._base = (0, 0, 0)
+        self._overlay = None
+        self._overlay_age = 0
+
+    def enter(self):
+        """Início de um loop da cena: quem estava ativo (cena de fora) perde o frame em curso."""
+        global _active
+        if _active is not None and _active is not self:
+            _active._start = None
+        _active = self
+        self._start = None
+        return self
+
+    def _counts(self):
+        return (counters["blits"], counters["draws"], counters["surfaces"] + text_cache.misses)
+
+    def begin(self):
+        """Topo do frame: fecha o anterior (se houve) e começa a medir o próximo."""
+        global _active
+        now = perf_counter_ns()
+        if self._start is not None:
+            counts = self._counts()
+            self.frames.append(tuple(self._phase_ns) + (now - self._start,) +
+                               tuple(c - b for c, b in zip(counts, self._base)))
+        if _active is not self:
+            # voltou de uma cena aninhada (ex.: menu -> história): o frame é retomado do zero
+            if _active is not None:
+                _active._start = None
+            _active = self
+        self._start = self._t = now
+        self._phase_ns = [0] * len(PHASES)
+        self._base = self._counts()
+
+    def mark(self, phase):
+        """Atribui a `phase` o tempo desde a última marca (ou desde begin())."""
+        now = perf_counter_ns()
+        self._phase_ns[PHASES.index(phase)] += now - self._t
+        self._t = now
+
+    def busy_ns(self):
+        """Trabalho do frame corrente até agora (todas as fases menos a espera do clock)."""
+        return sum(self._phase_ns) - self._phase_ns[PHASES.index("wait")]
+
+    def events(self):
+        """pygame.event.get() tratando a tecla do overlay."""
+        global overlay_visible
+        evs = pygame.event.get()
+        for ev in evs:
+            if ev.type == pygame.KEYDOWN and ev.key == TOGGLE_KEY:
+                overlay_visible = not overlay_visible
+        return evs
+
+    def summary(self, last=None):
+        """{coluna: {p50, p99, mean}} em ms (tempos) ou contagem (contadores)."""
+        frames = list(self.frames)[-last:] if last else list(self.frames)
+        out = {"scene": self.scene, "frames": len(frames)}
+        for k, col in enumerate(COLUMNS):
+            values = sorted(f[k] for f in frames)
+            scale = 1e-6 if col.endswith("_ns") else 1
+            name = col[:-3] + "_ms" if col.endswith("_ns") else col
+            mean = sum(values) / len(values) if values else 0
+            out[name] = {"p50": percentile(values, 0.5) * scale, "p99": percentile(values, 0.99) * scale,
+                         "mean": mean * scale}
+        return out
+
+    def draw_overlay(self, surface, pos=(8, 8)):
+        """Desenha p50/p99 (se F3 ligou o overlay); retorna o rect desenhado ou None."""
+        if not overlay_visible:
+            return None
+        self._overlay_age -= 1
+        if self._overlay is None or self._overlay_age <= 0:
+            self._overlay_age = OVERLAY_REFRESH
+            s = self.summary(WINDOW)
+            lines = [f"{self.scene}  frame p50 {s['frame_ms']['p50']:.2f} ms  p99 {s['frame_ms']['p99']:.2f} ms"]
+            lines.append("  ".join(f"{p} {s[p + '_ms']['p50']:.2f}/{s[p + '_ms']['p99']:.2f}" for p in PHASES))
+            if counters_installed():
+                lines.append("  ".join(f"{c} {s[c]['p50']:.0f}" for c in COUNTERS))
+            font = get_font("consolas", 14)
+            rows = [font.render(line, True, (200, 255, 200)) for line in lines]
+            w = max(r.get_width() for r in rows) + 12
+            h = sum(r.get_height() for r in rows) + 8
+            self._overlay = pygame.Surface((w, h), pygame.SRCALPHA)
+            self._overlay.fill((0, 0, 0, 180))
+            y = 4
+            for r in rows:
+                self._overlay.blit(r, (6, y))
+                y += r.get_height()
+        return surface.blit(self._overlay, pos)
+
+    def export(self, directory=PROFILE_DIR):
+        """Grava <cena>.csv (um frame por linha) e <cena>.json (resumo); retorna os caminhos."""
+        os.makedirs(directory, exist_ok=True)
+        csv_path = os.path.join(directory, f"{self.scene}.csv")
+        json_path = os.path.join(directory, f"{self.scene}.json")
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(self.frames)
+        with open(json_path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return csv_path, json_path
+
+
+def frame_profiler(scene):
+    """Profiler da cena (o mesmo objeto a cada chamada, os frames acumulam); chame ao entrar no loop."""
+    prof = profilers.get(scene)
+    if prof is None:
+        prof = profilers[scene] = FrameProfiler(scene)
+    return prof.enter()
+
+
+def export_all(directory=PROFILE_DIR):
+    return [path for prof in profilers.values() if prof.frames for path in prof.export(directory)]
+
+
+# --- contadores (só com install(): troca funções do pygame por versões que contam) ---
+class CountingScreen:
+    """Embrulha a superfície da tela contando blit/blits/fill; o resto é repassado."""
+
+    def __init__(self, surface):
+        self.surface = surface
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        counters["blits"] += 1
+        return self.surface.blit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=1):
+        if not isinstance(blit_sequence, list):
+            blit_sequence = list(blit_sequence)
+        counters["blits"] += len(blit_sequence)
+        return self.surface.blits(blit_sequence, doreturn)
+
+    def fill(self, *args, **kwargs):
+        counters["draws"] += 1
+        return self.surface.fill(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+
+DRAW_FUNCS = ("rect", "polygon", "circle", "ellipse", "arc", "line", "lines", "aaline", "aalines")
+ALLOC_FUNCS = (
+    (pygame.transform, ("scale", "smoothscale", "rotate", "rotozoom", "flip", "scale_by", "smoothscale_by")),
+    (pygame.image, ("load", "frombuffer", "fromstring", "frombytes")),
+)
+_originals = []
+
+
+def _counting_draw(func):
+    def wrapper(surface, *args, **kwargs):
+        counters["draws"] += 1
+        if isinstance(surface, CountingScreen):
+            surface = surface.surface
+        return func(surface, *args, **kwargs)
+    return wrapper
+
+
+def _counting_alloc(func):
+    def wrapper(*args, **kwargs):
+        counters["surfaces"] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def counters_installed():
+    return bool(_originals)
+
+
+def install(screen):
+    """Liga os contadores; retorna a tela embrulhada (use-a no lugar de `screen`)."""
+    if not _originals:
+        base = pygame.Surface
+
+        class CountingSurface(base):
+            def __init__(self, *args, **kwargs):
+                counters["surfaces"] += 1
+                super().__init__(*args, **kwargs)
+
+        _originals.append((pygame, "Surface", base))
+        pygame.Surface = CountingSurface
+        for name in DRAW_FUNCS:
+            func = getattr(pygame.draw, name)
+            _originals.append((pygame.draw, name, func))
+            setattr(pygame.draw, name, _counting_draw(func))
+        for module, names in ALLOC_FUNCS:
+            for name in names:
+                func = getattr(module, name, None)
+                if func is not None:
+                    _originals.append((module, name, func))
+                    setattr(module, name, _counting_alloc(func))
+    return screen if isinstance(screen, CountingScreen) else CountingScreen(screen)
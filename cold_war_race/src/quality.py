@@ -0,0 +1,78 @@
+from settings import FPS
+
+# Níveis de qualidade da corrida, do mais bonito (0) ao mais leve. O governador desce
+# um degrau quando o trabalho por frame estoura o orçamento (1000 / FPS ms) e sobe de
+# volta quando sobra folga, com histerese para não ficar alternando entre dois níveis.
+#   stars        fração de TWINKLE_STARS (estrelas piscando)
+#   particles    partículas por explosão
+#   hud_icon     lado dos ícones de power-up no HUD (px)
+#   scale        reamostragem dos ícones do HUD ("smooth" ou "fast")
+#   parallax     camadas de estrelas do fundo com parallax (0 congela a rolagem)
+#   dirty_rects  redesenha só as regiões alteradas em vez da tela inteira
+# O fundo (estrelas fixas e nebulosas) é pré-renderizado uma vez por seed, então reduzir
+# seu detalhe não muda o custo do frame; o que pesa é o blit de tela inteira, que os
+# últimos níveis trocam por dirty rects (com a rolagem congelada, senão tudo fica sujo).
+LEVELS = [
+    {"stars": 1.0,  "particles": 24, "hud_icon": 110, "scale": "smooth", "parallax": 3, "dirty_rects": False},
+    {"stars": 0.6,  "particles": 16, "hud_icon": 110, "scale": "fast",   "parallax": 3, "dirty_rects": False},
+    {"stars": 0.3,  "particles": 10, "hud_icon": 80,  "scale": "fast",   "parallax": 2, "dirty_rects": False},
+    {"stars": 0.15, "particles": 6,  "hud_icon": 64,  "scale": "fast",   "parallax": 0, "dirty_rects": True},
+    {"stars": 0.0,  "particles": 3,  "hud_icon": 48,  "scale": "fast",   "parallax": 0, "dirty_rects": True},
+]
+WINDOW = 45            # frames avaliados a cada decisão (~0.75 s a 60 FPS)
+DOWN_AT = 0.9          # desce se o p90 do trabalho passar de 90% do orçamento
+UP_AT = 0.5            # sobe se o p90 ficar abaixo de 50% do orçamento...
+UP_WINDOWS = 4         # ...por tantas janelas seguidas (~3 s)
+BACKOFF_MAX = 8        # subir e precisar descer logo em seguida dobra a espera (até 8x)
+
+
+class QualityGovernor:
+    """Observa o tempo de trabalho de cada frame e decide o nível de qualidade."""
+
+    def __init__(self, levels=LEVELS, fps=FPS, level=0):
+        self.levels = levels
+        self.budget_ms = 1000.0 / fps
+        self.level = level
+        self.samples = []
+        self.calm = 0        # janelas seguidas com folga
+        self.backoff = 1     # multiplicador da espera para subir
+        self.rose = False    # a última mudança foi uma subida
+
+    @property
+    def settings(self):
+        return self.levels[self.level]
+
+    def observe(self, work_ms):
+        """Registra o trabalho do frame (sem a espera do clock); retorna o novo nível ou None."""
+        samples = self.samples
+        samples.append(work_ms)
+        if len(samples) < WINDOW:
+            return None
+        p90 = sorted(samples)[int(len(samples) * 0.9)]
+        samples.clear()
+
+        if p90 > self.budget_ms * DOWN_AT:
+            self.calm = 0
+            if self.level + 1 < len(self.levels):
+                if self.rose:
+                    # a subida não se sustentou: espera mais antes de tentar de novo
+                    self.backoff = min(self.backoff * 2, BACKOFF_MAX)
+                self.rose = False
+                self.level += 1
+                return self.level
+            return None
+
+        if self.rose:
+            # a subida se sustentou por uma janela: volta a tentar subir mais cedo
+            self.rose = False
+            self.backoff = max(1, self.backoff // 2)
+        if p90 < self.budget_ms * UP_AT:
+            self.calm += 1
+            if self.calm >= UP_WINDOWS * self.backoff and self.level > 0:
+                self.calm = 0
+                self.rose = True
+                self.level -= 1
+                return self.level
+        else:
+            self.calm = 0
+        return None
@@ -0,0 +1,412 @@
+import random
+from collections import namedtuple
+import pygame
+from settings import WIDTH, HEIGHT, SIM_TICK_RATE
+from entity_pool import EntityPool
+from spatial_hash import SpatialHash
+from effects import EffectEngine
+from input_bits import INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT
+from snapshots import (NUMBER, SnapshotError, encode, decode, expect, expect_list,
+                       rng_state, set_rng_state)
+
+# Simulação da corrida espacial sem display: sem pygame.display, fontes nem get_ticks.
+# Só usa pygame.Rect e pygame.mask para as colisões. O RocketRace desenha em cima dela.
+# Entradas por jogador: bitmask com os INPUT_* de input_bits (rocket1 = WASD, rocket2 = setas).
+
+# Velocidades em px/s (ou unidades/s). Os valores antigos eram por frame a 60 FPS,
+# então equivalem a valor_por_frame * 60 e a corrida fica igual a 60 ticks/s.
+ROCKET_SPEED_UP = 180
+ROCKET_SPEED_DOWN = 240
+ROCKET_SPEED_LEFT = 240
+ROCKET_SPEED_RIGHT = 180
+ASTEROID_SPEED = 180
+PROGRESS_PER_SEC = 60
+ASTEROID_WAVE_MS = 450       # antes: 3 asteroides a cada 27 frames
+ASTEROID_WAVE_SIZE = 3
+ASTEROID_SIZE = (60, 60)     # hitbox base dos asteroides comuns
+HITBOX_SHRINK = 0.5          # hitbox sem máscara de pixels: metade do sprite, centrada
+ASTEROID_WEIGHTS = [3, 2, 1]
+HIT_PENALTY = 60
+RACE_LENGTH = 4000           # distância que cada foguete percorre até a chegada
+
+ROCKET_SIZE = (50, 80)
+# Obstáculos únicos (aparecem no máximo unique_max_spawns vezes cada): tamanho do sprite
+UNIQUE_SIZES = {
+    "sputnik":   (80, 70),
+    "laika":     (100, 80),
+    "explorer1": (66, 96),
+    "astronaut": (80, 70),
+    "apollo8":   (100, 80),
+    "apollo11":  (90, 70),
+}
+UNIQUE_SPAWN_INTERVAL_MS = 2000
+UNIQUE_MAX_SPAWNS = 3
+# tamanho dos ícones aumentado para quase o tamanho dos foguetes (rocket ~50x80)
+POWER_ICON_SIZE = (110, 110)  # (width, height)
+# Power-ups como dados: target "self"/"opponent"; efeitos com duração vão para o
+# EffectEngine (ver effects.py), "progress_cut" é instantâneo (fração do progresso do alvo)
+POWERUPS = {
+    "shield": {"target": "self", "duration_ms": 10000, "stat": "damage", "value": 0.0},
+    "double": {"target": "self", "duration_ms": 6000, "stat": "progress", "value": 2.0},
+    "blast":  {"target": "opponent", "progress_cut": 0.2},
+    "slow":   {"target": "opponent", "duration_ms": 5000, "stat": "progress", "value": 0.5},
+}
+POWER_TYPES = list(POWERUPS)
+
+RaceState = namedtuple("RaceState", "tick sim_ms progress1 progress2 winner")
+
+
+class RaceSimulation:
+    def __init__(self, advantage1=0, advantage2=0, seed=None, tick_rate=SIM_TICK_RATE,
+                 finish_line=RACE_LENGTH, masks=None):
+        self.rng = random.Random(seed)
+        self.tick_rate = tick_rate
+        self.tick_ms = 1000.0 / tick_rate
+        self.dt = 1.0 / tick_rate
+        self.ticks = 0
+        self.sim_ms = 0.0
+        self.winner = None
+
+        # asteroides e únicos num pool de colunas; kind indexa asteroid_kinds
+        # ("asteroid0".. e depois os nomes dos únicos)
+        self.asteroid_kinds = [f"asteroid{i}" for i in range(len(ASTEROID_WEIGHTS))] + list(UNIQUE_SIZES)
+        self.asteroids = EntityPool(self.asteroid_kinds)
+        # conta quantas vezes cada único já apareceu e limite de reaparecimentos
+        self.unique_spawn_counts = {k: 0 for k in UNIQUE_SIZES}
+        self.unique_max_spawns = {k: UNIQUE_MAX_SPAWNS for k in UNIQUE_SIZES}
+        self._last_unique_spawn = 0.0
+        self._unique_spawn_interval = UNIQUE_SPAWN_INTERVAL_MS
+        self._next_asteroid_wave = ASTEROID_WAVE_MS
+
+        # powerups currently on screen (kind indexa POWER_TYPES)
+        self.powerups = EntityPool(POWER_TYPES)
+        self._last_power_spawn = 0.0
+        self._next_power_interval = self.rng.randint(5000, 10000)  # ms
+
+        # Foguetes (posição em float para movimento sub-pixel; o Rect é usado nas colisões)
+        self.rockets = [
+            pygame.Rect(WIDTH//4 - 25, HEIGHT - 100, *ROCKET_SIZE),
+            pygame.Rect(3*WIDTH//4 - 25, HEIGHT - 100, *ROCKET_SIZE),
+        ]
+        self.rocket_pos = [[float(r.x), float(r.y)] for r in self.rockets]
+        self.prev_rocket_pos = [p[:] for p in self.rocket_pos]
+        self._bounds = (pygame.Rect(0, 0, WIDTH//2, HEIGHT), pygame.Rect(WIDTH//2, 0, WIDTH//2, HEIGHT))
+
+        # Progresso inicial
+        self.progress = [advantage1, advantage2]
+        self.finish_line = finish_line
+
+        # Power-up state per player
+        self.effects = EffectEngine({k: d for k, d in POWERUPS.items() if "duration_ms" in d}, self.tick_ms)
+
+        # eventos do último step para o renderer: ("explosion", x, y), ("powerup", dono, tipo)
+        self.events = []
+
+        # broad phase das colisões (ver rocket_hits); refeita a cada consulta, fora dos snapshots
+        self._grid = SpatialHash()
+
+        # máscaras de pixels por nome ("rocket1", "asteroid0", "laika", ...); tipos sem
+        # máscara usam a hitbox reduzida (HITBOX_SHRINK), foguetes sem máscara o rect inteiro
+        self.masks = masks or {}
+        self._rocket_masks = [self.masks.get(name) or pygame.mask.Mask(rect.size, fill=True)
+                              for name, rect in zip(("rocket1", "rocket2"), self.rockets)]
+
+    def state(self):
+        return RaceState(self.ticks, self.sim_ms, self.progress[0], self.progress[1], self.winner)
+
+    # Snapshot: só o que muda durante a corrida. Tick rate, tipos, limites e máscaras
+    # vêm do construtor (meta do replay); o tick_rate gravado é conferido.
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_FIELDS = ("tick_rate", "rng", "ticks", "sim_ms", "winner", "progress", "finish_line",
+                       "rockets", "rocket_pos", "prev_rocket_pos", "asteroids", "powerups", "effects",
+                       "unique_spawn_counts", "last_unique_spawn", "next_asteroid_wave",
+                       "last_power_spawn", "next_power_interval", "events")
+
+    def snapshot(self):
+        """Estado completo (inclusive o RNG) em bytes, para keyframes de replay."""
+        return encode("race", self.SNAPSHOT_VERSION, {
+            "tick_rate": self.tick_rate,
+            "rng": rng_state(self.rng),
+            "ticks": self.ticks,
+            "sim_ms": self.sim_ms,
+            "winner": self.winner,
+            "progress": list(self.progress),
+            "finish_line": self.finish_line,
+            "rockets": [list(r) for r in self.rockets],
+            "rocket_pos": [list(p) for p in self.rocket_pos],
+            "prev_rocket_pos": [list(p) for p in self.prev_rocket_pos],
+            "asteroids": self.asteroids.state(),
+            "powerups": self.powerups.state(),
+            "effects": self.effects.state(),
+            "unique_spawn_counts": dict(self.unique_spawn_counts),
+            "last_unique_spawn": self._last_unique_spawn,
+            "next_asteroid_wave": self._next_asteroid_wave,
+            "last_power_spawn": self._last_power_spawn,
+            "next_power_interval": self._next_power_interval,
+            "events": [list(ev) for ev in self.events],
+        })
+
+    def restore(self, data):
+        """Carrega um snapshot(); SnapshotError se ele não for desta versão ou estiver inválido."""
+        f = decode(data, "race", self.SNAPSHOT_VERSION, self.SNAPSHOT_FIELDS)
+        if f["tick_rate"] != self.tick_rate:
+            raise SnapshotError(f"tick_rate do snapshot {f['tick_rate']} != {self.tick_rate}")
+        expect(f["ticks"], (int,), "ticks")
+        expect(f["sim_ms"], NUMBER, "sim_ms")
+        if f["winner"] not in (None, "URSS", "EUA"):
+            raise SnapshotError(f"winner inválido: {f['winner']!r}")
+        expect_list(f["progress"], NUMBER, "progress", 2)
+        expect(f["finish_line"], NUMBER, "finish_line")
+        rockets = [pygame.Rect(expect_list(r, (int,), "rockets", 4))
+                   for r in expect_list(f["rockets"], (list,), "rockets", 2)]
+        rocket_pos = [expect_list(p, NUMBER, "rocket_pos", 2) for p in expect_list(f["rocket_pos"], (list,), "rocket_pos", 2)]
+        prev_pos = [expect_list(p, NUMBER, "prev_rocket_pos", 2)
+                    for p in expect_list(f["prev_rocket_pos"], (list,), "prev_rocket_pos", 2)]
+        counts = expect(f["unique_spawn_counts"], (dict,), "unique_spawn_counts")
+        if set(counts) != set(UNIQUE_SIZES):
+            raise SnapshotError(f"unique_spawn_counts: chaves {sorted(counts)}")
+        for v in counts.values():
+            expect(v, (int,), "unique_spawn_counts")
+        for name in ("last_unique_spawn", "next_asteroid_wave", "last_power_spawn", "next_power_interval"):
+            expect(f[name], NUMBER, name)
+        events = []
+        for ev in expect(f["events"], (list,), "events"):
+            expect_list(ev, (str, int, float), "events", 3)
+            if ev[0] not in ("explosion", "powerup"):
+                raise SnapshotError(f"evento desconhecido: {ev[0]!r}")
+            events.append(tuple(ev))
+
+        # pools, efeitos e RNG validam ao carregar: em objetos novos, trocados só no fim
+        asteroids = EntityPool(self.asteroid_kinds)
+        asteroids.load_state(f["asteroids"], "asteroids")
+        powerups = EntityPool(POWER_TYPES)
+        powerups.load_state(f["powerups"], "powerups")
+        effects = EffectEngine(self.effects.definitions, self.tick_ms)
+        effects.load_state(f["effects"])
+        rng = random.Random()
+        set_rng_state(rng, f["rng"])
+
+        self.asteroids, self.powerups, self.effects, self.rng = asteroids, powerups, effects, rng
+        self.ticks = f["ticks"]
+        self.sim_ms = f["sim_ms"]
+        self.winner = f["winner"]
+        self.progress = list(f["progress"])
+        self.finish_line = f["finish_line"]
+        for rect, r in zip(self.rockets, rockets):
+            rect.update(r)
+        self.rocket_pos = [list(p) for p in rocket_pos]
+        self.prev_rocket_pos = [list(p) for p in prev_pos]
+        self.unique_spawn_counts = {k: counts[k] for k in UNIQUE_SIZES}
+        self._last_unique_spawn = f["last_unique_spawn"]
+        self._next_asteroid_wave = f["next_asteroid_wave"]
+        self._last_power_spawn = f["last_power_spawn"]
+        self._next_power_interval = f["next_power_interval"]
+        self.events = events
+
+    # === Spawns ===
+    def spawn_asteroid(self):
+        # Mantém o spawn normal de asteroides (sem lógica de únicos aqui)
+        rng = self.rng
+        side = rng.choice(["left", "right"])
+        if side == "left":
+            x = rng.randint(0, WIDTH//2 - 60)
+        else:
+            x = rng.randint(WIDTH//2, WIDTH - 60)
+        y = rng.randint(-300, -60)
+        # Escolhe a variante com pesos para variar mais
+        kind = rng.choices(range(len(ASTEROID_WEIGHTS)), weights=ASTEROID_WEIGHTS, k=1)[0]
+        mask = self.masks.get(self.asteroid_kinds[kind])
+        size = mask.get_size() if mask is not None else ASTEROID_SIZE
+        self.asteroids.spawn(x, y, *size, ASTEROID_SPEED, kind)
+
+    def try_spawn_unique(self):
+        """Força spawnar um único (sputnik/laika/...) a cada self._unique_spawn_interval ms,
+        até que cada tipo alcance unique_max_spawns."""
+        now = self.sim_ms
+        if now - self._last_unique_spawn < self._unique_spawn_interval:
+            return
+        self._last_unique_spawn = now
+        remaining = [k for k, c in self.unique_spawn_counts.items() if c < self.unique_max_spawns.get(k, 0)]
+        if not remaining:
+            return
+        chosen = self.rng.choice(remaining)
+        w, h = UNIQUE_SIZES[chosen]
+        # posa em X aleatório dentro da tela
+        x = self.rng.randint(0, max(0, WIDTH - w))
+        y = self.rng.randint(-300, -60)
+        self.asteroids.spawn(x, y, w, h, ASTEROID_SPEED, self.asteroid_kinds.index(chosen))
+        self.unique_spawn_counts[chosen] += 1
+
+    # === Power-ups ===
+    def try_spawn_powerup(self):
+        now = self.sim_ms
+        if now - self._last_power_spawn < self._next_power_interval:
+            return
+        rng = self.rng
+        self._last_power_spawn = now
+        self._next_power_interval = rng.randint(5000, 12000)
+
+        ptype = rng.choice(POWER_TYPES)
+        x = rng.randint(40, WIDTH - 80)
+        # spawn acima da tela considerando a altura do ícone
+        y = -POWER_ICON_SIZE[1] - 10
+        # antes caía int(vy) px por frame; em px/s a 60 ticks
+        vy = int(rng.uniform(1.2, 2.2)) * 60
+        self.powerups.spawn(x, y, *POWER_ICON_SIZE, vy, POWER_TYPES.index(ptype))
+
+    def apply_powerup(self, owner_idx, ptype):
+        self.events.append(("powerup", owner_idx, ptype))
+        d = POWERUPS[ptype]
+        target = owner_idx if d["target"] == "self" else 1 - owner_idx
+        if "progress_cut" in d:
+            # ex.: blast reduz o progresso do oponente em 20% do seu progresso atual
+            reduction = int(self.progress[target] * d["progress_cut"])
+            self.progress[target] = max(0, self.progress[target] - reduction)
+        if "duration_ms" in d:
+            self.effects.add(target, ptype, self.ticks)
+
+    def rocket_hits(self, pool, shrink=1.0, narrow=None):
+        """
+        [(índice, dono)] das entidades do pool que tocam um foguete; rocket1 tem prioridade.
+        O teste por rect é o pré-filtro; narrow(pool, i, dono), se informado, confirma o toque.
+        Broad phase: as hitboxes do pool vão para a grade (spatial_hash) e cada foguete
+        só testa as entidades das células que cobre.
+        """
+        owners = {}
+        grid = self._grid
+        grid.build(pool, shrink)
+        for owner, rocket in enumerate(self.rockets):
+            for i in grid.query(rocket):
+                if i not in owners and (narrow is None or narrow(pool, i, owner)):
+                    owners[i] = owner
+        return sorted(owners.items())
+
+    def mask_hit(self, pool, i, owner):
+        """Teste exato por pixel entre o foguete e a entidade i (máscaras em cache)."""
+        rocket = self.rockets[owner]
+        mask = self.masks.get(pool.names[pool.kind[i]])
+        if mask is None:
+            return rocket.colliderect(pool.hitbox(i, HITBOX_SHRINK))
+        offset = (int(pool.x[i]) - rocket.x, int(pool.y[i]) - rocket.y)
+        return self._rocket_masks[owner].overlap(mask, offset) is not None
+
+    # === Passo ===
+    def step(self, inputs):
+        """
+        Avança um tick fixo. inputs = (bitmask rocket1, bitmask rocket2) com INPUT_*.
+        Retorna RaceState; depois que alguém vence, novos steps não mudam nada.
+        """
+        if self.winner:
+            return self.state()
+        dt = self.dt
+        self.ticks += 1
+        self.sim_ms = self.ticks * self.tick_ms
+        self.events = []
+        self.effects.update(self.ticks)
+
+        # guarda posições do tick anterior para interpolar no desenho
+        for prev, pos in zip(self.prev_rocket_pos, self.rocket_pos):
+            prev[0], prev[1] = pos
+
+        # spawn powerups occasionally
+        self.try_spawn_powerup()
+        # spawn únicos periodicamente
+        self.try_spawn_unique()
+
+        for pos, mask in zip(self.rocket_pos, inputs):
+            if mask & INPUT_UP: pos[1] -= ROCKET_SPEED_UP * dt
+            if mask & INPUT_DOWN: pos[1] += ROCKET_SPEED_DOWN * dt
+            if mask & INPUT_LEFT: pos[0] -= ROCKET_SPEED_LEFT * dt
+            if mask & INPUT_RIGHT: pos[0] += ROCKET_SPEED_RIGHT * dt
+
+        # Progresso automático com os multiplicadores dos efeitos ativos (double, slow)
+        for i in (0, 1):
+            self.progress[i] += PROGRESS_PER_SEC * dt * self.effects.factor(i, "progress")
+
+        # Limites de tela
+        for rect, pos, area in zip(self.rockets, self.rocket_pos, self._bounds):
+            pos[0] = min(max(pos[0], area.left), area.right - rect.width)
+            pos[1] = min(max(pos[1], area.top), area.bottom - rect.height)
+            rect.x, rect.y = int(pos[0]), int(pos[1])
+
+        # Spawn asteroides
+        if self.sim_ms >= self._next_asteroid_wave:
+            self._next_asteroid_wave += ASTEROID_WAVE_MS
+            for _ in range(ASTEROID_WAVE_SIZE):
+                self.spawn_asteroid()
+
+        # Powerups fall (remove if off-screen) e colisão com os foguetes
+        powerups = self.powerups
+        powerups.move(dt)
+        powerups.cull(HEIGHT + 1)
+        for i, owner in self.rocket_hits(powerups):
+            self.apply_powerup(owner, POWER_TYPES[powerups.kind[i]])
+            powerups.kill(i)
+
+        # Move asteroides, descarta os que saíram da tela e testa colisão foguete x asteroide
+        asteroids = self.asteroids
+        asteroids.move(dt)
+        asteroids.cull(HEIGHT)
+        if self.masks:
+            # pré-filtro pelo rect do sprite, depois máscara de pixels
+            hits = self.rocket_hits(asteroids, narrow=self.mask_hit)
+        else:
+            hits = self.rocket_hits(asteroids, HITBOX_SHRINK)
+        for i, owner in hits:
+            # shield zera o dano
+            self.progress[owner] -= HIT_PENALTY * self.effects.factor(owner, "damage")
+            self.events.append(("explosion",) + asteroids.center(i))
+            asteroids.kill(i)
+
+        # Impede progresso negativo
+        self.progress[0] = max(self.progress[0], 0)
+        self.progress[1] = max(self.progress[1], 0)
+
+        # Chegada
+        if self.progress[0] >= self.finish_line:
+            self.winner = "URSS"
+        elif self.progress[1] >= self.finish_line:
+            self.winner = "EUA"
+        return self.state()
+
+
+def simulate(seed, policy=None, advantage1=0, advantage2=0, max_ticks=10 ** 6, **kwargs):
+    """Roda uma corrida inteira sem display. policy(sim) -> (mask1, mask2); padrão: ninguém se mexe."""
+    sim = RaceSimulation(advantage1, advantage2, seed=seed, **kwargs)
+    inputs = (0, 0)
+    while sim.winner is None and sim.ticks < max_ticks:
+        if policy is not None:
+            inputs = policy(sim)
+        sim.step(inputs)
+    return sim
+
+
+def random_policy(seed=None, hold_ticks=20):
+    """Política simples para balanceamento: sorteia teclas e segura por alguns ticks."""
+    rng = random.Random(seed)
+    current = [(0, 0)]
+
+    def policy(sim):
+        if sim.ticks % hold_ticks == 0:
+            current[0] = (rng.randrange(16), rng.randrange(16))
+        return current[0]
+    return policy
+
+
+# Balanceamento rápido: python race_sim.py [corridas]
+if __name__ == "__main__":
+    import sys, time
+    from rocket_race import race_collision_masks
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    masks = race_collision_masks()
+    wins = {"URSS": 0, "EUA": 0, None: 0}
+    total_ticks = 0
+    t0 = time.perf_counter()
+    for seed in range(n):
+        sim = simulate(seed, random_policy(seed), masks=masks)
+        wins[sim.winner] += 1
+        total_ticks += sim.ticks
+    elapsed = time.perf_counter() - t0
+    print(f"{n} corridas, {total_ticks / n / SIM_TICK_RATE:.1f}s de corrida em média")
+    print(f"vitórias: URSS={wins['URSS']} EUA={wins['EUA']} sem vencedor={wins[None]}")
+    print(f"{total_ticks / elapsed:,.0f} ticks/s")
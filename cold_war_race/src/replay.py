@@ -0,0 +1,240 @@
+import os, sys, json, struct, bisect
+from array import array
+import pygame
+from assets import ASSETS_DIR
+from input_bits import INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT
+from snapshots import NUMBER, SnapshotError, expect
+
+# Replays: entrada por frame empacotada num inteiro de 16 bits (array 'H'):
+#   bits 0-3 jogador 1 (W/S/A/D), bits 4-7 jogador 2 (setas), bit 8 espaço
+# no mesmo layout por jogador do race_sim (cima, baixo, esquerda, direita).
+# A corrida grava o estado das teclas a cada tick fixo; o tetris grava as teclas
+# pressionadas no frame e o dt do frame (array 'H'), porque a gravidade é por tempo.
+# A cada `keyframe_every` frames guarda um snapshot completo do jogo, então seek()
+# só re-simula a partir do keyframe mais próximo. Os snapshots são JSON versionado
+# (snapshots.py), nunca pickle: abrir um replay recebido não executa código.
+REPLAY_DIR = os.path.join(ASSETS_DIR, "cache", "replays")
+MAGIC = b"CWRRPLY3"  # muda quando o formato dos snapshots muda (3: JSON no lugar de pickle)
+KEYFRAME_EVERY = 600  # 10s a 60 frames/ticks por segundo
+SPACE_BIT = 1 << 8
+_U32 = struct.Struct("<I")
+# campos da meta que new_game() e as fases usam para recriar o jogo, por cena
+META_FIELDS = {
+    "race": {"seed": (int,), "tick_rate": (int,), "advantage1": NUMBER, "advantage2": NUMBER},
+    "tetris": {"seed": (int,)},
+}
+
+KEYMAPS = (
+    ((pygame.K_w, INPUT_UP), (pygame.K_s, INPUT_DOWN), (pygame.K_a, INPUT_LEFT), (pygame.K_d, INPUT_RIGHT)),
+    ((pygame.K_UP, INPUT_UP), (pygame.K_DOWN, INPUT_DOWN), (pygame.K_LEFT, INPUT_LEFT), (pygame.K_RIGHT, INPUT_RIGHT)),
+)
+
+
+def pack_inputs(mask1, mask2, space=False):
+    return mask1 | (mask2 << 4) | (SPACE_BIT if space else 0)
+
+
+def unpack_inputs(packed):
+    """packed -> (bitmask jogador 1, bitmask jogador 2)"""
+    return packed & 0xF, (packed >> 4) & 0xF
+
+
+def held_inputs(keys):
+    """Teclas seguradas (pygame.key.get_pressed()) -> inteiro empacotado."""
+    masks = [sum(bit for key, bit in keymap if keys[key]) for keymap in KEYMAPS]
+    return pack_inputs(masks[0], masks[1], keys[pygame.K_SPACE])
+
+
+def pressed_inputs(events):
+    """Teclas pressionadas neste frame (eventos KEYDOWN) -> inteiro empacotado."""
+    packed = 0
+    for ev in events:
+        if ev.type != pygame.KEYDOWN:
+            continue
+        if ev.key == pygame.K_SPACE:
+            packed |= SPACE_BIT
+        for shift, keymap in ((0, KEYMAPS[0]), (4, KEYMAPS[1])):
+            for key, bit in keymap:
+                if ev.key == key:
+                    packed |= bit << shift
+    return packed
+
+
+class ReplayLog:
+    """
+    Log de uma cena ("race" ou "tetris"): meta (seed e parâmetros para recriar o jogo),
+    entradas por frame, dt por frame (só tetris) e snapshots {frame: bytes}.
+    O jogo precisa ter snapshot() -> bytes e restore(bytes).
+    """
+
+    def __init__(self, scene, meta=None, keyframe_every=KEYFRAME_EVERY):
+        self.scene = scene
+        self.meta = dict(meta or {})
+        self.keyframe_every = keyframe_every
+        self.inputs = array("H")
+        self.dts = array("H")
+        self.keyframes = {}
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, game, packed, dt_ms=None):
+        """Chamar antes de game.step(): guarda keyframe (se for a hora) e a entrada do frame."""
+        frame = len(self.inputs)
+        if frame % self.keyframe_every == 0:
+            self.keyframes[frame] = game.snapshot()
+        self.inputs.append(packed)
+        if dt_ms is not None:
+            self.dts.append(min(int(dt_ms), 0xFFFF))
+
+    def step(self, game, frame):
+        """Re-executa o frame `frame` do log em `game`."""
+        inputs = unpack_inputs(self.inputs[frame])
+        if self.dts:
+            game.step(self.dts[frame], inputs)
+        else:
+            game.step(inputs)
+
+    def seek(self, game, frame):
+        """Leva `game` ao início do frame pedido a partir do keyframe mais próximo antes dele."""
+        frame = max(0, min(frame, len(self.inputs)))
+        starts = sorted(self.keyframes)
+        start = starts[bisect.bisect_right(starts, frame) - 1]
+        game.restore(self.keyframes[start])
+        for i in range(start, frame):
+            self.step(game, i)
+        return game
+
+    # --- arquivo: magic, meta JSON, entradas, dts, keyframes (tudo com tamanho u32) ---
+    def save(self, path):
+        meta = dict(self.meta, scene=self.scene, keyframe_every=self.keyframe_every)
+        raw_meta = json.dumps(meta).encode("utf-8")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            for blob in (raw_meta, self.inputs.tobytes(), self.dts.tobytes()):
+                f.write(_U32.pack(len(blob)))
+                f.write(blob)
+            f.write(_U32.pack(len(self.keyframes)))
+            for frame in sorted(self.keyframes):
+                snap = self.keyframes[frame]
+                f.write(_U32.pack(frame))
+                f.write(_U32.pack(len(snap)))
+                f.write(snap)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("não é um replay: " + path)
+        pos = len(MAGIC)
+
+        def take(n):
+            nonlocal pos
+            if pos + n > len(data):
+                raise ValueError("replay truncado: " + path)
+            chunk = data[pos:pos + n]
+            pos += n
+            return chunk
+
+        def take_blob():
+            return take(_U32.unpack(take(4))[0])
+
+        try:
+            meta = json.loads(take_blob().decode("utf-8"))
+        except ValueError as e:
+            raise SnapshotError(f"meta ilegível: {path} ({e})") from None
+        scene, keyframe_every = _check_meta(meta, path)
+        log = cls(scene, meta, keyframe_every)
+        try:
+            log.inputs.frombytes(take_blob())
+            log.dts.frombytes(take_blob())
+        except ValueError as e:
+            raise ValueError(f"replay inválido: {path} ({e})") from None
+        for _ in range(_U32.unpack(take(4))[0]):
+            frame = _U32.unpack(take(4))[0]
+            log.keyframes[frame] = take_blob()
+        if pos != len(data):
+            raise ValueError("replay com bytes sobrando: " + path)
+        # seek() precisa de um keyframe no frame 0 e de entradas para todos os frames
+        if 0 not in log.keyframes or max(log.keyframes) > len(log.inputs):
+            raise ValueError("keyframes inválidos: " + path)
+        if log.dts and len(log.dts) != len(log.inputs):
+            raise ValueError("dts não batem com as entradas: " + path)
+        return log
+
+
+def _check_meta(meta, path):
+    """Confere a meta lida de `path` e tira dela (scene, keyframe_every); SnapshotError se faltar algo."""
+    expect(meta, (dict,), f"{path}: meta")
+    scene = meta.pop("scene", None)
+    if scene not in META_FIELDS:
+        raise SnapshotError(f"{path}: cena desconhecida {scene!r}")
+    keyframe_every = expect(meta.pop("keyframe_every", None), (int,), f"{path}: meta.keyframe_every")
+    if keyframe_every <= 0:
+        raise SnapshotError(f"{path}: meta.keyframe_every deve ser positivo, veio {keyframe_every}")
+    for name, types in META_FIELDS[scene].items():
+        if name not in meta:
+            raise SnapshotError(f"{path}: meta sem {name!r}")
+        expect(meta[name], types, f"{path}: meta.{name}")
+    if scene == "race" and meta["tick_rate"] <= 0:
+        raise SnapshotError(f"{path}: meta.tick_rate deve ser positivo, veio {meta['tick_rate']}")
+    return scene, keyframe_every
+
+
+def replay_path(scene):
+    return os.path.join(REPLAY_DIR, f"{scene}_last.replay")
+
+
+def new_game(log):
+    """Recria o jogo headless descrito pelo log, no frame 0."""
+    if log.scene == "race":
+        from race_sim import RaceSimulation
+        from rocket_race import race_collision_masks
+        m = log.meta
+        game = RaceSimulation(m["advantage1"], m["advantage2"], seed=m["seed"], tick_rate=m["tick_rate"],
+                              masks=race_collision_masks())
+    else:
+        from tetris_engine import TetrisGame
+        game = TetrisGame(seed=log.meta["seed"])
+    return log.seek(game, 0)
+
+
+# Depuração: python replay.py arquivo.replay [velocidade] [--seek FRAME] [--headless]
+if __name__ == "__main__":
+    import time
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    path = args[0] if args else replay_path("race")
+    speed = float(args[1]) if len(args) > 1 else 8.0
+    seek_to = int(sys.argv[sys.argv.index("--seek") + 1]) if "--seek" in sys.argv else 0
+    log = ReplayLog.load(path)
+    print(f"{log.scene}: {len(log)} frames, {len(log.keyframes)} keyframes, seed={log.meta.get('seed')}")
+
+    if "--headless" in sys.argv:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.init()
+        game = new_game(log)
+        t0 = time.perf_counter()
+        log.seek(game, seek_to)
+        t1 = time.perf_counter()
+        for i in range(seek_to, len(log)):
+            log.step(game, i)
+        t2 = time.perf_counter()
+        print(f"seek {seek_to}: {(t1 - t0) * 1000:.1f} ms; resto: {len(log) - seek_to} frames em {t2 - t1:.3f}s")
+        print("resultado:", game.state() if log.scene == "race" else game.result())
+    else:
+        from settings import WIDTH, HEIGHT
+        pygame.init()
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        if log.scene == "race":
+            from rocket_race import RocketRace
+            race = RocketRace(screen, log.meta["advantage1"], log.meta["advantage2"], replay=log,
+                              time_scale=speed, replay_start=seek_to)
+            print("vencedor:", race.run())
+        else:
+            from tetris_phase import tetris_phase
+            print("resultado:", tetris_phase(screen, replay=log, speed=speed, replay_start=seek_to))
+        pygame.quit()
@@ -1,239 +1,201 @@
-import pygame, random, os
-from settings import WIDTH, HEIGHT, WHITE, RED, BLUE, FPS
+import pygame, random
+from settings import (WIDTH, HEIGHT, WHITE, RED, BLUE, FPS, TWINKLE_STARS, SIM_TICK_RATE, RACE_DIRTY_RECTS,
+                      QUALITY_GOVERNOR)
+from assets import asset_manager, sprite_path
+from atlas import TextureAtlas
+from space_background import space_background, VARIANTS as BG_VARIANTS
+from starfield import StarField
+from parallax import ParallaxBackground
+from particles import ParticleSystem
+from profiler import frame_profiler
+from quality import QualityGovernor, LEVELS as QUALITY_LEVELS
+from text_cache import get_font, render_text
+from race_sim import RaceSimulation, UNIQUE_SIZES, POWER_ICON_SIZE, POWER_TYPES
+from replay import ReplayLog, held_inputs, unpack_inputs
+
+# Sprites da corrida: arquivo, tamanho e cor de fallback (também usados pelo pré-carregamento)
+ROCKET_SPECS = [
+    ("rocket_red.png", (50, 80), (180, 40, 40)),
+    ("rocket_blue.png", (50, 80), (40, 80, 180)),
+]
+# Asteroides (3 variantes)
+ASTEROID_SPECS = [
+    ("asteroid4.png", (60, 80), (120, 100, 80)),
+    ("asteroid5.png", (70, 70), (100, 90, 100)),
+    ("asteroid6.png", (60, 60), (140, 120, 100)),
+]
+# Obstáculos únicos: nomes das imagens esperadas em assets/sprites (ajuste se necessário)
+UNIQUE_FILES = {
+    "sputnik":   "sputnik.png",
+    "laika":     "laika.png",
+    "explorer1": "explorer1.png",
+    "astronaut": "astronaut.png",
+    "apollo8":   "apollo8.png",
+    "apollo11":  "apollo11.png",
+}
+POWER_ICON_FILES = {
+    "shield": "p_shield.png",
+    "double": "p_double.png",
+    "blast":  "p_blast.png",
+    "slow":   "p_slow.png",
+}
+MAX_FRAME_MS = 250           # evita espiral de ticks depois de um travamento
+
+def hud_icon_variants():
+    """(lado, scale) distintos dos ícones do HUD em toda a escada de qualidade, na ordem dos níveis."""
+    variants = []
+    for q in QUALITY_LEVELS:
+        v = (q["hud_icon"], q["scale"])
+        if v not in variants:
+            variants.append(v)
+    return variants
+
+def race_asset_specs():
+    """Specs (path, size, scale, alpha) de todos os sprites da corrida."""
+    names = [(f, size) for f, size, _ in ROCKET_SPECS + ASTEROID_SPECS]
+    names += [(f, UNIQUE_SIZES[k]) for k, f in UNIQUE_FILES.items()]
+    names += [(f, POWER_ICON_SIZE) for f in POWER_ICON_FILES.values()]
+    specs = [(sprite_path(f), size, "fast", True) for f, size in names]
+    # ícones do HUD em todos os níveis de qualidade: trocar de nível no meio da corrida
+    # só consulta o cache, sem decodificar/escalar PNG no frame que já estourou o orçamento
+    specs += [(sprite_path(f), (side, side), scale, True)
+              for side, scale in hud_icon_variants() for f in POWER_ICON_FILES.values()]
+    return specs
+
+def race_collision_masks():
+    """Máscaras de colisão por nome de entidade da simulação (não precisa de display)."""
+    specs = [(name, f, size) for name, (f, size, _) in zip(("rocket1", "rocket2"), ROCKET_SPECS)]
+    specs += [(f"asteroid{i}", f, size) for i, (f, size, _) in enumerate(ASTEROID_SPECS)]
+    specs += [(k, f, UNIQUE_SIZES[k]) for k, f in UNIQUE_FILES.items()]
+    masks = {name: asset_manager.mask(sprite_path(f), size, scale="fast") for name, f, size in specs}
+    return {name: m for name, m in masks.items() if m is not None}
 
 class RocketRace:
-    def __init__(self, screen, advantage1=0, advantage2=0):
+    """Renderer + loop de jogo da corrida; as regras ficam em race_sim.RaceSimulation."""
+
+    def __init__(self, screen, advantage1=0, advantage2=0, bg_seed=None,
+                 tick_rate=SIM_TICK_RATE, render_fps=FPS, time_scale=1.0, seed=None,
+                 dirty_rects=RACE_DIRTY_RECTS, replay=None, replay_start=0, record_path=None,
+                 governor=QUALITY_GOVERNOR):
         self.screen = screen
         self.clock = pygame.time.Clock()
-
-        assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets", "sprites")
-        assets_dir = os.path.normpath(assets_dir)
+        # fonts for power-up timers (draw() também é chamado fora de run(), ex.: benchmark)
+        self.timer_font = get_font("arial", 16)
+
+        # Passo fixo: a simulação avança em ticks, independente do FPS de desenho.
+        # time_scale > 1 roda a simulação mais rápido que o tempo real.
+        self.render_fps = render_fps
+        self.time_scale = time_scale
+
+        # Replay: toda a aleatoriedade sai da seed; as entradas de cada tick vão para
+        # replay_log (salvo em record_path na chegada). Com replay=ReplayLog, as entradas
+        # vêm do log em vez do teclado, começando no tick replay_start.
+        if replay is not None:
+            seed = replay.meta["seed"]
+            tick_rate = replay.meta["tick_rate"]
+        elif seed is None:
+            seed = random.randrange(2 ** 31)
+        self.seed = seed
+        self.replay = replay
+        self.record_path = record_path
+        self.replay_log = None if replay is not None else ReplayLog("race", {
+            "seed": seed, "advantage1": advantage1, "advantage2": advantage2, "tick_rate": tick_rate})
+
+        # Modo dirty rects: em vez de fundo inteiro + flip(), restaura do fundo só o que foi
+        # desenhado no frame anterior e envia à tela só as regiões antigas e novas
+        self.dirty_rects = self.dirty_setting = dirty_rects
+        self._prev_dirty = None  # None: próximo frame é completo
 
         def load_image(name, size, fallback_color):
-            path = os.path.join(assets_dir, name)
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                img = pygame.transform.scale(img, size)
-                return img
-            except Exception:
-                surf = pygame.Surface(size, pygame.SRCALPHA)
-                surf.fill(fallback_color)
-                return surf
-
-        # Fundo procedural estilo pixel art espacial
-        self.bg_img = self.generate_space_background()
+            # decodifica/escala uma vez só; corridas seguintes reaproveitam o cache
+            return asset_manager.load(sprite_path(name), size, scale="fast", fallback_color=fallback_color)
 
-        # Estrelas piscando
-        self.stars = []
-        for _ in range(120):
-            x = random.randint(0, WIDTH)
-            y = random.randint(0, HEIGHT)
-            radius = random.randint(1, 2)
-            brightness = random.randint(150, 255)
-            self.stars.append([x, y, radius, brightness])
-
-        # Sprites foguetes
-        self.rocket_img1 = load_image("rocket_red.png", (50, 80), (180, 40, 40))
-        self.rocket_img2 = load_image("rocket_blue.png", (50, 80), (40, 80, 180))
-
-        # Asteroides (3 variantes)
-        self.asteroid_imgs = [
-            load_image("asteroid4.png", (60, 80), (120, 100, 80)),
-            load_image("asteroid5.png", (70, 70), (100, 90, 100)),
-            load_image("asteroid6.png", (60, 60), (140, 120, 100)),
-        ]
-        self.asteroids = []
-
-        # Obstáculos únicos (aparecem no máximo uma vez cada)
-        # nomes das imagens esperadas em assets/sprites (ajuste se necessário)
-        unique_specs = {
-            "sputnik":   ("sputnik.png",   (80, 70)),
-            "laika":     ("laika.png",     (100, 80)),
-            "explorer1": ("explorer1.png", (66, 96)),
-            "astronaut": ("astronaut.png", (80, 70)),
-            "apollo8":   ("apollo8.png",   (100, 80)),
-            "apollo11":  ("apollo11.png",  (90, 70)),
-        }
-        self.unique_imgs = {}
-        for key, (fname, size) in unique_specs.items():
-            self.unique_imgs[key] = load_image(fname, size, (150, 150, 150))
-        # conta quantas vezes cada único já apareceu e limite de reaparecimentos
-        self.unique_spawn_counts = {k: 0 for k in self.unique_imgs}
-        # ajuste aqui quantas vezes cada obstáculo pode reaparecer durante a corrida
-        self.unique_max_spawns = {k: 3 for k in self.unique_imgs}  # padrão: até 3 aparições
-
-        # Timer para forçar spawn de um único a cada X ms
-        self._last_unique_spawn = pygame.time.get_ticks()
-        self._unique_spawn_interval = 2000  # 2000 ms = 2 segundos
+        # Fundo procedural estilo pixel art espacial (seed fixa -> mesmo fundo; sorteia entre poucas variantes)
+        self.bg_seed = random.Random(seed).randrange(BG_VARIANTS) if bg_seed is None else bg_seed
+        self.bg_img = self.generate_space_background()
+        # camadas com parallax por cima do fundo, rolando com o progresso de cada lado;
+        # no modo dirty rects o fundo composto fica em bg_canvas para restaurar regiões
+        self.parallax = ParallaxBackground(self.bg_img, WIDTH, HEIGHT, seed=seed)
+        self.bg_canvas = None
+
+        # Estrelas piscando (arrays + sprites por faixa de brilho, ver starfield.py)
+        self.stars = StarField(TWINKLE_STARS, WIDTH, HEIGHT, seed=seed)
+
+        # Todos os sprites da corrida vão para um único atlas; o nome do sprite é o tipo
+        # da entidade na simulação ("asteroid0".., nome do único, "icon_<power>")
+        sprites = {}
+        self.rocket_sprites = ("rocket1", "rocket2")
+        for name, spec in zip(self.rocket_sprites, ROCKET_SPECS):
+            sprites[name] = load_image(*spec)
+        for i, spec in enumerate(ASTEROID_SPECS):
+            sprites[f"asteroid{i}"] = load_image(*spec)
+        for key, fname in UNIQUE_FILES.items():
+            sprites[key] = load_image(fname, UNIQUE_SIZES[key], (150, 150, 150))
 
         # Power-up icons (place your icons in assets/sprites with these names)
-        # tamanho dos ícones aumentado para quase o tamanho dos foguetes (rocket ~50x80)
-        self.power_icon_size = (110, 110)  # (width, height)
-        self.icon_map = {
-            "shield": load_image("p_shield.png", self.power_icon_size, (200,200,200)),
-            "double": load_image("p_double.png", self.power_icon_size, (200,200,200)),
-            "blast":  load_image("p_blast.png", self.power_icon_size, (200,200,200)),
-            "slow":   load_image("p_slow.png", self.power_icon_size, (200,200,200)),
-        }
-
-        # powerups currently on screen: list of dicts {rect,type,img,vy}
-        self.powerups = []
-
-        # Foguetes
-        self.rocket1 = pygame.Rect(WIDTH//4 - 25, HEIGHT - 100, 50, 80)
-        self.rocket2 = pygame.Rect(3*WIDTH//4 - 25, HEIGHT - 100, 50, 80)
-
-        # Progresso inicial
-        self.progress1 = advantage1
-        self.progress2 = advantage2
-        self.finish_line = 4000
-
-        # Power-up state per player
-        self.shield_end = [0, 0]     # ms timestamps
-        self.multiplier = [1.0, 1.0] # progress multiplier (double power uses 2.0)
-        self.slow_end = [0, 0]       # slowdown applied (when slow affects a player)
-
-        # spawn timing
-        self._last_power_spawn = pygame.time.get_ticks()
-        self._next_power_interval = random.randint(5000, 10000)  # ms
-
-    # === NOVO: Gerador de fundo procedural (mantive) ===
+        self.power_icon_size = POWER_ICON_SIZE
+        self.icon_sprites = {}
+        for ptype in POWER_TYPES:
+            self.icon_sprites[ptype] = "icon_" + ptype
+            sprites["icon_" + ptype] = load_image(POWER_ICON_FILES[ptype], self.power_icon_size, (200,200,200))
+
+        self.atlas = TextureAtlas(sprites)
+
+        # máscaras saem dos mesmos sprites (já no cache), criadas uma vez por sprite
+        self.sim = RaceSimulation(advantage1, advantage2, seed=seed, tick_rate=tick_rate,
+                                  masks=race_collision_masks())
+        if replay is not None and replay_start:
+            replay.seek(self.sim, replay_start)
+
+        # explosões: pool fixo de partículas, integradas por frame (ver particles.py)
+        self.particles = ParticleSystem(seed=seed)
+
+        # Qualidade adaptativa: o governador ajusta estrelas, partículas, ícones do HUD e
+        # dirty rects conforme o trabalho por frame (ver quality.py)
+        self.governor = QualityGovernor() if governor else None
+        # ícones do HUD de todos os níveis carregados aqui (normalmente já pré-carregados),
+        # para apply_quality só trocar o dicionário
+        self.hud_icon_sets = {}
+        for side, scale in hud_icon_variants():
+            self.hud_icon_sets[(side, scale)] = {
+                ptype: asset_manager.load(sprite_path(POWER_ICON_FILES[ptype]), (side, side),
+                                          scale=scale, fallback_color=(200,200,200))
+                for ptype in POWER_TYPES}
+        self.apply_quality(QUALITY_LEVELS[0])
+
+    def apply_quality(self, q):
+        """Aplica um nível de quality.LEVELS."""
+        self.quality = q
+        stars = int(TWINKLE_STARS * q["stars"])
+        if stars != self.stars.count:
+            self.stars.reset(stars)
+        self.particles.burst_size = q["particles"]
+        self.hud_icon_size = (q["hud_icon"], q["hud_icon"])
+        self.hud_icons = self.hud_icon_sets[(q["hud_icon"], q["scale"])]
+        if q["parallax"] != getattr(self, "parallax_layers", None):
+            self.parallax_layers = q["parallax"]
+            self.parallax.set_detail(q["parallax"])
+            self._prev_dirty = None
+        dirty = self.dirty_setting or q["dirty_rects"]
+        if dirty != self.dirty_rects:
+            self.dirty_rects = dirty
+            self._prev_dirty = None  # próximo frame redesenha tudo
+
+    @property
+    def finish_line(self):
+        return self.sim.finish_line
+
+    @finish_line.setter
+    def finish_line(self, value):
+        self.sim.finish_line = value
+
+    # === Gerador de fundo procedural (vetorizado e memoizado em space_background.py) ===
     def generate_space_background(self):
-        bg = pygame.Surface((WIDTH, HEIGHT))
-        bg.fill((5, 5, 20))  # fundo azul-escuro
-
-        # --- Estrelas fixas ---
-        for _ in range(250):
-            x = random.randint(0, WIDTH-1)
-            y = random.randint(0, HEIGHT-1)
-            color_choice = random.choices(
-                [(255, 255, 255), (200, 200, 255), (255, 200, 200), (200, 255, 200)],
-                weights=[70, 15, 10, 5]
-            )[0]
-            bg.set_at((x, y), color_choice)
-
-        # --- Nebulosas ---
-        for _ in range(6):
-            cx = random.randint(0, WIDTH)
-            cy = random.randint(0, HEIGHT)
-            max_radius = random.randint(100, 200)
-            color = random.choice([(120, 20, 60), (80, 0, 100), (150, 40, 120)])
-
-            for i in range(max_radius * 30):  # densidade
-                angle = random.uniform(0, 6.28)
-                dist = random.randint(0, max_radius)
-                x = int(cx + dist * pygame.math.Vector2(1, 0).rotate_rad(angle).x)
-                y = int(cy + dist * pygame.math.Vector2(1, 0).rotate_rad(angle).y)
-
-                if 0 <= x < WIDTH and 0 <= y < HEIGHT:
-                    old_color = bg.get_at((x, y))
-                    new_color = (
-                        (old_color[0] + color[0]) // 2,
-                        (old_color[1] + color[1]) // 2,
-                        (old_color[2] + color[2]) // 2
-                    )
-                    bg.set_at((x, y), new_color)
-
-        return bg
-
-    def spawn_asteroid(self):
-        # Mantém o spawn normal de asteroides (sem lógica de únicos aqui)
-        side = random.choice(["left", "right"])
-        if side == "left":
-            x = random.randint(0, WIDTH//2 - 60)
-        else:
-            x = random.randint(WIDTH//2, WIDTH - 60)
-        y = random.randint(-300, -60)
-        rect = pygame.Rect(x, y, 60, 60)
-        # Escolhe a variante com pesos para variar mais
-        img = random.choices(self.asteroid_imgs, weights=[3, 2, 1], k=1)[0]
-        self.asteroids.append([rect, img])
-
-    def try_spawn_unique(self):
-        """Força spawnar um único (sputnik/laika/...) a cada self._unique_spawn_interval ms,
-        até que cada tipo alcance unique_max_spawns."""
-        now = pygame.time.get_ticks()
-        if now - self._last_unique_spawn < self._unique_spawn_interval:
-            return
-        self._last_unique_spawn = now
-        remaining = [k for k, c in self.unique_spawn_counts.items() if c < self.unique_max_spawns.get(k, 0)]
-        if not remaining:
-            return
-        chosen = random.choice(remaining)
-        img = self.unique_imgs[chosen]
-        w, h = img.get_size()
-        # posa em X aleatório dentro da tela
-        x = random.randint(0, max(0, WIDTH - w))
-        y = random.randint(-300, -60)
-        rect = pygame.Rect(x, y, w, h)
-        self.asteroids.append([rect, img])
-        self.unique_spawn_counts[chosen] += 1
-
-    # === Power-ups ===
-    def try_spawn_powerup(self):
-        now = pygame.time.get_ticks()
-        if now - self._last_power_spawn < self._next_power_interval:
-            return
-        self._last_power_spawn = now
-        self._next_power_interval = random.randint(5000, 12000)
- 
-        ptype = random.choice(["shield", "double", "blast", "slow"])
-        x = random.randint(40, WIDTH - 80)
-        # spawn acima da tela considerando a altura do ícone
-        rect = pygame.Rect(x, -self.power_icon_size[1] - 10, self.power_icon_size[0], self.power_icon_size[1])
-        img = self.icon_map.get(ptype)
-        vy = random.uniform(1.2, 2.2)
-        self.powerups.append({"rect": rect, "type": ptype, "img": img, "vy": vy})
-
-    def apply_powerup(self, owner_idx, ptype):
-        now = pygame.time.get_ticks()
-        if ptype == "shield":
-            self.shield_end[owner_idx] = now + 10000  # 10s
-        elif ptype == "double":
-            self.multiplier[owner_idx] = 2.0
-            # schedule multiplier reset after 5s
-            pygame.time.set_timer(pygame.USEREVENT + 1 + owner_idx, 1, loops=1)  # dummy to ensure pygame has event loop
-            # store end time
-            if owner_idx == 0:
-                self._double_end0 = now + 6000
-            else:
-                self._double_end1 = now + 6000
-        elif ptype == "blast":
-            # reduz o progresso do oponente em 20% do seu progresso atual
-            opp = 1 - owner_idx
-            reduction = int(self.progress1 * 0.2) if opp == 0 else int(self.progress2 * 0.2)
-            if opp == 0:
-                self.progress1 = max(0, self.progress1 - reduction)
-            else:
-                self.progress2 = max(0, self.progress2 - reduction)
-        elif ptype == "slow":
-            opp = 1 - owner_idx
-            # aplica slow ao oponente por 5s (multiplicador 0.5)
-            self.slow_end[opp] = now + 5000
-
-    def powerup_timers_update(self):
-        now = pygame.time.get_ticks()
-        # reset double multipliers if expired (we used attributes set above)
-        if hasattr(self, "_double_end0") and self._double_end0 <= now:
-            self.multiplier[0] = 1.0
-            del self._double_end0
-        if hasattr(self, "_double_end1") and self._double_end1 <= now:
-            self.multiplier[1] = 1.0
-            del self._double_end1
-        # reset shield (we just check end times when needed)
-        # apply slow effect: slow reduces multiplier for the affected player
-        for i in (0,1):
-            if self.slow_end[i] > now:
-                # make sure slow overrides multiplier effect multiplicatively
-                # if double active, effective multiplier will be multiplier*0.5 in run()
-                pass
-            else:
-                # expired
-                self.slow_end[i] = 0
+        return space_background(self.bg_seed, WIDTH, HEIGHT)
 
     def victory_screen(self, winner):
-        font = pygame.font.SysFont("arial", 50, True)
-        small_font = pygame.font.SysFont("arial", 30)
+        font = get_font("arial", 50, True)
+        small_font = get_font("arial", 30)
 
         while True:
             for event in pygame.event.get():
@@ -246,12 +208,12 @@ class RocketRace:
             self.screen.fill((0,0,0))
 
             if winner == "URSS":
-                text = font.render("URSS venceu a corrida espacial!", True, RED)
+                text = render_text(font, "URSS venceu a corrida espacial!", RED)
                 story = [
                     
                 ]
             else:
-                text = font.render("EUA venceu a corrida espacial!", True, BLUE)
+                text = render_text(font, "EUA venceu a corrida espacial!", BLUE)
                 story = [
                     
                 ]
@@ -259,218 +221,158 @@ class RocketRace:
             self.screen.blit(text, (WIDTH//2 - text.get_width()//2, 200))
 
             for i, line in enumerate(story):
-                msg = small_font.render(line, True, WHITE)
+                msg = render_text(small_font, line, WHITE)
                 self.screen.blit(msg, (WIDTH//2 - msg.get_width()//2, 300 + i*40))
 
-            hint = small_font.render("Pressione qualquer tecla ou clique para continuar", True, (200,200,200))
+            hint = render_text(small_font, "Pressione qualquer tecla ou clique para continuar", (200,200,200))
             self.screen.blit(hint, (WIDTH//2 - hint.get_width()//2, HEIGHT - 80))
 
             pygame.display.flip()
             self.clock.tick(30)
 
-    def get_asteroid_hitbox(self, asteroid_rect):
-        shrink = 0.5
-        new_w = int(asteroid_rect.width * shrink)
-        new_h = int(asteroid_rect.height * shrink)
-        new_x = asteroid_rect.x + (asteroid_rect.width - new_w)//2
-        new_y = asteroid_rect.y + (asteroid_rect.height - new_h)//2
-        return pygame.Rect(new_x, new_y, new_w, new_h)
+    def update(self, inputs):
+        """Avança a simulação um tick fixo e coleta os eventos para o desenho."""
+        state = self.sim.step(inputs)
+        for ev in self.sim.events:
+            if ev[0] == "explosion":
+                self.particles.burst(ev[1], ev[2])
+        return state.winner
+
+    def draw(self, alpha):
+        """
+        Desenha o estado interpolando entre o tick anterior e o atual (alpha em [0, 1]).
+        Retorna os rects desenhados (usados pelo modo dirty rects).
+        """
+        def lerp(a, b):
+            return int(a + (b - a) * alpha)
+
+        sim = self.sim
+        screen = self.screen
+        track = self.dirty_rects
+        dirty = []
+        if not track:
+            self.parallax.scroll(sim.progress)
+        # no modo dirty rects o fundo fica parado: rolar suja as duas metades a cada frame e
+        # o display.update mandaria mais área que o flip() (benchmark.py race_dirty confere)
+        if track and self._prev_dirty is not None:
+            # restaura do fundo só as regiões desenhadas no frame anterior
+            canvas = self.bg_canvas
+            screen.blits([(canvas, r, r) for r in self._prev_dirty], doreturn=False)
+        elif track:
+            if self.bg_canvas is None:
+                self.bg_canvas = pygame.Surface((WIDTH, HEIGHT)).convert()
+            self.parallax.draw(self.bg_canvas)
+            screen.blit(self.bg_canvas, (0, 0))
+        else:
+            self.parallax.draw(screen)
+
+        # Estrelas piscando (sobre o fundo)
+        rects = self.stars.draw(screen, doreturn=track)
+        if track:
+            dirty.extend(rects)
+        self.stars.update()
+
+        # Linha divisória
+        dirty.append(pygame.draw.line(screen, WHITE, (WIDTH//2, 0), (WIDTH//2, HEIGHT), 3))
+
+        # Barra de progresso
+        dirty.append(pygame.draw.line(screen, WHITE, (50, 30), (WIDTH-50, 30), 4))
+        max_width = WIDTH - 100
+        dirty.append(pygame.draw.rect(screen, RED, (50, 20, (sim.progress[0]/sim.finish_line)*max_width, 10)))
+        dirty.append(pygame.draw.rect(screen, BLUE, (50, 35, (sim.progress[1]/sim.finish_line)*max_width, 10)))
+
+        # Foguetes, powerups caindo e asteroides: uma única chamada blits() a partir do atlas
+        atlas = self.atlas
+        batch = [atlas.item(sprite, (lerp(prev[0], pos[0]), lerp(prev[1], pos[1])))
+                 for sprite, prev, pos in zip(self.rocket_sprites, sim.prev_rocket_pos, sim.rocket_pos)]
+        batch.extend([atlas.item(self.icon_sprites[ptype], dest) for ptype, dest in sim.powerups.draw_items(alpha)])
+        batch.extend([atlas.item(kind, dest) for kind, dest in sim.asteroids.draw_items(alpha)])
+        rects = screen.blits(batch, doreturn=track)
+        if track:
+            dirty.extend(rects)
+
+        # Explosões (partículas vivas, num só blits())
+        rects = self.particles.draw(screen, doreturn=track)
+        if track:
+            dirty.extend(rects)
+
+        # Draw active power-up icons + timers near each rocket (ícones e textos num só blits())
+        effects = sim.effects
+        timer_font = self.timer_font
+        hud = []
+        iw, ih = self.hud_icon_size
+        text_x_offset = iw + 6
+        line_spacing = ih + 6
+        # player1 UI (left), player2 UI (right)
+        for i, ui_x in ((0, 20), (1, WIDTH - 120)):
+            ui_y = 60
+            # uma linha fixa por efeito temporário (shield, double, slow), tempo vindo do engine
+            for row, ptype in enumerate(effects.definitions):
+                remaining = effects.remaining_ms(i, ptype, sim.ticks)
+                if remaining > 0:
+                    y = ui_y + row * line_spacing
+                    hud.append((self.hud_icons[ptype], (ui_x, y)))
+                    t = int(remaining / 1000)
+                    txt = render_text(timer_font, str(t)+"s", (255,255,255))
+                    hud.append((txt, (ui_x + text_x_offset, y + ih//2 - 8)))
+
+        rects = screen.blits(hud, doreturn=track)
+        if track:
+            dirty.extend(rects)
+        return dirty
 
     def run(self):
-        running = True
-        frame_count = 0
-
-        # fonts for power-up timers
-        timer_font = pygame.font.SysFont("arial", 16)
+        accumulator = 0.0
+        tick_ms = self.sim.tick_ms
+        prof = frame_profiler("race")
+        self.clock.tick()  # descarta o tempo gasto antes da corrida (carregamento etc.)
 
-        while running:
-            explosions = []
-            for event in pygame.event.get():
+        while True:
+            prof.begin()
+            for event in prof.events():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     raise SystemExit
 
-            # spawn powerups occasionally
-            self.try_spawn_powerup()
-            # spawn únicos periodicamente (cada 2s definido em __init__)
-            self.try_spawn_unique()
-
-            keys = pygame.key.get_pressed()
-
-            # Controles rocket1 (WASD)
-            if keys[pygame.K_w]: self.rocket1.y -= 3
-            if keys[pygame.K_s]: self.rocket1.y += 4
-            if keys[pygame.K_a]: self.rocket1.x -= 4
-            if keys[pygame.K_d]: self.rocket1.x += 3
-
-            # Controles rocket2 (Setas)
-            if keys[pygame.K_UP]: self.rocket2.y -= 3
-            if keys[pygame.K_DOWN]: self.rocket2.y += 4
-            if keys[pygame.K_LEFT]: self.rocket2.x -= 4
-            if keys[pygame.K_RIGHT]: self.rocket2.x += 3
-
-            # Progresso automático usando multipliers and slow
-            now = pygame.time.get_ticks()
-            # determine effective multipliers (slow halves progress)
-            eff_mult1 = self.multiplier[0] * (0.5 if self.slow_end[0] > now else 1.0)
-            eff_mult2 = self.multiplier[1] * (0.5 if self.slow_end[1] > now else 1.0)
-
-            self.progress1 += 1 * eff_mult1
-            self.progress2 += 1 * eff_mult2
-
-            # Limites de tela
-            self.rocket1.clamp_ip(pygame.Rect(0, 0, WIDTH//2, HEIGHT))
-            self.rocket2.clamp_ip(pygame.Rect(WIDTH//2, 0, WIDTH//2, HEIGHT))
-
-            # Spawn asteroides
-            frame_count += 1
-            if frame_count % 27 == 0:
-                for _ in range(3):
-                    self.spawn_asteroid()
-
-            # Move asteroides
-            for ast in self.asteroids:
-                rect, img = ast
-                rect.y += 3
-            self.asteroids = [a for a in self.asteroids if a[0].y < HEIGHT]
-
-            # Powerups fall
-            for pu in list(self.powerups):
-                pu["rect"].y += int(pu["vy"])
-                # remove if off-screen
-                if pu["rect"].top > HEIGHT:
-                    self.powerups.remove(pu)
-                    continue
-                # collision with rockets
-                if pu["rect"].colliderect(self.rocket1):
-                    self.apply_powerup(0, pu["type"])
-                    if pu in self.powerups: self.powerups.remove(pu)
-                    continue
-                if pu["rect"].colliderect(self.rocket2):
-                    self.apply_powerup(1, pu["type"])
-                    if pu in self.powerups: self.powerups.remove(pu)
-                    continue
-
-            # Colisão foguete x asteroide
-            asteroids_to_remove = []
-            for ast in self.asteroids:
-                rect, img = ast
-                hitbox = self.get_asteroid_hitbox(rect)
-                if self.rocket1.colliderect(hitbox):
-                    # if shield active ignore damage
-                    if self.shield_end[0] > now:
-                        pass
-                    else:
-                        self.progress1 -= 60
-                    asteroids_to_remove.append(ast)
-                    explosions.append((rect.centerx, rect.centery))
-                elif self.rocket2.colliderect(hitbox):
-                    if self.shield_end[1] > now:
-                        pass
-                    else:
-                        self.progress2 -= 60
-                    asteroids_to_remove.append(ast)
-                    explosions.append((rect.centerx, rect.centery))
-            for ast in asteroids_to_remove:
-                if ast in self.asteroids:
-                    self.asteroids.remove(ast)
-
-            # Impede progresso negativo
-            self.progress1 = max(self.progress1, 0)
-            self.progress2 = max(self.progress2, 0)
-
-            # Chegada
-            if self.progress1 >= self.finish_line:
-                self.victory_screen("URSS")
-                return "URSS"
-            if self.progress2 >= self.finish_line:
-                self.victory_screen("EUA")
-                return "EUA"
-
-            # update timers for powerups
-            self.powerup_timers_update()
-
-            # === Desenho ===
-            self.screen.blit(self.bg_img, (0, 0))
-
-            # Estrelas piscando (sobre o fundo)
-            for star in self.stars:
-                x, y, r, bright = star
-                color = (bright, bright, bright)
-                pygame.draw.circle(self.screen, color, (x, y), r)
-                star[3] += random.choice([-10, -5, 0, 5, 10])
-                star[3] = max(100, min(255, star[3]))
-
-            # Linha divisória
-            pygame.draw.line(self.screen, WHITE, (WIDTH//2, 0), (WIDTH//2, HEIGHT), 3)
-
-            # Barra de progresso
-            pygame.draw.line(self.screen, WHITE, (50, 30), (WIDTH-50, 30), 4)
-            max_width = WIDTH - 100
-            pygame.draw.rect(self.screen, RED, (50, 20, (self.progress1/self.finish_line)*max_width, 10))
-            pygame.draw.rect(self.screen, BLUE, (50, 35, (self.progress2/self.finish_line)*max_width, 10))
-
-            # Foguetes
-            self.screen.blit(self.rocket_img1, self.rocket1)
-            self.screen.blit(self.rocket_img2, self.rocket2)
-
-            # Powerups: desenha ícones caindo
-            for pu in self.powerups:
-                if pu["img"]:
-                    self.screen.blit(pu["img"], pu["rect"])
+            if self.replay is None:
+                packed = held_inputs(pygame.key.get_pressed())
+            prof.mark("events")
+
+            # acumula tempo real e consome em ticks fixos
+            frame_ms = min(self.clock.tick(self.render_fps), MAX_FRAME_MS)
+            prof.mark("wait")
+            accumulator += frame_ms * self.time_scale
+            while accumulator >= tick_ms:
+                accumulator -= tick_ms
+                if self.replay is not None:
+                    if self.sim.ticks >= len(self.replay):
+                        return None  # fim do replay sem vencedor
+                    packed = self.replay.inputs[self.sim.ticks]
                 else:
-                    pygame.draw.rect(self.screen, (255,255,0), pu["rect"])
-
-            # Asteroides
-            for rect, img in self.asteroids:
-                self.screen.blit(img, rect)
-
-            # Explosões
-            for pos in explosions:
-                pygame.draw.circle(self.screen, (255, 80, 0), pos, 40)
-
-            # Draw active power-up icons + timers near each rocket
-            now = pygame.time.get_ticks()
-            # player1 UI (left)
-            ui_x1 = 20
-            ui_y1 = 60
-            iw, ih = self.power_icon_size
-            text_x_offset = iw + 6
-            line_spacing = ih + 6
-            if self.shield_end[0] > now:
-                self.screen.blit(self.icon_map["shield"], (ui_x1, ui_y1))
-                t = int((self.shield_end[0] - now) / 1000)
-                txt = timer_font.render(str(t)+"s", True, (255,255,255))
-                self.screen.blit(txt, (ui_x1 + text_x_offset, ui_y1 + ih//2 - 8))
-            if hasattr(self, "_double_end0") and self._double_end0 > now:
-                self.screen.blit(self.icon_map["double"], (ui_x1, ui_y1 + line_spacing))
-                t = int((self._double_end0 - now) / 1000)
-                txt = timer_font.render(str(t)+"s", True, (255,255,255))
-                self.screen.blit(txt, (ui_x1 + text_x_offset, ui_y1 + line_spacing + ih//2 - 8))
-            if self.slow_end[0] > now:
-                self.screen.blit(self.icon_map["slow"], (ui_x1, ui_y1 + 2 * line_spacing))
-                t = int((self.slow_end[0] - now) / 1000)
-                txt = timer_font.render(str(t)+"s", True, (255,255,255))
-                self.screen.blit(txt, (ui_x1 + text_x_offset, ui_y1 + 2 * line_spacing + ih//2 - 8))
-
-            # player2 UI (right)
-            ui_x2 = WIDTH - 120
-            ui_y2 = 60
-            if self.shield_end[1] > now:
-                self.screen.blit(self.icon_map["shield"], (ui_x2, ui_y2))
-                t = int((self.shield_end[1] - now) / 1000)
-                txt = timer_font.render(str(t)+"s", True, (255,255,255))
-                self.screen.blit(txt, (ui_x2 + text_x_offset, ui_y2 + ih//2 - 8))
-            if hasattr(self, "_double_end1") and self._double_end1 > now:
-                self.screen.blit(self.icon_map["double"], (ui_x2, ui_y2 + line_spacing))
-                t = int((self._double_end1 - now) / 1000)
-                txt = timer_font.render(str(t)+"s", True, (255,255,255))
-                self.screen.blit(txt, (ui_x2 + text_x_offset, ui_y2 + line_spacing + ih//2 - 8))
-            if self.slow_end[1] > now:
-                self.screen.blit(self.icon_map["slow"], (ui_x2, ui_y2 + 2 * line_spacing))
-                t = int((self.slow_end[1] - now) / 1000)
-                txt = timer_font.render(str(t)+"s", True, (255,255,255))
-                self.screen.blit(txt, (ui_x2 + text_x_offset, ui_y2 + 2 * line_spacing + ih//2 - 8))
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                    self.replay_log.record(self.sim, packed)
+                winner = self.update(unpack_inputs(packed))
+                if winner:
+                    if self.record_path:
+                        self.replay_log.save(self.record_path)
+                    self.victory_screen(winner)
+                    return winner
+            self.particles.update(frame_ms * self.time_scale / 1000.0)
+            prof.mark("update")
+
+            dirty = self.draw(accumulator / tick_ms)
+            overlay = prof.draw_overlay(self.screen)
+            if overlay:
+                dirty.append(overlay)
+            prof.mark("draw")
+            if self.dirty_rects and self._prev_dirty is not None:
+                # regiões antigas (agora restauradas) + novas
+                pygame.display.update(self._prev_dirty + dirty)
+            else:
+                pygame.display.flip()
+            prof.mark("flip")
+            if self.dirty_rects:
+                self._prev_dirty = dirty
+            if self.governor is not None:
+                level = self.governor.observe(prof.busy_ns() / 1e6)
+                if level is not None:
+                    self.apply_quality(self.governor.settings)
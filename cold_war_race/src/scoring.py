@@ -0,0 +1,33 @@
+from settings import FINISH_LINE, MS_TO_PROGRESS, MAX_TETRIS_ADV_PCT
+
+# Contas do jogo sem pygame, compartilhadas pelo main, pelo profiler e pela simulação
+# em lote (tetris_sim): a vantagem inicial da corrida a partir dos tempos do tetris e
+# o percentil usado nos relatórios.
+
+
+def advantage_cap_pct(max_adv_pct=MAX_TETRIS_ADV_PCT):
+    """Teto efetivo da vantagem (fração da pista): MAX_TETRIS_ADV_PCT, mas nunca acima de 15%."""
+    return min(max_adv_pct, 0.15)
+
+
+def compute_advantage(times, ms_to_progress=MS_TO_PROGRESS, max_adv_pct=MAX_TETRIS_ADV_PCT):
+    """(vantagem URSS, vantagem EUA) em progresso; os parâmetros só mudam na calibração (tetris_sim)."""
+    urss = times["URSS_ms"]
+    eua  = times["EUA_ms"]
+    # limita a vantagem a no máximo 25% da pista para dar chance ao adversário
+    capped_pct = advantage_cap_pct(max_adv_pct)
+    adv_cap = int(capped_pct * FINISH_LINE)
+    diff = abs(urss - eua)
+    diff_progress = min(adv_cap, int(diff * ms_to_progress))
+    if urss < eua:
+        return diff_progress, 0  # URSS vantagem
+    elif eua < urss:
+        return 0, diff_progress  # EUA vantagem
+    else:
+        return 0, 0
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(q * (len(sorted_values) - 1) + 0.5))]
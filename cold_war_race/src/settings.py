@@ -15,3 +15,10 @@ YELLOW = (255, 220, 80)
 FINISH_LINE = 2400          # distância total da corrida espacial
 MAX_TETRIS_ADV_PCT = 0.35   # vantagem máxima do tetris na barra (35%)
 MS_TO_PROGRESS = 0.7        # conversão (ms) -> progresso inicial (ajuste fino)
+TWINKLE_STARS = 120          # estrelas piscando na corrida (aguenta milhares)
+SIM_TICK_RATE = 60          # ticks/s da simulação da corrida (independente do FPS de desenho)
+RACE_DIRTY_RECTS = False    # corrida redesenha só as regiões que mudaram (display.update(rects)); o parallax fica parado
+QUALITY_GOVERNOR = True     # corrida reduz/restaura a qualidade visual para manter o FPS (ver quality.py)
+TETRIS_CPU = None           # "URSS" ou "EUA": esse lado do Tetris é jogado pelo computador (valor inicial do botão de modo do menu)
+TETRIS_CPU_LEVEL = "medio"  # "facil", "medio" ou "dificil" (ver tetris_bot.LEVELS)
+PROFILE = False             # conta blits/desenhos/superfícies por frame e exporta CSV/JSON por cena (F3 = overlay)
@@ -0,0 +1,75 @@
+import json
+
+# Snapshots dos jogos (keyframes dos replays) como JSON: tipo, versão e um conjunto fixo
+# de campos, cada um conferido em restore. Replays são arquivos para compartilhar, então
+# nada de pickle (abrir um replay não pode executar código), e renomear um atributo não
+# quebra replays antigos em silêncio: um campo novo ou diferente exige subir a versão.
+NUMBER = (int, float)
+NONE = type(None)
+
+
+class SnapshotError(ValueError):
+    """Snapshot de outro tipo/versão, com campos faltando ou sobrando, ou valores inválidos."""
+
+
+def encode(kind, version, fields):
+    return json.dumps({"kind": kind, "version": version, "fields": fields},
+                      separators=(",", ":")).encode("utf-8")
+
+
+def decode(data, kind, version, names):
+    """Campos do snapshot, se ele for de `kind` na `version` e tiver exatamente `names`."""
+    try:
+        doc = json.loads(bytes(data).decode("utf-8"))
+    except ValueError as e:
+        raise SnapshotError(f"snapshot ilegível: {e}") from None
+    if not isinstance(doc, dict) or doc.get("kind") != kind or doc.get("version") != version:
+        got = (doc.get("kind"), doc.get("version")) if isinstance(doc, dict) else None
+        raise SnapshotError(f"esperado snapshot {kind} v{version}, veio {got}")
+    fields = doc.get("fields")
+    if not isinstance(fields, dict) or set(fields) != set(names):
+        got = sorted(fields) if isinstance(fields, dict) else None
+        raise SnapshotError(f"campos do snapshot {kind} não batem: {got}")
+    return fields
+
+
+def expect(value, types, name):
+    """value, se for de um dos tipos (bool não conta como número)."""
+    if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+        raise SnapshotError(f"{name}: esperado {'/'.join(t.__name__ for t in types)}, veio {type(value).__name__}")
+    return value
+
+
+def expect_list(value, types, name, length=None):
+    """Lista (do tamanho pedido, se houver) com itens dos tipos dados."""
+    expect(value, (list,), name)
+    if length is not None and len(value) != length:
+        raise SnapshotError(f"{name}: esperado {length} itens, veio {len(value)}")
+    for v in value:
+        expect(v, types, name)
+    return value
+
+
+def expect_range(value, lo, hi, name):
+    """Inteiro em [lo, hi)."""
+    expect(value, (int,), name)
+    if not lo <= value < hi:
+        raise SnapshotError(f"{name}: {value} fora de [{lo}, {hi})")
+    return value
+
+
+def rng_state(rng):
+    version, internal, gauss = rng.getstate()
+    return [version, list(internal), gauss]
+
+
+def set_rng_state(rng, state, name="rng"):
+    expect_list(state, (int, list, float, NONE), name, 3)
+    version, internal, gauss = state
+    expect(version, (int,), name)
+    expect_list(internal, (int,), name)
+    expect(gauss, (float, NONE), name)
+    try:
+        rng.setstate((version, tuple(internal), gauss))
+    except (TypeError, ValueError, OverflowError) as e:
+        raise SnapshotError(f"{name}: estado inválido ({e})") from None
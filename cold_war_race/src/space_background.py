@@ -0,0 +1,127 @@
+import os, random
+import pygame
+from assets import ASSETS_DIR
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy: usa o gerador pixel a pixel (mais lento, mesmo visual)
+    np = None
+
+# Fundo procedural estilo pixel art espacial, determinístico por seed.
+# Memoizado em memória e em disco por (seed, largura, altura).
+CACHE_DIR = os.path.join(ASSETS_DIR, "cache")
+CACHE_VERSION = 1
+VARIANTS = 8  # quantos fundos diferentes a corrida sorteia quando não recebe seed
+
+BG_COLOR = (5, 5, 20)  # fundo azul-escuro
+STAR_COUNT = 250
+STAR_COLORS = [(255, 255, 255), (200, 200, 255), (255, 200, 200), (200, 255, 200)]
+STAR_WEIGHTS = [70, 15, 10, 5]
+NEBULA_COUNT = 6
+NEBULA_COLORS = [(120, 20, 60), (80, 0, 100), (150, 40, 120)]
+NEBULA_DENSITY = 30  # amostras por pixel de raio
+
+_memory_cache = {}
+
+
+def _cache_path(seed, width, height):
+    return os.path.join(CACHE_DIR, f"space_bg_v{CACHE_VERSION}_{seed}_{width}x{height}.rgb")
+
+
+def space_background(seed, width, height):
+    """Retorna a superfície do fundo para (seed, width, height), gerando só na primeira vez."""
+    key = (seed, width, height)
+    surf = _memory_cache.get(key)
+    if surf is not None:
+        return surf
+
+    path = _cache_path(seed, width, height)
+    surf = None
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as f:
+                surf = pygame.image.frombytes(f.read(), (width, height), "RGB")
+        except (OSError, ValueError) as e:
+            print("Cache de fundo inválido:", path, e)
+            surf = None
+    if surf is None:
+        surf = generate(seed, width, height)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(pygame.image.tobytes(surf, "RGB"))
+        except OSError as e:
+            print("Não foi possível gravar cache de fundo:", e)
+
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert()
+    _memory_cache[key] = surf
+    return surf
+
+
+def generate(seed, width, height):
+    if np is None:
+        return _generate_python(seed, width, height)
+    return _generate_numpy(seed, width, height)
+
+
+def _generate_numpy(seed, width, height):
+    rng = np.random.default_rng(seed)
+    # surfarray usa indexação [x, y]
+    pixels = np.empty((width, height, 3), dtype=np.float32)
+    pixels[:] = BG_COLOR
+
+    # --- Estrelas fixas ---
+    xs = rng.integers(0, width, STAR_COUNT)
+    ys = rng.integers(0, height, STAR_COUNT)
+    weights = np.array(STAR_WEIGHTS, dtype=np.float64)
+    choice = rng.choice(len(STAR_COLORS), STAR_COUNT, p=weights / weights.sum())
+    pixels[xs, ys] = np.array(STAR_COLORS, dtype=np.float32)[choice]
+    flat = pixels.reshape(width * height, 3)  # view: índice linear x * height + y
+
+    # --- Nebulosas ---
+    # cada amostra faz pixel = (pixel + cor) / 2; k amostras no mesmo pixel
+    # equivalem a cor + (pixel - cor) / 2**k, então basta contar acertos por pixel
+    for _ in range(NEBULA_COUNT):
+        cx = rng.integers(0, width + 1)
+        cy = rng.integers(0, height + 1)
+        max_radius = int(rng.integers(100, 201))
+        color = np.array(NEBULA_COLORS[rng.integers(len(NEBULA_COLORS))], dtype=np.float32)
+
+        n = max_radius * NEBULA_DENSITY
+        angle = rng.uniform(0, 6.28, n)
+        dist = rng.integers(0, max_radius + 1, n)
+        x = np.trunc(cx + dist * np.cos(angle)).astype(np.int64)
+        y = np.trunc(cy + dist * np.sin(angle)).astype(np.int64)
+        inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+        touched, hits = np.unique(x[inside] * height + y[inside], return_counts=True)
+        factor = np.exp2(-hits.astype(np.float32))[:, None]
+        flat[touched] = color + (flat[touched] - color) * factor
+
+    return pygame.surfarray.make_surface(pixels.astype(np.uint8))
+
+
+def _generate_python(seed, width, height):
+    rng = random.Random(seed)
+    bg = pygame.Surface((width, height))
+    bg.fill(BG_COLOR)
+
+    for _ in range(STAR_COUNT):
+        x = rng.randint(0, width-1)
+        y = rng.randint(0, height-1)
+        bg.set_at((x, y), rng.choices(STAR_COLORS, weights=STAR_WEIGHTS)[0])
+
+    for _ in range(NEBULA_COUNT):
+        cx = rng.randint(0, width)
+        cy = rng.randint(0, height)
+        max_radius = rng.randint(100, 200)
+        color = rng.choice(NEBULA_COLORS)
+        for _ in range(max_radius * NEBULA_DENSITY):
+            direction = pygame.math.Vector2(1, 0).rotate_rad(rng.uniform(0, 6.28))
+            dist = rng.randint(0, max_radius)
+            x = int(cx + dist * direction.x)
+            y = int(cy + dist * direction.y)
+            if 0 <= x < width and 0 <= y < height:
+                old = bg.get_at((x, y))
+                bg.set_at((x, y), ((old[0] + color[0]) // 2, (old[1] + color[1]) // 2, (old[2] + color[2]) // 2))
+    return bg
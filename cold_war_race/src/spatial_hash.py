@@ -0,0 +1,74 @@
+import bisect
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy: a mesma grade em listas Python, consultada com bisect
+    np = None
+
+# Broad phase das colisões da corrida: grade uniforme (hash espacial) de células
+# quadradas com as hitboxes de um pool. Cada entidade vira a chave da célula do seu
+# canto superior esquerdo (linha * STRIDE + coluna) e as chaves ficam ordenadas, então
+# montar a grade é um argsort e cada linha de células que um foguete cobre é uma fatia
+# contígua achada por busca binária. Só as entidades dessas fatias passam pelo teste
+# AABB: com mais foguetes ou mais entidades o custo por consulta não cresce com o pool.
+CELL_SIZE = 128
+STRIDE = 1 << 20  # colunas por linha na chave (folga para coordenadas negativas)
+
+
+class SpatialHash:
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.keys = []      # chaves das células, crescentes
+        self.ids = []       # slot do pool de cada chave
+        self.boxes = []     # (left, top, right, bottom) de cada chave
+        self.reach = 0      # quantas células uma entidade avança além da do seu canto
+
+    def build(self, pool, shrink=1.0):
+        """Refaz a grade com as hitboxes vivas (não vazias) do pool."""
+        cs = self.cell_size
+        if np is not None:
+            valid, left, top, right, bottom = pool.hitboxes(shrink)
+            ids = valid.nonzero()[0]
+            left, top, right, bottom = left[ids], top[ids], right[ids], bottom[ids]
+            keys = (top // cs).astype(np.int64) * STRIDE + left // cs
+            order = np.argsort(keys, kind="stable")
+            self.keys, self.ids = keys[order], ids[order]
+            self.boxes = (left[order], top[order], right[order], bottom[order])
+            extent = int(max((right - left).max(), (bottom - top).max())) if len(ids) else 0
+        else:
+            entries = []
+            for i in pool.indices():
+                box = pool.hitbox(i, shrink)
+                if box.width > 0 and box.height > 0:
+                    entries.append(((box.top // cs) * STRIDE + box.left // cs, i, box))
+            entries.sort(key=lambda e: (e[0], e[1]))
+            self.keys = [e[0] for e in entries]
+            self.ids = [e[1] for e in entries]
+            self.boxes = [e[2] for e in entries]
+            extent = max((max(b.width, b.height) for b in self.boxes), default=0)
+        self.reach = (extent - 1) // cs + 1 if extent else 0
+
+    def query(self, rect):
+        """Slots (crescentes) cuja hitbox colide com rect, mesma regra de Rect.colliderect."""
+        if rect.width <= 0 or rect.height <= 0 or not len(self.keys):
+            return []
+        cs, reach = self.cell_size, self.reach
+        x0, x1 = rect.left // cs - reach, (rect.right - 1) // cs
+        rows = range(rect.top // cs - reach, (rect.bottom - 1) // cs + 1)
+        if np is not None:
+            starts = np.array(rows, dtype=np.int64) * STRIDE
+            lo = np.searchsorted(self.keys, starts + x0, "left")
+            hi = np.searchsorted(self.keys, starts + x1, "right")
+            spans = [np.arange(a, b) for a, b in zip(lo.tolist(), hi.tolist()) if b > a]
+            if not spans:
+                return []
+            pos = np.concatenate(spans)
+            left, top, right, bottom = (col[pos] for col in self.boxes)
+            hit = (left < rect.right) & (right > rect.left) & (top < rect.bottom) & (bottom > rect.top)
+            return sorted(self.ids[pos[hit]].tolist())
+        keys, found = self.keys, []
+        for row in rows:
+            for k in range(bisect.bisect_left(keys, row * STRIDE + x0), bisect.bisect_right(keys, row * STRIDE + x1)):
+                if rect.colliderect(self.boxes[k]):
+                    found.append(self.ids[k])
+        return sorted(found)
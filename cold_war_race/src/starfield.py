@@ -0,0 +1,91 @@
+import random
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # sem numpy: listas Python (ok para poucas centenas de estrelas)
+    np = None
+
+# Estrelas piscando da corrida: posições e brilho em arrays, desenho com um único blits()
+# a partir de sprites pré-renderizados por (raio, faixa de brilho).
+MIN_BRIGHT, MAX_BRIGHT = 100, 255
+BUCKETS = 16
+RADII = (1, 2)
+TWINKLE_STEPS = (-10, -5, 0, 5, 10)
+
+
+def _bucket_sprites():
+    """{raio: [sprite por faixa de brilho]}"""
+    sprites = {}
+    for r in RADII:
+        size = 2 * r + 1
+        sprites[r] = []
+        for b in range(BUCKETS):
+            bright = MIN_BRIGHT + (MAX_BRIGHT - MIN_BRIGHT) * b // (BUCKETS - 1)
+            surf = pygame.Surface((size, size))
+            surf.set_colorkey((0, 0, 0))
+            pygame.draw.circle(surf, (bright, bright, bright), (r, r), r)
+            sprites[r].append(surf)
+    return sprites
+
+
+class StarField:
+    def __init__(self, count, width, height, seed=None):
+        self.count = count
+        self.width = width
+        self.height = height
+        self._sprite_table = _bucket_sprites()
+        if np is not None:
+            self._rng = np.random.default_rng(seed)
+            self._steps = np.array(TWINKLE_STEPS, dtype=np.int16)
+        else:
+            self._rng = random.Random(seed)
+        self.reset(count)
+
+    def reset(self, count):
+        """Sorteia `count` estrelas novas (também usado para mudar a densidade em tempo de jogo)."""
+        self.count = count
+        w, h = self.width, self.height
+        if np is not None:
+            rng = self._rng
+            self.x = rng.integers(0, w + 1, count)
+            self.y = rng.integers(0, h + 1, count)
+            self.radius = rng.integers(RADII[0], RADII[-1] + 1, count)
+            self.brightness = rng.integers(150, 256, count).astype(np.int16)
+            self.x_list = (self.x - self.radius).tolist()
+            self.y_list = (self.y - self.radius).tolist()
+            self.r_list = self.radius.tolist()
+        else:
+            rng = self._rng
+            self.x_list, self.y_list, self.r_list, self.brightness = [], [], [], []
+            for _ in range(count):
+                r = rng.randint(RADII[0], RADII[-1])
+                self.x_list.append(rng.randint(0, w) - r)
+                self.y_list.append(rng.randint(0, h) - r)
+                self.r_list.append(r)
+                self.brightness.append(rng.randint(150, 255))
+
+    def update(self):
+        """Cada estrela varia o brilho em um dos TWINKLE_STEPS, limitado a [MIN_BRIGHT, MAX_BRIGHT]."""
+        if np is not None:
+            self.brightness += self._steps[self._rng.integers(0, len(TWINKLE_STEPS), self.count)]
+            np.clip(self.brightness, MIN_BRIGHT, MAX_BRIGHT, out=self.brightness)
+        else:
+            rng = self._rng
+            self.brightness = [max(MIN_BRIGHT, min(MAX_BRIGHT, b + rng.choice(TWINKLE_STEPS)))
+                               for b in self.brightness]
+
+    def _buckets(self):
+        if np is not None:
+            return ((self.brightness - MIN_BRIGHT) * (BUCKETS - 1) // (MAX_BRIGHT - MIN_BRIGHT)).tolist()
+        return [(b - MIN_BRIGHT) * (BUCKETS - 1) // (MAX_BRIGHT - MIN_BRIGHT) for b in self.brightness]
+
+    def blit_items(self):
+        """Lista (sprite, posição) pronta para Surface.blits()."""
+        table = self._sprite_table
+        return [(table[r][b], (x, y))
+                for x, y, r, b in zip(self.x_list, self.y_list, self.r_list, self._buckets())]
+
+    def draw(self, surface, doreturn=False):
+        """Desenha todas as estrelas; com doreturn=True retorna os rects tocados (dirty rects)."""
+        return surface.blits(self.blit_items(), doreturn=doreturn)
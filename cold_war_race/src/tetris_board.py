@@ -0,0 +1,151 @@
+import random
+from collections import namedtuple
+
+# Regras do tabuleiro do Tetris sem pygame (usadas pela fase, replays, bot e simulação).
+# O tabuleiro é um bitboard: um int por linha (bit c = coluna c ocupada) e, em paralelo,
+# um bytearray compacto com a cor de cada célula (0 = vazia, senão índice em KINDS + 1).
+# Colisão é um AND por linha da peça; linha completa é row == FULL_ROW.
+GRID_W, GRID_H = 10, 20
+FULL_ROW = (1 << GRID_W) - 1
+
+# Tetrominoes
+TETROMINOES = {
+    'I': [[(0,1),(1,1),(2,1),(3,1)], [(2,0),(2,1),(2,2),(2,3)]],
+    'O': [[(1,0),(2,0),(1,1),(2,1)]],
+    'T': [[(1,0),(0,1),(1,1),(2,1)], [(1,0),(1,1),(2,1),(1,2)],
+          [(0,1),(1,1),(2,1),(1,2)], [(1,0),(0,1),(1,1),(1,2)]],
+    'L': [[(2,0),(0,1),(1,1),(2,1)], [(1,0),(1,1),(1,2),(2,2)],
+          [(0,1),(1,1),(2,1),(0,2)], [(0,0),(1,0),(1,1),(1,2)]],
+    'J': [[(0,0),(0,1),(1,1),(2,1)], [(1,0),(2,0),(1,1),(1,2)],
+          [(0,1),(1,1),(2,1),(2,2)], [(1,0),(1,1),(1,2),(0,2)]],
+    'S': [[(1,0),(2,0),(0,1),(1,1)], [(1,0),(1,1),(2,1),(2,2)]],
+    'Z': [[(0,0),(1,0),(1,1),(2,1)], [(2,0),(1,1),(2,1),(1,2)]]
+}
+KINDS = tuple(TETROMINOES)
+KIND_INDEX = {k: i + 1 for i, k in enumerate(KINDS)}  # valor no array de cores
+KICKS = (0, -1, 1, -2, 2)  # deslocamentos em x tentados ao girar, em ordem
+
+# Tabelas montadas uma vez no import, por tipo e rotação (Shape), para que colisão,
+# giro, bot e simulação só façam consultas:
+#   cells         offsets (ox, oy) das células
+#   min_x, max_x  colunas extremas ocupadas (limites de parede)
+#   height        linhas ocupadas (max oy + 1)
+#   bottom        por coluna de min_x a max_x, o oy mais baixo (perfil de apoio)
+#   masks         ((oy, máscara da linha com min_x no bit 0), ...)
+#   rotate        (próxima rotação, ((dx, rotação), ...) na ordem de KICKS)
+Shape = namedtuple("Shape", "cells min_x max_x height bottom masks rotate")
+
+
+def _build_shape(kind, rot):
+    rotations = TETROMINOES[kind]
+    cells = tuple(rotations[rot])
+    min_x = min(ox for ox, _ in cells)
+    max_x = max(ox for ox, _ in cells)
+    rows = {}
+    for ox, oy in cells:
+        rows[oy] = rows.get(oy, 0) | (1 << (ox - min_x))
+    bottom = tuple(max(oy for ox, oy in cells if ox == c) for c in range(min_x, max_x + 1))
+    nxt = (rot + 1) % len(rotations)
+    return Shape(cells, min_x, max_x, max(oy for _, oy in cells) + 1, bottom,
+                 tuple(sorted(rows.items())), (nxt, tuple((dx, nxt) for dx in KICKS)))
+
+
+SHAPES = {k: tuple(_build_shape(k, r) for r in range(len(TETROMINOES[k]))) for k in KINDS}
+
+
+def shape(kind, rot):
+    shapes = SHAPES[kind]
+    return shapes[rot % len(shapes)]
+
+
+class Board:
+    def __init__(self):
+        self.rows = [0] * GRID_H
+        self.colors = bytearray(GRID_W * GRID_H)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and self.rows == other.rows and self.colors == other.colors
+
+    def cell(self, x, y):
+        """Tipo da peça na célula (x, y) ou None se vazia."""
+        c = self.colors[y * GRID_W + x]
+        return KINDS[c - 1] if c else None
+
+    def fits(self, kind, rot, x, y):
+        """A peça cabe em (x, y)? Linhas acima do topo (y < 0) contam como vazias."""
+        sh = shape(kind, rot)
+        shift = x + sh.min_x
+        if shift < 0 or x + sh.max_x >= GRID_W:
+            return False
+        rows = self.rows
+        for dy, mask in sh.masks:
+            r = y + dy
+            if r < 0:
+                continue
+            if r >= GRID_H or rows[r] & (mask << shift):
+                return False
+        return True
+
+    def place(self, kind, rot, x, y):
+        """Grava a peça no tabuleiro (células acima do topo são descartadas)."""
+        sh = shape(kind, rot)
+        shift = x + sh.min_x
+        color = KIND_INDEX[kind]
+        rows, colors = self.rows, self.colors
+        for dy, mask in sh.masks:
+            r = y + dy
+            if 0 <= r < GRID_H:
+                bits = mask << shift
+                rows[r] |= bits
+                base = r * GRID_W
+                c = 0
+                while bits:
+                    if bits & 1:
+                        colors[base + c] = color
+                    bits >>= 1
+                    c += 1
+
+    def clear_lines(self):
+        """Remove as linhas completas (row == FULL_ROW), desce o resto; retorna quantas saíram."""
+        rows = self.rows
+        full = rows.count(FULL_ROW)
+        if not full:
+            return 0
+        keep = [r for r in range(GRID_H) if rows[r] != FULL_ROW]
+        colors = self.colors
+        self.rows = [0] * full + [rows[r] for r in keep]
+        self.colors = bytearray(GRID_W * full) + b"".join(colors[r * GRID_W:(r + 1) * GRID_W] for r in keep)
+        return full
+
+
+# --- API de peças (dict kind/rot/x/y), a mesma que a fase sempre usou ---
+def new_board():
+    return Board()
+
+def spawn_piece(rng=random):
+    kind = rng.choice(KINDS)
+    return {'kind': kind, 'rot': 0, 'x': GRID_W//2 - 2, 'y': -1}
+
+def get_cells(piece):
+    x, y = piece['x'], piece['y']
+    return [(x + dx, y + dy) for dx, dy in shape(piece['kind'], piece['rot']).cells]
+
+def valid_position(board, piece, dx=0, dy=0, rot=None):
+    rot = piece['rot'] if rot is None else rot
+    return board.fits(piece['kind'], rot, piece['x'] + dx, piece['y'] + dy)
+
+def rotate_piece(board, piece):
+    """Gira no sentido da tabela, tentando os kicks em ordem; retorna se girou."""
+    for dx, rot in shape(piece['kind'], piece['rot']).rotate[1]:
+        if board.fits(piece['kind'], rot, piece['x'] + dx, piece['y']):
+            piece['rot'] = rot
+            piece['x'] += dx
+            return True
+    return False
+
+def lock_piece(board, piece):
+    board.place(piece['kind'], piece['rot'], piece['x'], piece['y'])
+
+def clear_lines(board):
+    cleared = board.clear_lines()
+    return board, cleared
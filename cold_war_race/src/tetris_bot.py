@@ -0,0 +1,209 @@
+from time import perf_counter
+from tetris_board import GRID_W, GRID_H, FULL_ROW, KINDS, SHAPES
+from input_bits import INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT
+
+# Oponente de Tetris controlado pelo computador. A busca trabalha só com as linhas do
+# bitboard (sem cores): enumera cada (rotação, coluna) soltando a peça reto de cima,
+# pontua o tabuleiro resultante e, com depth > 1, olha adiante pela média das 7 peças
+# possíveis (a fase não mostra a próxima peça, então o bot também não sabe qual vem),
+# expandindo só os `beam` melhores lances de cada nível.
+# A busca é um gerador "anytime": o melhor lance já encontrado fica disponível desde a
+# primeira camada, e o bot a avança no máximo FRAME_SLICE_MS por frame e budget_ms por
+# peça, então pensar nunca atrasa o loop de 60 FPS.
+WEIGHTS = {"height": -0.510066, "lines": 0.760666, "holes": -0.35663, "bumpiness": -0.184483}
+OVERFLOW_PENALTY = 1000.0  # peça que trava acima do topo (fim de jogo)
+FRAME_SLICE_MS = 2.0
+
+# dificuldade: profundidade/largura da busca, orçamento por peça e tempo de reação
+#   delay_ms  espera depois que a peça nasce, antes da primeira tecla
+#   move_ms   intervalo entre teclas
+LEVELS = {
+    "facil":   {"depth": 1, "beam": 1, "budget_ms": 4,  "delay_ms": 500, "move_ms": 180},
+    "medio":   {"depth": 1, "beam": 1, "budget_ms": 8,  "delay_ms": 250, "move_ms": 100},
+    "dificil": {"depth": 2, "beam": 3, "budget_ms": 30, "delay_ms": 100, "move_ms": 50},
+}
+
+
+def column_tops(rows):
+    """Linha da célula mais alta de cada coluna (GRID_H se vazia)."""
+    tops = [GRID_H] * GRID_W
+    open_cols = FULL_ROW
+    for r, row in enumerate(rows):
+        hit = row & open_cols
+        while hit:
+            low = hit & -hit
+            tops[low.bit_length() - 1] = r
+            hit ^= low
+        open_cols &= ~row
+        if not open_cols:
+            break
+    return tops
+
+
+def placements(rows, kind, tops=None):
+    """[(rot, x, y, transborda)] de cada posição final soltando a peça reto de cima."""
+    if tops is None:
+        tops = column_tops(rows)
+    out = []
+    for rot, sh in enumerate(SHAPES[kind]):
+        top_dy = sh.masks[0][0]
+        for x in range(-sh.min_x, GRID_W - sh.max_x):
+            c0 = x + sh.min_x
+            y = min(tops[c0 + j] - 1 - b for j, b in enumerate(sh.bottom))
+            out.append((rot, x, y, y + top_dy < 0))
+    return out
+
+
+def apply(rows, kind, rot, x, y):
+    """Linhas do tabuleiro com a peça travada e as linhas completas removidas; (linhas, limpas)."""
+    sh = SHAPES[kind][rot]
+    shift = x + sh.min_x
+    new = rows[:]
+    for dy, mask in sh.masks:
+        r = y + dy
+        if r >= 0:
+            new[r] |= mask << shift
+    full = new.count(FULL_ROW)
+    if full:
+        new = [0] * full + [row for row in new if row != FULL_ROW]
+    return new, full
+
+
+def evaluate(rows, lines, weights=WEIGHTS):
+    """Altura agregada, buracos (vazios cobertos), irregularidade entre colunas e linhas feitas."""
+    heights = [GRID_H - t for t in column_tops(rows)]
+    holes = 0
+    covered = 0
+    for row in rows:
+        holes += bin(covered & ~row).count("1")
+        covered |= row
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return (weights["height"] * sum(heights) + weights["lines"] * lines +
+            weights["holes"] * holes + weights["bumpiness"] * bumpiness)
+
+
+def _scored(rows, kind, lines, weights):
+    """Gerador: avalia cada posição da peça (um yield por avaliação); retorna a lista ordenada."""
+    scored = []
+    for rot, x, y, overflow in placements(rows, kind):
+        new, cleared = apply(rows, kind, rot, x, y)
+        score = evaluate(new, lines + cleared, weights) - (OVERFLOW_PENALTY if overflow else 0.0)
+        scored.append((score, rot, x, new, lines + cleared))
+        yield
+    scored.sort(key=lambda s: s[0], reverse=True)
+    return scored
+
+
+def _expected(rows, lines, remaining, beam, weights):
+    """Gerador: valor médio, sobre as 7 peças, do melhor lance com `remaining` peças por vir."""
+    total = 0.0
+    for kind in KINDS:
+        scored = yield from _scored(rows, kind, lines, weights)
+        if remaining > 1:
+            best = None
+            for _, _, _, new, n in scored[:beam]:
+                value = yield from _expected(new, n, remaining - 1, beam, weights)
+                if best is None or value > best:
+                    best = value
+        else:
+            best = scored[0][0]
+        total += best
+    return total / len(KINDS)
+
+
+def search(rows, kind, result, depth=1, beam=1, weights=WEIGHTS):
+    """
+    Gerador anytime: escreve em `result` [rot, x] o melhor lance conhecido. A primeira
+    camada sai completa; com depth > 1 cada candidato do beam troca o resultado só
+    depois de ter seu valor olhando adiante.
+    """
+    scored = yield from _scored(rows, kind, 0, weights)
+    result[:] = scored[0][1:3]
+    if depth <= 1:
+        return
+    best = None
+    for _, rot, x, new, n in scored[:beam]:
+        value = yield from _expected(new, n, depth - 1, beam, weights)
+        if best is None or value > best:
+            best = value
+            result[:] = (rot, x)
+
+
+def run_search(gen, budget_ms):
+    """Avança a busca por até budget_ms; retorna False quando ela termina."""
+    deadline = perf_counter() + budget_ms / 1000.0
+    try:
+        while perf_counter() < deadline:
+            next(gen)
+    except StopIteration:
+        return False
+    return True
+
+
+class TetrisBot:
+    """
+    Joga um lado do TetrisGame: update() a cada frame devolve o bitmask de teclas.
+    Com realtime=False (simulação) a busca termina inteira quando a peça nasce, sem
+    orçamento de relógio, então a partida depende só da seed.
+    """
+
+    def __init__(self, player, level="medio", weights=WEIGHTS, realtime=True):
+        self.player = player
+        self.level = level
+        self.realtime = realtime
+        cfg = LEVELS[level]
+        self.depth, self.beam = cfg["depth"], cfg["beam"]
+        self.budget_ms = cfg["budget_ms"]
+        self.delay_ms, self.move_ms = cfg["delay_ms"], cfg["move_ms"]
+        self.weights = weights
+        self.piece = None
+        self.target = []
+        self._search = None
+        self.spent_ms = 0.0
+        self.wait_ms = 0.0
+
+    def think(self):
+        """Avança a busca da peça atual dentro da fatia do frame e do orçamento da peça."""
+        if self._search is None:
+            return
+        if not self.realtime:
+            for _ in self._search:
+                pass
+            self._search = None
+            return
+        t0 = perf_counter()
+        running = run_search(self._search, min(FRAME_SLICE_MS, self.budget_ms - self.spent_ms))
+        self.spent_ms += (perf_counter() - t0) * 1000
+        if running and self.spent_ms >= self.budget_ms and not self.target:
+            # orçamento estourado antes da primeira camada: termina só ela
+            for _ in self._search:
+                if self.target:
+                    break
+        if not running or self.spent_ms >= self.budget_ms:
+            self._search = None
+
+    def update(self, game, dt_ms):
+        if game.finished:
+            return 0
+        piece = game.pieces[self.player]
+        if piece is not self.piece:
+            # peça nova: recomeça a busca e a espera de reação
+            self.piece = piece
+            self.target = []
+            self.spent_ms = 0.0
+            self.wait_ms = self.delay_ms
+            self._search = search(list(game.boards[self.player].rows), piece['kind'], self.target,
+                                  self.depth, self.beam, self.weights)
+        self.think()
+        self.wait_ms -= dt_ms
+        if self.wait_ms > 0 or not self.target:
+            return 0
+        self.wait_ms = self.move_ms
+        rot, x = self.target
+        if piece['rot'] != rot:
+            return INPUT_UP
+        if piece['x'] < x:
+            return INPUT_RIGHT
+        if piece['x'] > x:
+            return INPUT_LEFT
+        return INPUT_DOWN
@@ -0,0 +1,203 @@
+import random
+from input_bits import INPUT_UP, INPUT_DOWN, INPUT_LEFT, INPUT_RIGHT
+from tetris_board import (GRID_W, GRID_H, FULL_ROW, KINDS, SHAPES, new_board, spawn_piece,
+                          valid_position, rotate_piece, lock_piece, clear_lines)
+from snapshots import (NUMBER, NONE, SnapshotError, encode, decode, expect, expect_list,
+                       expect_range, rng_state, set_rng_state)
+
+# Estado e regras das duas partidas do Tetris, sem display, eventos nem relógio: o tempo
+# só anda pelo dt passado a step(). Usado pela fase (tetris_phase), pelos replays, pelo
+# benchmark e pela simulação em lote (tetris_sim).
+FALL_INTERVAL_MS = 600  # mais lento
+MIN_LINES = 5           # meta de linhas para finalizar Tetris
+
+
+class TetrisGame:
+    """
+    As duas partidas lado a lado. Avança por step(dt_ms, inputs) com o tempo do frame
+    e as teclas pressionadas nele: inputs = (bitmask URSS, bitmask EUA) com os bits
+    INPUT_* de input_bits (cima = girar). Peças vêm de random.Random(seed).
+    Com play_out=True (simulação) o jogo não para no primeiro a terminar: quem terminou
+    fica parado e o outro joga até terminar também, então result() traz os dois tempos.
+    """
+
+    def __init__(self, seed=None, play_out=False):
+        self.seed = seed
+        self.play_out = play_out
+        self.rng = random.Random(seed)
+        self.boards = [new_board(), new_board()]
+        self.pieces = [spawn_piece(self.rng), spawn_piece(self.rng)]
+        self.frame = 0
+        self.ms = 0                 # tempo de jogo (soma dos dt)
+        self.fall_times = [0, 0]
+        self.lines = [0, 0]
+        self.finish_ms = [None, None]
+        self.popups = ["", ""]
+        self.popup_ts = [0, 0]
+        # fim do tetris: overlay com o vencedor (0, 1 ou None = empate)
+        self.finished = False
+        self.overlay_winner = None
+        self.overlay_msg = ""
+
+    # Snapshot para keyframes de replay: campos explícitos, conferidos em restore
+    SNAPSHOT_VERSION = 1
+    SNAPSHOT_FIELDS = ("play_out", "rng", "boards", "pieces", "frame", "ms", "fall_times", "lines",
+                       "finish_ms", "popups", "popup_ts", "finished", "overlay_winner", "overlay_msg")
+
+    def snapshot(self):
+        return encode("tetris", self.SNAPSHOT_VERSION, {
+            "play_out": self.play_out,
+            "rng": rng_state(self.rng),
+            "boards": [[b.rows, b.colors.hex()] for b in self.boards],
+            "pieces": [[p['kind'], p['rot'], p['x'], p['y']] for p in self.pieces],
+            "frame": self.frame,
+            "ms": self.ms,
+            "fall_times": list(self.fall_times),
+            "lines": list(self.lines),
+            "finish_ms": list(self.finish_ms),
+            "popups": list(self.popups),
+            "popup_ts": list(self.popup_ts),
+            "finished": self.finished,
+            "overlay_winner": self.overlay_winner,
+            "overlay_msg": self.overlay_msg,
+        })
+
+    def restore(self, data):
+        """Carrega um snapshot(); SnapshotError se ele não for desta versão ou estiver inválido."""
+        f = decode(data, "tetris", self.SNAPSHOT_VERSION, self.SNAPSHOT_FIELDS)
+        boards = []
+        for rows, colors in expect_list(f["boards"], (list,), "boards", 2):
+            board = new_board()
+            board.rows = [expect_range(r, 0, FULL_ROW + 1, "boards.rows")
+                          for r in expect_list(rows, (int,), "boards.rows", GRID_H)]
+            try:
+                board.colors = bytearray.fromhex(expect(colors, (str,), "boards.colors"))
+            except ValueError:
+                raise SnapshotError("boards.colors: hex inválido") from None
+            if len(board.colors) != GRID_W * GRID_H or max(board.colors) > len(KINDS):
+                raise SnapshotError("boards.colors: tamanho ou cor inválidos")
+            boards.append(board)
+        pieces = []
+        for piece in expect_list(f["pieces"], (list,), "pieces", 2):
+            kind, rot, x, y = expect_list(piece, (str, int), "pieces", 4)
+            if kind not in KINDS:
+                raise SnapshotError(f"pieces: tipo desconhecido {kind!r}")
+            expect_range(rot, 0, len(SHAPES[kind]), "pieces.rot")
+            expect(x, (int,), "pieces.x")
+            expect(y, (int,), "pieces.y")
+            pieces.append({'kind': kind, 'rot': rot, 'x': x, 'y': y})
+        expect(f["play_out"], (bool,), "play_out")
+        expect(f["frame"], (int,), "frame")
+        expect(f["ms"], NUMBER, "ms")
+        expect_list(f["fall_times"], NUMBER, "fall_times", 2)
+        expect_list(f["lines"], (int,), "lines", 2)
+        expect_list(f["finish_ms"], NUMBER + (NONE,), "finish_ms", 2)
+        expect_list(f["popups"], (str,), "popups", 2)
+        expect_list(f["popup_ts"], NUMBER, "popup_ts", 2)
+        expect(f["finished"], (bool,), "finished")
+        if f["overlay_winner"] not in (None, 0, 1) or isinstance(f["overlay_winner"], bool):
+            raise SnapshotError(f"overlay_winner inválido: {f['overlay_winner']!r}")
+        expect(f["overlay_msg"], (str,), "overlay_msg")
+        rng = random.Random()
+        set_rng_state(rng, f["rng"])
+
+        self.rng, self.boards, self.pieces = rng, boards, pieces
+        for name in ("play_out", "frame", "ms", "finished", "overlay_winner", "overlay_msg"):
+            setattr(self, name, f[name])
+        for name in ("fall_times", "lines", "finish_ms", "popups", "popup_ts"):
+            setattr(self, name, list(f[name]))
+
+    def result(self):
+        urss_ms = self.finish_ms[0] if self.finish_ms[0] is not None else self.ms
+        eua_ms = self.finish_ms[1] if self.finish_ms[1] is not None else self.ms
+        return {"URSS_ms": urss_ms, "EUA_ms": eua_ms}
+
+    def playing(self):
+        """Quem ainda joga: no jogo normal os dois, até o overlay; em play_out, quem não terminou."""
+        if not self.play_out:
+            return (True, True)
+        return tuple(f is None for f in self.finish_ms)
+
+    def move(self, i, mask):
+        """Aplica as teclas de um jogador: esquerda/direita movem, baixo desce, cima gira."""
+        board, piece = self.boards[i], self.pieces[i]
+        if mask & INPUT_LEFT and valid_position(board, piece, dx=-1):
+            piece['x'] -= 1
+        if mask & INPUT_RIGHT and valid_position(board, piece, dx=1):
+            piece['x'] += 1
+        if mask & INPUT_DOWN and valid_position(board, piece, dy=1):
+            piece['y'] += 1
+        if mask & INPUT_UP:
+            rotate_piece(board, piece)
+
+    def step(self, dt_ms, inputs):
+        self.frame += 1
+        self.ms += dt_ms
+        if self.finished:
+            return  # overlay: lógica pausada até o jogador prosseguir
+        playing = self.playing()
+        for i, mask in enumerate(inputs):
+            if mask and playing[i]:
+                self.move(i, mask)
+        now = self.ms
+
+        # Gravity per player
+        for i in (0,1):
+            if playing[i] and now - self.fall_times[i] > FALL_INTERVAL_MS:
+                self.fall_times[i] = now
+                if valid_position(self.boards[i], self.pieces[i], dy=1):
+                    self.pieces[i]['y'] += 1
+                else:
+                    self.lock(i)
+
+    def lock(self, i):
+        now = self.ms
+        lines, finish_ms, popups, popup_ts = self.lines, self.finish_ms, self.popups, self.popup_ts
+        lock_piece(self.boards[i], self.pieces[i])
+        self.boards[i], cleared = clear_lines(self.boards[i])
+        if cleared:
+            lines[i] += cleared
+            popups[i] = f"Linha completa! (+{cleared})"
+            popup_ts[i] = now
+            if finish_ms[i] is None and lines[i] >= MIN_LINES:
+                finish_ms[i] = now
+                # Decide vencedor do Tetris: se outro já terminou, menor tempo; se não, este jogador venceu
+                other = 1 - i
+                if finish_ms[other] is not None:
+                    if finish_ms[i] < finish_ms[other]:
+                        self.overlay_winner = i
+                    elif finish_ms[i] > finish_ms[other]:
+                        self.overlay_winner = other
+                    else:
+                        self.overlay_winner = None  # empate
+                else:
+                    self.overlay_winner = i
+                # configura mensagem do overlay
+                if self.overlay_winner is None:
+                    self.overlay_msg = "Tetris: Empate!"
+                elif self.overlay_winner == 0:
+                    self.overlay_msg = "URSS venceu o Tetris!"
+                else:
+                    self.overlay_msg = "EUA venceu o Tetris!"
+                self.finished = True
+                # notifica opponent pop-up with diff
+                if finish_ms[other] is None:
+                    diff_s = (now - finish_ms[i]) / 1000.0
+                    popups[other] = f"Diferença: {diff_s:.2f}s"
+                    popup_ts[other] = now
+                popups[i] = "Terminou!"
+                popup_ts[i] = now
+        self.pieces[i] = spawn_piece(self.rng)
+        # spawn invalid -> treat as finished
+        if not valid_position(self.boards[i], self.pieces[i]):
+            if finish_ms[i] is None:
+                finish_ms[i] = now
+            popups[i] = "Game over"
+            popup_ts[i] = now
+            other = 1 - i
+            if finish_ms[other] is None:
+                diff_s = (now - finish_ms[i]) / 1000.0
+                popups[other] = f"Diferença: {diff_s:.2f}s"
+                popup_ts[other] = now
+        if self.play_out:
+            self.finished = None not in finish_ms
@@ -1,29 +1,18 @@
-import pygame, time, random, sys
-import os
-
-# Configurações locais
-GRID_W, GRID_H = 10, 20
+import pygame, random
+from assets import asset_manager, background_path
+from text_cache import get_font, render_text
+from replay import ReplayLog, pressed_inputs, pack_inputs, unpack_inputs
+from profiler import frame_profiler
+from tetris_board import GRID_W, GRID_H, KINDS, get_cells
+from tetris_engine import TetrisGame, MIN_LINES
+
+# Configurações locais (tabuleiro e peças em tetris_board.py)
 BLOCK = 28
 PADDING = 20
-FALL_INTERVAL_MS = 600  # mais lento
-MIN_LINES = 5           # meta de linhas para finalizar Tetris
 POPUP_MS = 3000
 TITLE = "Montagem do Foguete"
 FPS = 60
 
-# Tetrominoes
-TETROMINOES = {
-    'I': [[(0,1),(1,1),(2,1),(3,1)], [(2,0),(2,1),(2,2),(2,3)]],
-    'O': [[(1,0),(2,0),(1,1),(2,1)]],
-    'T': [[(1,0),(0,1),(1,1),(2,1)], [(1,0),(1,1),(2,1),(1,2)],
-          [(0,1),(1,1),(2,1),(1,2)], [(1,0),(0,1),(1,1),(1,2)]],
-    'L': [[(2,0),(0,1),(1,1),(2,1)], [(1,0),(1,1),(1,2),(2,2)],
-          [(0,1),(1,1),(2,1),(0,2)], [(0,0),(1,0),(1,1),(1,2)]],
-    'J': [[(0,0),(0,1),(1,1),(2,1)], [(1,0),(2,0),(1,1),(1,2)],
-          [(0,1),(1,1),(2,1),(2,2)], [(1,0),(1,1),(1,2),(0,2)]],
-    'S': [[(1,0),(2,0),(0,1),(1,1)], [(1,0),(1,1),(2,1),(2,2)]],
-    'Z': [[(0,0),(1,0),(1,1),(2,1)], [(2,0),(1,1),(2,1),(1,2)]]
-}
 COLORS = {
     'I': (0,255,255),'O':(255,255,0),'T':(160,32,240),'L':(255,165,0),
     'J':(0,0,255),'S':(0,255,0),'Z':(255,0,0)
@@ -49,62 +38,76 @@ NEWS = [
 # duração (ms) que cada manchete fica visível
 NEWS_DURATION_MS = 5000
 
-# --- Funções de Tetris (sem alterações de lógica) ---
-def new_board():
-    return [[None for _ in range(GRID_W)] for _ in range(GRID_H)]
-
-def spawn_piece():
-    kind = random.choice(list(TETROMINOES.keys()))
-    return {'kind': kind, 'rot': 0, 'x': GRID_W//2 - 2, 'y': -1}
-
-def get_cells(piece):
-    shape = TETROMINOES[piece['kind']][piece['rot'] % len(TETROMINOES[piece['kind']])]
-    return [(piece['x'] + dx, piece['y'] + dy) for dx,dy in shape]
-
-def valid_position(board, piece, dx=0, dy=0, rot=None):
-    rot = piece['rot'] if rot is None else rot
-    shape = TETROMINOES[piece['kind']][rot % len(TETROMINOES[piece['kind']])]
-    for ox, oy in shape:
-        x = piece['x'] + dx + ox
-        y = piece['y'] + dy + oy
-        if x < 0 or x >= GRID_W or y >= GRID_H:
-            if y < 0:
-                continue
-            return False
-        if y >= 0 and board[y][x] is not None:
-            return False
-    return True
-
-def lock_piece(board, piece):
-    for x,y in get_cells(piece):
-        if 0 <= y < GRID_H:
-            board[y][x] = piece['kind']
-
-def clear_lines(board):
-    newb = [row for row in board if any(cell is None for cell in row)]
-    cleared = GRID_H - len(newb)
-    while len(newb) < GRID_H:
-        newb.insert(0, [None]*GRID_W)
-    return newb, cleared
-
-def draw_board(surface, board, top_left):
-    ox, oy = top_left
-    pygame.draw.rect(surface, (30,30,30), (ox-4, oy-4, GRID_W*BLOCK+8, GRID_H*BLOCK+8))
-    for r in range(GRID_H):
-        for c in range(GRID_W):
-            cell = board[r][c]
-            rect = pygame.Rect(ox + c*BLOCK, oy + r*BLOCK, BLOCK-1, BLOCK-1)
-            if cell:
-                pygame.draw.rect(surface, COLORS.get(cell,(200,200,200)), rect)
+def tetris_asset_specs(w, h):
+    """Specs (path, size, scale, alpha) dos fundos de cada metade da tela."""
+    return [
+        (background_path("lab_urss.png"), (w//2, h), "fast", False),
+        (background_path("lab_usa.png"), (w//2, h), "fast", False),
+    ]
+
+# --- Desenho do tabuleiro e da peça ---
+# Cada jogador tem um BoardView: o tabuleiro fica desenhado numa superfície persistente e
+# só as células cujo valor mudou (trava de peça, linhas limpas) são redesenhadas, com um
+# blit de tile pré-renderizado. A peça caindo vai por cima com sprites de bloco por cor.
+FRAME_COLOR = (30,30,30)
+EMPTY_COLOR = (15,15,15)
+_tiles = {}
+
+
+def _block_tiles():
+    """{tipo ou None: (tile BLOCK x BLOCK com o fundo da moldura, bloco BLOCK-1 sem fundo)}"""
+    if not _tiles:
+        cell = pygame.Rect(0, 0, BLOCK-1, BLOCK-1)
+        for kind in (None,) + KINDS:
+            tile = pygame.Surface((BLOCK, BLOCK))
+            tile.fill(FRAME_COLOR)
+            if kind:
+                pygame.draw.rect(tile, COLORS.get(kind, (200,200,200)), cell)
             else:
-                pygame.draw.rect(surface, (15,15,15), rect, 1)
+                pygame.draw.rect(tile, EMPTY_COLOR, cell, 1)
+            block = pygame.Surface(cell.size)
+            block.fill(COLORS.get(kind, (200,200,200)))
+            if pygame.display.get_surface() is not None:
+                tile, block = tile.convert(), block.convert()
+            _tiles[kind] = (tile, block)
+    return _tiles
+
+
+class BoardView:
+    """Superfície retida de um tabuleiro (com a moldura de 4 px)."""
+
+    def __init__(self):
+        self.surface = pygame.Surface((GRID_W*BLOCK+8, GRID_H*BLOCK+8))
+        self.surface.fill(FRAME_COLOR)
+        self.colors = None  # cores desenhadas por último (bytearray do Board)
+
+    def sync(self, board):
+        """Redesenha só as células diferentes do último desenho; retorna quantas."""
+        colors = board.colors
+        if colors == self.colors:
+            return 0
+        tiles = _block_tiles()
+        old = self.colors
+        items = []
+        for i, c in enumerate(colors):
+            if old is None or old[i] != c:
+                r, col = divmod(i, GRID_W)
+                items.append((tiles[KINDS[c - 1] if c else None][0], (4 + col*BLOCK, 4 + r*BLOCK)))
+        self.surface.blits(items, doreturn=False)
+        self.colors = bytearray(colors)
+        return len(items)
+
+    def draw(self, surface, board, top_left):
+        self.sync(board)
+        ox, oy = top_left
+        surface.blit(self.surface, (ox-4, oy-4))
+
 
 def draw_piece(surface, piece, top_left):
     ox, oy = top_left
-    for x,y in get_cells(piece):
-        if y >= 0:
-            rect = pygame.Rect(ox + x*BLOCK, oy + y*BLOCK, BLOCK-1, BLOCK-1)
-            pygame.draw.rect(surface, COLORS.get(piece['kind'], (200,200,200)), rect)
+    block = _block_tiles()[piece['kind']][1]
+    surface.blits([(block, (ox + x*BLOCK, oy + y*BLOCK)) for x, y in get_cells(piece) if y >= 0],
+                  doreturn=False)
 
 # --- Nova função: desenha as notícias empilhadas (estilo jornal) ---
 def draw_news_stack(screen, font_title, font_text, news_list, max_boxes=7):
@@ -142,7 +145,7 @@ def draw_news_stack(screen, font_title, font_text, news_list, max_boxes=7):
 
         # Faixa vermelha superior (NEWS)
         pygame.draw.rect(screen, (220,80,80), (box_x, box_y, box_w, 36))
-        news_label = font_title.render("NEWS", True, (255,255,255))
+        news_label = render_text(font_title, "NEWS", (255,255,255))
         screen.blit(news_label, (box_x + 12, box_y + 6))
 
         # Linha preta decorativa (abaixo do título)
@@ -160,18 +163,18 @@ def draw_news_stack(screen, font_title, font_text, news_list, max_boxes=7):
             parts = first_line.split('—', 1)
             year = parts[0].strip()
             title = parts[1].strip()
-            year_title_surf = font_title.render(f"{year} — {title}", True, (10,10,10))
+            year_title_surf = render_text(font_title, f"{year} — {title}", (10,10,10))
             screen.blit(year_title_surf, (box_x + 12, box_y + 46))
             y_text = box_y + 46 + year_title_surf.get_height() + 6
         else:
             # fallback: draw whole first line with title font
-            t = font_title.render(first_line, True, (10,10,10))
+            t = render_text(font_title, first_line, (10,10,10))
             screen.blit(t, (box_x + 12, box_y + 46))
             y_text = box_y + 46 + t.get_height() + 6
 
         # desenhar restante das linhas (desc)
         for ln in rest_lines:
-            txt = font_text.render(ln, True, (20,20,20))
+            txt = render_text(font_text, ln, (20,20,20))
             screen.blit(txt, (box_x + 12, y_text))
             y_text += txt.get_height() + 4
 
@@ -231,13 +234,13 @@ def draw_news_box(screen, font_title, font_text, news_text, x_center, y_top, box
 
     # faixa NEWS
     pygame.draw.rect(screen, (200,50,50), (box_x, box_y, box_w, 36))
-    news_label = font_title.render("Noticias", True, (255,255,255))
+    news_label = render_text(font_title, "Noticias", (255,255,255))
     screen.blit(news_label, (box_x + 12, box_y + 6))
 
     # Título (first_line) — sempre renderizado por linhas já quebradas
     y_cursor = box_y + header_h
     for tl in title_lines:
-        surf = font_title.render(tl, True, (10,10,10))
+        surf = render_text(font_title, tl, (10,10,10))
         screen.blit(surf, (box_x + padding_x, y_cursor))
         y_cursor += surf.get_height()
     y_cursor += 6
@@ -249,18 +252,26 @@ def draw_news_box(screen, font_title, font_text, news_text, x_center, y_top, box
 
     # Descrição/linhas restantes
     for ln in rest_lines:
-        surf = font_text.render(ln, True, (20,20,20))
+        surf = render_text(font_text, ln, (20,20,20))
         screen.blit(surf, (box_x + padding_x, y_cursor))
         y_cursor += surf.get_height() + 4
 
     return box_w, box_h
 
-# --- Função principal do Tetris (mantive toda lógica original) ---
-def tetris_phase(screen, x_offset=0, headlines_y=None):
+# --- Função principal do Tetris: entrada, desenho e gravação do replay ---
+def tetris_phase(screen, x_offset=0, headlines_y=None, seed=None, replay=None, speed=1,
+                 replay_start=0, record_path=None, bot=None):
+    """
+    Roda a fase e retorna {"URSS_ms", "EUA_ms"}. Toda partida é gravada (seed + teclas e dt
+    por frame) e salva em record_path, se informado. Com replay=ReplayLog, reproduz o log
+    a `speed` frames de jogo por frame desenhado, começando em replay_start.
+    Com bot=TetrisBot, o lado bot.player é jogado pelo computador (as teclas dele entram
+    no log como as de um jogador, então o replay não precisa do bot).
+    """
     pygame.font.init()
-    font = pygame.font.SysFont("Arial", 20)
-    title_font = pygame.font.SysFont("Arial", 28, bold=True)
-    big_font = pygame.font.SysFont("Arial", 36, bold=True)
+    font = get_font("Arial", 20)
+    title_font = get_font("Arial", 28, bold=True)
+    big_font = get_font("Arial", 36, bold=True)
     clock = pygame.time.Clock()
 
     if headlines_y is None:
@@ -276,126 +287,93 @@ def tetris_phase(screen, x_offset=0, headlines_y=None):
     top_y = (h - GRID_H * BLOCK) // 1.5
 
     # Players state
-    boards = [new_board(), new_board()]
-    pieces = [spawn_piece(), spawn_piece()]
-    fall_times = [pygame.time.get_ticks(), pygame.time.get_ticks()]
-    lines = [0,0]
-    finish_ms = [None, None]
-    popups = ["",""]
-    popup_ts = [0,0]
-
-    # News timing (não mais necessário para empilhamento, mas mantido para compat.)
+    if replay is not None:
+        seed = replay.meta["seed"]
+    elif seed is None:
+        seed = random.randrange(2 ** 31)
+    game = TetrisGame(seed)
+    log = None
+    if replay is not None:
+        replay.seek(game, replay_start)
+    else:
+        log = ReplayLog("tetris", {"seed": seed})
+
+    # tabuleiros retidos: só células que mudaram são redesenhadas
+    views = [BoardView(), BoardView()]
+    names = ["URSS", "EUA "]
+    if bot is not None and replay is None:
+        names[bot.player] = names[bot.player].strip() + " (CPU)"
+
+    # News timing (avança pelo tempo de jogo)
     news_index = 0
-    last_news_ts = pygame.time.get_ticks()
-    # se quiser iniciar com a primeira notícia parcialmente exibida, ajuste last_news_ts para menor
-    # news_start_ts mantido apenas para compatibilidade com código antigo (não usado)
-    news_start_ts = last_news_ts
-
-    # End-of-tetris overlay control
-    overlay_shown = False
-    overlay_winner = None  # 0 or 1
-    overlay_msg = ""
-    overlay_start = 0
+    last_news_ts = 0
 
     # Carregar fundos distintos para cada lado (fallback para cor sólida se arquivo ausente)
-    # caminho absoluto relativo a este arquivo (src/)
-    assets_bg_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'assets', 'backgrounds'))
-    bg_left = None
-    bg_right = None
-    p_left = os.path.join(assets_bg_dir, "lab_urss.png")
-    p_right = os.path.join(assets_bg_dir, "lab_usa.png")
-    if os.path.exists(p_left):
-        try:
-            bg_left = pygame.image.load(p_left).convert()
-        except Exception:
-            bg_left = None
-    if os.path.exists(p_right):
-        try:
-            bg_right = pygame.image.load(p_right).convert()
-        except Exception:
-            bg_right = None
-
-    # redimensiona/cobre cada metade
-    if bg_left:
-        bg_left = pygame.transform.scale(bg_left, (w//2, h))
-    if bg_right:
-        bg_right = pygame.transform.scale(bg_right, (w//2, h))
+    # já redimensionados para cobrir cada metade (cache compartilhado do asset manager)
+    bg_left, bg_right = [asset_manager.load(*spec) for spec in tetris_asset_specs(w, h)]
+
+    def finish():
+        if log is not None and record_path:
+            log.save(record_path)
+        return game.result()
 
+    prof = frame_profiler("tetris")
     running = True
-    start_time = time.time()
+    clock.tick()
 
     while running:
-        now = pygame.time.get_ticks()
-        elapsed = int(time.time() - start_time)
+        prof.begin()
+        dt = clock.tick(FPS)
+        prof.mark("wait")
+        events = prof.events()
 
         # process events properly (fix: handle inside the loop so player 0 keys work)
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
-                now_ms = int((time.time() - start_time) * 1000)
-                urss_ms = finish_ms[0] if finish_ms[0] is not None else now_ms
-                eua_ms  = finish_ms[1] if finish_ms[1] is not None else now_ms
-                return {"URSS_ms": urss_ms, "EUA_ms": eua_ms}
+                return finish()
 
             # If overlay is shown, only listen for a key/mouse to continue
-            if overlay_shown:
+            if game.finished and replay is None:
                 if event.type == pygame.KEYDOWN or (event.type == pygame.MOUSEBUTTONDOWN and event.button == 1):
-                    now_ms = int((time.time() - start_time) * 1000)
-                    urss_ms = finish_ms[0] if finish_ms[0] is not None else now_ms
-                    eua_ms  = finish_ms[1] if finish_ms[1] is not None else now_ms
-                    return {"URSS_ms": urss_ms, "EUA_ms": eua_ms}
-                # ignore other events while overlay is up
-                continue
-
-            # Normal input handling for both players
-            if event.type == pygame.KEYDOWN:
-                # Player 0 controls (URSS): A/D move, S drop, W rotate
-                if event.key == pygame.K_a:
-                    if valid_position(boards[0], pieces[0], dx=-1):
-                        pieces[0]['x'] -= 1
-                elif event.key == pygame.K_d:
-                    if valid_position(boards[0], pieces[0], dx=1):
-                        pieces[0]['x'] += 1
-                elif event.key == pygame.K_s:
-                    if valid_position(boards[0], pieces[0], dy=1):
-                        pieces[0]['y'] += 1
-                elif event.key == pygame.K_w:
-                    new_rot = (pieces[0]['rot'] + 1) % len(TETROMINOES[pieces[0]['kind']])
-                    for shift in (0,-1,1,-2,2):
-                        if valid_position(boards[0], pieces[0], dx=shift, rot=new_rot):
-                            pieces[0]['rot'] = new_rot
-                            pieces[0]['x'] += shift
-                            break
-
-                # Player 1 controls (EUA): Arrows
-                elif event.key == pygame.K_LEFT:
-                    if valid_position(boards[1], pieces[1], dx=-1):
-                        pieces[1]['x'] -= 1
-                elif event.key == pygame.K_RIGHT:
-                    if valid_position(boards[1], pieces[1], dx=1):
-                        pieces[1]['x'] += 1
-                elif event.key == pygame.K_DOWN:
-                    if valid_position(boards[1], pieces[1], dy=1):
-                        pieces[1]['y'] += 1
-                elif event.key == pygame.K_UP:
-                    new_rot = (pieces[1]['rot'] + 1) % len(TETROMINOES[pieces[1]['kind']])
-                    for shift in (0,-1,1,-2,2):
-                        if valid_position(boards[1], pieces[1], dx=shift, rot=new_rot):
-                            pieces[1]['rot'] = new_rot
-                            pieces[1]['x'] += shift
-                            break
+                    return finish()
+
+        prof.mark("events")
+
+        # Normal input handling for both players (teclas do frame -> bitmask gravado)
+        if replay is not None:
+            for _ in range(max(1, int(speed))):
+                if game.frame >= len(replay):
+                    return game.result()
+                replay.step(game, game.frame)
+        else:
+            packed = pressed_inputs(events)
+            if bot is not None:
+                # um jogador: o humano usa WASD ou setas; o outro lado é do bot
+                masks = list(unpack_inputs(packed))
+                human = 1 - bot.player
+                masks[human] |= masks[bot.player]
+                masks[bot.player] = bot.update(game, dt)
+                packed = pack_inputs(*masks)
+            log.record(game, packed, dt)
+            game.step(dt, unpack_inputs(packed))
+        prof.mark("update")
+
+        now = game.ms
+        elapsed = now // 1000
+        boards, pieces, lines = game.boards, game.pieces, game.lines
 
         # Se overlay foi acionado, pausa lógica e mostra UI até o jogador prosseguir
-        if overlay_shown:
+        if game.finished:
             # desenhar apenas UI abaixo; não processa gravidade
             screen.fill((10,10,40))
-            title_surf = title_font.render(TITLE, True, (255,215,0))
+            title_surf = render_text(title_font, TITLE, (255,215,0))
             screen.blit(title_surf, (w//2 - title_surf.get_width()//2, 8))
-            timer_surf = font.render(f"Tempo: {elapsed}s", True, (255,255,255))
+            timer_surf = render_text(font, f"Tempo: {elapsed}s", (255,255,255))
             screen.blit(timer_surf, (w//2 - timer_surf.get_width()//2, 44))
 
             # desenha boards e peças (congeladas)
-            draw_board(screen, boards[0], (left_x, top_y))
-            draw_board(screen, boards[1], (right_x, top_y))
+            views[0].draw(screen, boards[0], (left_x, top_y))
+            views[1].draw(screen, boards[1], (right_x, top_y))
             draw_piece(screen, pieces[0], (left_x, top_y))
             draw_piece(screen, pieces[1], (right_x, top_y))
 
@@ -407,75 +385,20 @@ def tetris_phase(screen, x_offset=0, headlines_y=None):
             oy = h//2 - overlay_bg.get_height()//2 - 40
             screen.blit(overlay_bg, (ox, oy))
 
-            winner_text = big_font.render(overlay_msg, True, (255,255,255))
+            winner_text = render_text(big_font, game.overlay_msg, (255,255,255))
             screen.blit(winner_text, (w//2 - winner_text.get_width()//2, oy + 20))
 
             button_rect = pygame.Rect(w//2 - 120, oy + 90, 240, 40)
             pygame.draw.rect(screen, (60,120,180), button_rect)
-            btn_text = font.render("Ir para a Corrida (press/clk)", True, (255,255,255))
+            btn_text = render_text(font, "Ir para a Corrida (press/clk)", (255,255,255))
             screen.blit(btn_text, (button_rect.centerx - btn_text.get_width()//2, button_rect.centery - btn_text.get_height()//2))
+            prof.draw_overlay(screen)
+            prof.mark("draw")
 
             pygame.display.flip()
-            clock.tick(FPS)
+            prof.mark("flip")
             continue
 
-        # Gravity per player
-        for i in (0,1):
-            if now - fall_times[i] > FALL_INTERVAL_MS:
-                fall_times[i] = now
-                if valid_position(boards[i], pieces[i], dy=1):
-                    pieces[i]['y'] += 1
-                else:
-                    lock_piece(boards[i], pieces[i])
-                    boards[i], cleared = clear_lines(boards[i])
-                    if cleared:
-                        lines[i] += cleared
-                        popups[i] = f"Linha completa! (+{cleared})"
-                        popup_ts[i] = pygame.time.get_ticks()
-                        if finish_ms[i] is None and lines[i] >= MIN_LINES:
-                            finish_ms[i] = int((time.time() - start_time) * 1000)
-                            # Decide vencedor do Tetris: se outro já terminou, menor tempo; se não, este jogador venceu
-                            other = 1 - i
-                            if finish_ms[other] is not None:
-                                if finish_ms[i] < finish_ms[other]:
-                                    overlay_winner = i
-                                elif finish_ms[i] > finish_ms[other]:
-                                    overlay_winner = other
-                                else:
-                                    overlay_winner = None  # empate
-                            else:
-                                overlay_winner = i
-                            # configura mensagem do overlay
-                            if overlay_winner is None:
-                                overlay_msg = "Tetris: Empate!"
-                            elif overlay_winner == 0:
-                                overlay_msg = "URSS venceu o Tetris!"
-                            else:
-                                overlay_msg = "EUA venceu o Tetris!"
-                            overlay_shown = True
-                            overlay_start = now
-                            # notifica opponent pop-up with diff
-                            if finish_ms[other] is None:
-                                current_ms = int((time.time() - start_time) * 1000)
-                                diff_s = (current_ms - finish_ms[i]) / 1000.0
-                                popups[other] = f"Diferença: {diff_s:.2f}s"
-                                popup_ts[other] = pygame.time.get_ticks()
-                            popups[i] = "Terminou!"
-                            popup_ts[i] = pygame.time.get_ticks()
-                    pieces[i] = spawn_piece()
-                    # spawn invalid -> treat as finished
-                    if not valid_position(boards[i], pieces[i]):
-                        if finish_ms[i] is None:
-                            finish_ms[i] = int((time.time() - start_time) * 1000)
-                        popups[i] = "Game over"
-                        popup_ts[i] = pygame.time.get_ticks()
-                        other = 1 - i
-                        if finish_ms[other] is None:
-                            current_ms = int((time.time() - start_time) * 1000)
-                            diff_s = (current_ms - finish_ms[i]) / 1000.0
-                            popups[other] = f"Diferença: {diff_s:.2f}s"
-                            popup_ts[other] = pygame.time.get_ticks()
-
         # Draw normal game UI
         # em vez de fill uniforme, desenhamos os dois fundos (ou fallback)
         # Left background
@@ -495,26 +418,26 @@ def tetris_phase(screen, x_offset=0, headlines_y=None):
         # porque desenhamos as notícias depois)
         pygame.draw.line(screen, (80,80,100), (w//2, 0), (w//2, h), 6)
 
-        title_surf = title_font.render(TITLE, True, (255,255,255))
+        title_surf = render_text(title_font, TITLE, (255,255,255))
         screen.blit(title_surf, (w//2 - title_surf.get_width()//2, 10))
-        timer_surf = font.render(f"Tempo: {elapsed}s", True, (255,255,255))
+        timer_surf = render_text(font, f"Tempo: {elapsed}s", (255,255,255))
         screen.blit(timer_surf, (w//2 - timer_surf.get_width()//2, 50))
 
-        draw_board(screen, boards[0], (left_x, top_y))
-        draw_board(screen, boards[1], (right_x, top_y))
+        views[0].draw(screen, boards[0], (left_x, top_y))
+        views[1].draw(screen, boards[1], (right_x, top_y))
         draw_piece(screen, pieces[0], (left_x, top_y))
         draw_piece(screen, pieces[1], (right_x, top_y))
 
-        label0 = font.render(f"URSS - Peças Montadas: {lines[0]}/{MIN_LINES}", True, (255,255,255))
-        label1 = font.render(f"EUA  - Peças Montadas: {lines[1]}/{MIN_LINES}", True, (255,255,255))
+        label0 = render_text(font, f"{names[0]} - Peças Montadas: {lines[0]}/{MIN_LINES}", (255,255,255))
+        label1 = render_text(font, f"{names[1]} - Peças Montadas: {lines[1]}/{MIN_LINES}", (255,255,255))
         screen.blit(label0, (left_x + (GRID_W*BLOCK - label0.get_width())//2, top_y - 30))
         screen.blit(label1, (right_x + (GRID_W*BLOCK - label1.get_width())//2, top_y - 30))
 
         # Popups dos jogadores
-        for i, msg in enumerate(popups):
-            if msg and pygame.time.get_ticks() - popup_ts[i] < POPUP_MS:
+        for i, msg in enumerate(game.popups):
+            if msg and now - game.popup_ts[i] < POPUP_MS:
                 half_center_x = (w//4) if i == 0 else (3*w//4)
-                popup_surf = font.render(msg, True, (255,180,180))
+                popup_surf = render_text(font, msg, (255,180,180))
                 x = half_center_x - popup_surf.get_width()//2
                 y = h - 60
                 screen.blit(popup_surf, (x, y))
@@ -536,19 +459,18 @@ def tetris_phase(screen, x_offset=0, headlines_y=None):
         news_y = h//2 - (min_box_h // 2)
         draw_news_box(screen, title_font, font, NEWS[news_index], w//2, news_y, box_w=box_w, min_box_h=min_box_h)
 
-        title_surf = title_font.render(TITLE, True, (255,255,255))
+        title_surf = render_text(title_font, TITLE, (255,255,255))
         screen.blit(title_surf, (w//2 - title_surf.get_width()//2, 10))
-        timer_surf = font.render(f"Tempo: {elapsed}s", True, (255,255,255))
+        timer_surf = render_text(font, f"Tempo: {elapsed}s", (255,255,255))
         screen.blit(timer_surf, (w//2 - timer_surf.get_width()//2, 50))
+        prof.draw_overlay(screen)
+        prof.mark("draw")
 
         pygame.display.flip()
-        clock.tick(FPS)
+        prof.mark("flip")
 
     # Fallback return (won't usually reach aqui)
-    now_ms = int((time.time() - start_time) * 1000)
-    urss_ms = finish_ms[0] if finish_ms[0] is not None else now_ms
-    eua_ms = finish_ms[1] if finish_ms[1] is not None else now_ms
-    return {"URSS_ms": urss_ms, "EUA_ms": eua_ms}
+    return finish()
 
 
 # Se executar diretamente para teste rápido
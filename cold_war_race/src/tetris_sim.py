@@ -0,0 +1,194 @@
+import os, sys, json, time, random
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from multiprocessing import Pool
+from settings import FPS, FINISH_LINE, MS_TO_PROGRESS, MAX_TETRIS_ADV_PCT
+from tetris_engine import TetrisGame, MIN_LINES
+from tetris_bot import TetrisBot, LEVELS
+from scoring import compute_advantage, advantage_cap_pct, percentile
+
+# Simulação em lote do Tetris para calibrar a vantagem inicial da corrida. Cada partida
+# é bot x bot no TetrisGame headless (play_out: os dois jogam até terminar), com a seed
+# decidindo peças e o nível de cada lado (sorteado de --levels, uma população de
+# jogadores de habilidades diferentes). Os tempos passam por scoring.compute_advantage()
+# com MS_TO_PROGRESS / MAX_TETRIS_ADV_PCT do settings ou os passados na linha de comando,
+# e o relatório mostra a distribuição das vantagens iniciais.
+#
+#   python tetris_sim.py [--games N] [--workers K] [--seed S] [--levels facil,medio,dificil]
+#                        [--ms-to-progress X] [--max-adv-pct Y] [--timing live|play_out]
+#                        [--overlay-ms MS] [--json ARQ]
+#
+# --timing escolhe que tempos vão para compute_advantage:
+#   live      como a fase mede (tetris_phase.finish): o jogo para no primeiro a completar
+#             as linhas, e quem não terminou recebe o instante em que o overlay do vencedor
+#             é fechado (aqui, o fim do vencedor + --overlay-ms). A diferença então não
+#             depende do desempenho do perdedor.
+#   play_out  a diferença real entre os dois terminarem. Só serve para calibrar se a fase
+#             passar a medir o perdedor assim; com a fase atual as sugestões ficam enviesadas.
+#
+# Os bots rodam sem orçamento de relógio (realtime=False), então o resultado de cada seed
+# é o mesmo em qualquer máquina e número de processos.
+GAMES = 2000
+SEED = 1957
+FRAME_MS = round(1000 / FPS)
+MAX_GAME_MS = 10 * 60 * 1000   # partida que não termina é cortada aqui
+TIMINGS = ("live", "play_out")
+OVERLAY_MS = 2000              # estimativa do tempo até alguém fechar o overlay do vencedor
+HIST_BUCKETS = 10
+HIST_WIDTH = 40
+
+
+def play_game(seed, levels):
+    """Uma partida bot x bot a FRAME_MS por frame; retorna os tempos e como terminou."""
+    game = TetrisGame(seed, play_out=True)
+    bots = [TetrisBot(i, level, realtime=False) for i, level in enumerate(levels)]
+    while not game.finished and game.ms < MAX_GAME_MS:
+        game.step(FRAME_MS, [bot.update(game, FRAME_MS) for bot in bots])
+    times = game.result()
+    return {
+        "seed": seed,
+        "levels": list(levels),
+        "URSS_ms": times["URSS_ms"],
+        "EUA_ms": times["EUA_ms"],
+        "lines": list(game.lines),
+        # game over conta como término (finish_ms), mas sem a meta de linhas
+        "topped_out": [f is not None and n < MIN_LINES for f, n in zip(game.finish_ms, game.lines)],
+        "timed_out": not game.finished,
+    }
+
+
+def game_specs(games, seed=SEED, levels=tuple(LEVELS)):
+    """[(seed da partida, (nível URSS, nível EUA))], reprodutível pela seed base."""
+    rng = random.Random(seed)
+    return [(rng.randrange(2 ** 31), (rng.choice(levels), rng.choice(levels))) for _ in range(games)]
+
+
+def _play(spec):
+    return play_game(*spec)
+
+
+def run_batch(specs, workers=None):
+    """Roda as partidas em `workers` processos (None = um por CPU), na ordem de specs."""
+    if workers == 1:
+        return [_play(spec) for spec in specs]
+    with Pool(workers) as pool:
+        return pool.map(_play, specs, chunksize=max(1, len(specs) // ((workers or os.cpu_count() or 1) * 8)))
+
+
+def measured_times(r, timing="live", overlay_ms=OVERLAY_MS):
+    """{"URSS_ms", "EUA_ms"} da partida como a fase os entregaria (live) ou como terminaram (play_out)."""
+    times = {"URSS_ms": r["URSS_ms"], "EUA_ms": r["EUA_ms"]}
+    goal = [times[k] for k, top in zip(times, r["topped_out"]) if not top]
+    if timing == "play_out" or r["timed_out"] or not goal:
+        return times
+    # a fase para quando alguém completa as linhas; game over anterior mantém o próprio tempo
+    end = min(goal)
+    return {k: t if t <= end else end + overlay_ms for k, t in times.items()}
+
+
+def advantages(results, ms_to_progress=MS_TO_PROGRESS, max_adv_pct=MAX_TETRIS_ADV_PCT):
+    """(adv_urss, adv_eua) de cada partida por scoring.compute_advantage(), com os parâmetros dados."""
+    return [compute_advantage(r, ms_to_progress, max_adv_pct) for r in results]
+
+
+def _row(name, values, fmt):
+    qs = (0.10, 0.25, 0.50, 0.75, 0.90, 0.99)
+    values = sorted(values)
+    cells = "  ".join(f"p{int(q * 100):02d} {fmt(percentile(values, q))}" for q in qs)
+    return f"  {name:22s} {cells}  máx {fmt(values[-1] if values else 0)}"
+
+
+def report(results, times, advs, ms_to_progress=MS_TO_PROGRESS, max_adv_pct=MAX_TETRIS_ADV_PCT,
+           timing="live", overlay_ms=OVERLAY_MS):
+    """Linhas do relatório: tempos, diferenças e distribuição da vantagem inicial."""
+    cap_pct = advantage_cap_pct(max_adv_pct)
+    adv_cap = int(cap_pct * FINISH_LINE)
+    n = len(results)
+    lines = [f"{n} partidas  MS_TO_PROGRESS={ms_to_progress}  MAX_TETRIS_ADV_PCT={max_adv_pct}"
+             f"  (teto efetivo {cap_pct:.0%} = {adv_cap} de {FINISH_LINE})"]
+
+    lines.append("Tempo até terminar, por nível (s):")
+    for level in LEVELS:
+        t = [r[k] / 1000 for r in results for k, lv in zip(("URSS_ms", "EUA_ms"), r["levels"]) if lv == level]
+        if t:
+            lines.append(_row(f"{level} ({len(t)})", t, lambda v: f"{v:5.1f}"))
+    if timing == "live":
+        lines.append(f"Tempos como a fase mede (--timing live): o perdedor recebe o fim do vencedor + {overlay_ms} ms"
+                     " de overlay, então a diferença quase não depende de quão longe ele estava.")
+    else:
+        lines.append("Tempos de play_out (--timing play_out): diferença real entre os dois terminarem. A fase"
+                     " mede o perdedor ao fechar o overlay, então estes números só valem se ela mudar.")
+    diffs = [abs(t["URSS_ms"] - t["EUA_ms"]) / 1000 for t in times]
+    lines.append("Diferença entre os lados (s):")
+    lines.append(_row("|URSS - EUA|", diffs, lambda v: f"{v:5.1f}"))
+
+    adv = [max(a) for a in advs]
+    pct = [a / FINISH_LINE for a in adv]
+    lines.append("Vantagem inicial (fração da pista):")
+    lines.append(_row("vantagem", pct, lambda v: f"{v:5.1%}"))
+    capped = sum(1 for a in adv if a >= adv_cap)
+    zero = sum(1 for a in adv if a == 0)
+    urss = sum(1 for a, b in advs if a > b)
+    eua = sum(1 for a, b in advs if b > a)
+    lines.append(f"  no teto {capped / n:.1%}   sem vantagem {zero / n:.1%}   URSS na frente {urss / n:.1%}"
+                 f"   EUA na frente {eua / n:.1%}")
+    topped = sum(1 for r in results if any(r["topped_out"]))
+    timed = sum(1 for r in results if r["timed_out"])
+    lines.append(f"  game over {topped / n:.1%}   cortadas em {MAX_GAME_MS // 1000}s {timed / n:.1%}")
+
+    # histograma da vantagem em faixas iguais até o teto
+    counts = [0] * HIST_BUCKETS
+    for a in adv:
+        counts[min(HIST_BUCKETS - 1, a * HIST_BUCKETS // adv_cap if adv_cap else 0)] += 1
+    top = max(counts) or 1
+    for k, c in enumerate(counts):
+        lo, hi = k * cap_pct / HIST_BUCKETS, (k + 1) * cap_pct / HIST_BUCKETS
+        lines.append(f"  {lo:5.1%}-{hi:5.1%} {'#' * round(c * HIST_WIDTH / top):{HIST_WIDTH}s} {c}")
+
+    # sugestão: MS_TO_PROGRESS que leva a diferença mediana (ou o p90) exatamente ao teto
+    diffs_ms = sorted(d * 1000 for d in diffs)
+    for q in (0.50, 0.90):
+        d = percentile(diffs_ms, q)
+        if d:
+            lines.append(f"  MS_TO_PROGRESS para o p{int(q * 100)} da diferença chegar ao teto: {adv_cap / d:.4f}")
+    return lines
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    def option(name, default=None):
+        if name in args:
+            i = args.index(name)
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        return default
+
+    games = int(option("--games", GAMES))
+    workers = option("--workers")
+    workers = int(workers) if workers else None
+    seed = int(option("--seed", SEED))
+    levels = tuple(option("--levels", ",".join(LEVELS)).split(","))
+    ms_to_progress = float(option("--ms-to-progress", MS_TO_PROGRESS))
+    max_adv_pct = float(option("--max-adv-pct", MAX_TETRIS_ADV_PCT))
+    timing = option("--timing", "live")
+    if timing not in TIMINGS:
+        sys.exit("--timing deve ser " + " ou ".join(TIMINGS))
+    overlay_ms = int(option("--overlay-ms", OVERLAY_MS))
+    json_path = option("--json")
+
+    specs = game_specs(games, seed, levels)
+    t = time.perf_counter()
+    results = run_batch(specs, workers)
+    wall = time.perf_counter() - t
+    times = [measured_times(r, timing, overlay_ms) for r in results]
+    advs = advantages(times, ms_to_progress, max_adv_pct)
+    print(f"simulação: {wall:.1f} s ({games / wall:.0f} partidas/s, {workers or os.cpu_count()} processos)")
+    print("\n".join(report(results, times, advs, ms_to_progress, max_adv_pct, timing, overlay_ms)))
+    if json_path:
+        for r, t, (a, b) in zip(results, times, advs):
+            r["measured"] = t
+            r["advantage"] = [a, b]
+        with open(json_path, "w") as f:
+            json.dump(results, f)
+        print("Partidas salvas em", json_path)
@@ -0,0 +1,57 @@
+from collections import OrderedDict
+import pygame
+
+# Textos renderizados compartilhados por todas as telas (menu, cutscenes, tetris,
+# corrida, tela final). Strings fixas são rasterizadas uma vez; o LRU limita o que
+# sobra de textos que mudam (cronômetros). O prefixo em digitação dos diálogos não passa
+# por aqui: cada frame seria uma chave nova que só empurraria os textos fixos para fora.
+MAX_ENTRIES = 512
+
+
+class TextCache:
+    """LRU de (fonte, texto, cor, antialias) -> Surface, com fontes memoizadas."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name, size, bold=False, italic=False):
+        """SysFont memoizado: a mesma fonte é o mesmo objeto, então a chave do cache bate."""
+        key = (name.lower(), size, bool(bold), bool(italic))
+        f = self._fonts.get(key)
+        if f is None:
+            f = self._fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+        return f
+
+    def render(self, font, text, color, antialias=True):
+        """Como font.render(text, antialias, color); a superfície devolvida é compartilhada (não altere)."""
+        key = (font, text, tuple(color), antialias)
+        cache = self._cache
+        surf = cache.get(key)
+        if surf is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = cache[key] = font.render(text, antialias, color)
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+        return surf
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+    def report(self):
+        s = self.stats()
+        return f"textos: {s['entries']} em cache, hits={s['hits']} misses={s['misses']}"
+
+    def clear(self):
+        self._cache.clear()
+
+
+text_cache = TextCache()
+get_font = text_cache.font
+render_text = text_cache.render